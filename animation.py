@@ -0,0 +1,191 @@
+import time
+from pygame.math import Vector2
+
+def ease_out_cubic(t):
+    """
+    Easing that starts fast and slows down at the end.
+
+    Args:
+        t (float): Progress of the tween between 0 and 1.
+
+    Returns:
+        float: Eased progress between 0 and 1.
+    """
+    return 1 - (1 - t) ** 3
+
+class Tween:
+    """
+    Moves a sprite's rect from one position to another over a duration.
+    """
+    def __init__(self, sprite, destination, duration, easing=ease_out_cubic,
+                 delay=0, on_complete=None):
+        """
+        Initializes a new Tween instance.
+
+        Args:
+            sprite (pygame.sprite.Sprite): Sprite whose rect is moved.
+            destination (tuple): Final top-left position of the rect.
+            duration (float): Duration of the movement in seconds.
+            easing (callable, optional): Function easing the progress.
+                Defaults to ease_out_cubic.
+            delay (float, optional): Seconds to wait before moving.
+                Defaults to 0.
+            on_complete (callable, optional): Called with the sprite once
+                the tween ends. Defaults to None.
+        """
+        self.sprite = sprite
+        self._start = Vector2(sprite.rect.topleft)
+        self._end = Vector2(destination)
+        self._duration = max(duration, 1e-6)
+        self._easing = easing
+        self._elapsed = -delay
+        self._on_complete = on_complete
+
+    def step(self, dt):
+        """
+        Advances the tween.
+
+        Args:
+            dt (float): Seconds to advance.
+
+        Returns:
+            bool: True once the tween has finished.
+        """
+        self._elapsed += dt
+        if self._elapsed <= 0:
+            return False
+
+        t = min(self._elapsed / self._duration, 1.0)
+        pos = self._start.lerp(self._end, self._easing(t))
+        self.sprite.rect.topleft = (round(pos.x), round(pos.y))
+        return t >= 1.0
+
+    def retarget(self, destination, duration, **kwargs):
+        """
+        Restarts the tween from where the sprite is towards a new
+        destination. The easing, the completion callback and what is left
+        of the delay are kept unless they are given again.
+
+        Args:
+            destination (tuple): New final top-left position of the rect.
+            duration (float): Duration of the new movement in seconds.
+            **kwargs: Tween arguments to replace (easing, delay,
+                on_complete).
+        """
+        self._start = Vector2(self.sprite.rect.topleft)
+        self._end = Vector2(destination)
+        self._duration = max(duration, 1e-6)
+        self._easing = kwargs.get('easing', self._easing)
+        self._elapsed = -kwargs.get('delay', max(-self._elapsed, 0))
+        self._on_complete = kwargs.get('on_complete', self._on_complete)
+
+    def complete(self):
+        """
+        Calls the completion callback of the finished tween.
+        """
+        if self._on_complete:
+            self._on_complete(self.sprite)
+
+    @property
+    def destination(self):
+        """
+        Returns the final position of the tween.
+        """
+        return self._end
+
+class Animator:
+    """
+    Runs the active tweens with a fixed timestep, independent of the
+    frame rate. Each sprite has at most one tween at a time.
+    """
+    MAX_FRAME_TIME = 0.25 # avoids catching up on long stalls
+
+    def __init__(self, timestep=1 / 120):
+        """
+        Initializes a new Animator instance.
+
+        Args:
+            timestep (float, optional): Seconds simulated per step.
+                Defaults to 1/120.
+        """
+        self._timestep = timestep
+        self._accumulator = 0
+        self._last_time = None
+        self._tweens = {}
+
+    def move(self, sprite, destination, duration, **kwargs):
+        """
+        Starts moving a sprite from where it is to a destination. A tween
+        the sprite already had is retargeted instead, see Tween.retarget.
+
+        Args:
+            sprite (pygame.sprite.Sprite): Sprite to be moved.
+            destination (tuple): Final top-left position of the sprite.
+            duration (float): Duration of the movement in seconds.
+            **kwargs: Extra Tween arguments (easing, delay, on_complete).
+        """
+        if tuple(sprite.rect.topleft) == tuple(destination):
+            self._tweens.pop(sprite, None)
+            return
+
+        tween = self._tweens.get(sprite)
+        if tween and tween.destination == Vector2(destination) and not kwargs:
+            return
+
+        if tween:
+            tween.retarget(destination, duration, **kwargs)
+        else:
+            self._tweens[sprite] = Tween(sprite, destination, duration,
+                                         **kwargs)
+
+    def cancel(self, sprite):
+        """
+        Stops a sprite's tween where it is.
+
+        Args:
+            sprite (pygame.sprite.Sprite): Sprite to stop.
+        """
+        self._tweens.pop(sprite, None)
+
+    def is_animating(self, sprite):
+        """
+        Checks if a sprite has an active tween.
+
+        Args:
+            sprite (pygame.sprite.Sprite): Sprite to check.
+
+        Returns:
+            bool: True if the sprite is being moved.
+        """
+        return sprite in self._tweens
+
+    def update(self):
+        """
+        Advances the active tweens by the real time elapsed since the last
+        call, in fixed timesteps.
+
+        Returns:
+            bool: True if any tween moved.
+        """
+        now = time.perf_counter()
+        if self._last_time is None or not self._tweens:
+            self._last_time = now
+            self._accumulator = 0
+            return False
+
+        self._accumulator += min(now - self._last_time, Animator.MAX_FRAME_TIME)
+        self._last_time = now
+
+        while self._accumulator >= self._timestep and self._tweens:
+            self._accumulator -= self._timestep
+            finished = [sprite for sprite, tween in self._tweens.items()
+                        if tween.step(self._timestep)]
+            for sprite in finished:
+                self._tweens.pop(sprite).complete()
+        return True
+
+    def __len__(self):
+        """
+        Returns the number of active tweens.
+        """
+        return len(self._tweens)
@@ -0,0 +1,173 @@
+import io
+import queue
+import threading
+import pygame
+from card import UnoCard, CardType, CardColor
+
+class AssetPreloader:
+    """
+    Prepares the play screen's assets while the start screen is showing.
+
+    Image files are decoded and font files are read in a background
+    thread, while the display dependent steps (format conversion, font
+    creation and card face rendering) are finished a few at a time on the
+    main thread.
+    """
+    def __init__(self, resource_manager, settings, card_pool):
+        """
+        Initializes a new AssetPreloader instance.
+
+        Args:
+            resource_manager (ResourceManager): Receives the loaded assets.
+            settings (Settings): The settings listing the assets to load.
+            card_pool (UnoCardViewPool): Pool warmed up with one view per
+                card type.
+        """
+        self._resource_manager = resource_manager
+        self._settings = settings
+        self._card_pool = card_pool
+        self._decoded = queue.Queue()
+        self._thread = None
+        self._decoding_done = False
+        self._prepared_views = []
+
+        self._font_sizes = sorted({
+            settings.CARD_CENTER_FONT_SIZE,
+            settings.CARD_BACK_FONT_SIZE,
+            settings.PLAYER_LIST_FONT_SIZE,
+            settings.IP_TF_FONT_SIZE,
+            settings.JOIN_BTN_FONT_SIZE,
+            settings.DIALOG_FONT_SIZE,
+            settings.DIALOG_TITLE_FONT_SIZE})
+        self._card_faces = [
+            UnoCard(card_type, CardColor.DARK
+                    if card_type in (CardType.WILD, CardType.WILD_DRAW_FOUR)
+                    else CardColor.RED)
+            for card_type in CardType if card_type != CardType.NONE]
+
+        self._total = (len(settings.ImageResources) +
+                       len(self._font_sizes) + len(self._card_faces))
+        self._done = 0
+
+    def start(self):
+        """
+        Starts decoding the assets in a background thread.
+        """
+        if self._thread:
+            return
+
+        self._thread = threading.Thread(target=self._decode, daemon=True)
+        self._thread.start()
+
+    def _decode(self):
+        """
+        Decodes the image files and reads the font file, runs in the
+        background thread.
+        """
+        try:
+            for img in self._settings.ImageResources:
+                self._decoded.put(('image', img, pygame.image.load(img.value)))
+
+            with open(self._settings.FONT_DIR, 'rb') as font_file:
+                font_data = font_file.read()
+            for size in self._font_sizes:
+                self._decoded.put(('font', size, font_data))
+        except Exception as e:
+            print(f'Preloading Exception: {e}')
+        finally:
+            self._decoded.put(('done', None, None))
+
+    def update(self, max_steps=2):
+        """
+        Finishes some of the preloaded assets on the main thread.
+
+        Args:
+            max_steps (int, optional): Maximum number of assets finished
+                in this call. Defaults to 2.
+        """
+        steps = 0
+        while steps < max_steps and not self.done:
+            if not self._decoding_done:
+                try:
+                    kind, key, value = self._decoded.get_nowait()
+                except queue.Empty:
+                    return
+                self._install(kind, key, value)
+            else:
+                self._prepare_card_face(self._card_faces.pop())
+            steps += 1
+
+    def _install(self, kind, key, value):
+        """
+        Adds a decoded asset to the resource manager.
+
+        Args:
+            kind (str): 'image', 'font' or 'done'.
+            key: Image resource or font size.
+            value: Decoded image surface or font file content.
+        """
+        if kind == 'image':
+            self._resource_manager.add_image(
+                key, self._resource_manager.to_display_format(value))
+        elif kind == 'font':
+            self._resource_manager.add_font(
+                self._settings.FONT_DIR, key,
+                pygame.font.Font(io.BytesIO(value), key))
+        else:
+            self._decoding_done = True
+            self._load_missing_images()
+            return
+        self._done += 1
+
+    def _load_missing_images(self):
+        """
+        Loads on the main thread any image the background thread failed
+        to decode.
+        """
+        for img in self._settings.ImageResources:
+            if img not in self._resource_manager.images:
+                self._resource_manager.load_image(img, img.value)
+                self._done += 1
+
+    def _prepare_card_face(self, uno_card):
+        """
+        Renders a card face, the views are left idle in the card pool 
+        once every face is ready.
+
+        Args:
+            uno_card (UnoCard): Card whose face is prepared.
+        """
+        self._prepared_views.append(self._card_pool.acquire(uno_card))
+        self._done += 1
+
+        if not self._card_faces:
+            for card_view in self._prepared_views:
+                self._card_pool.release(card_view)
+            self._prepared_views = []
+
+    def finish(self):
+        """
+        Blocks until every asset is ready.
+        """
+        self.start()
+        while not self.done:
+            if not self._decoding_done:
+                self._install(*self._decoded.get())
+            else:
+                self.update(len(self._card_faces))
+
+    @property
+    def done(self):
+        """
+        Returns True once every asset is ready.
+        """
+        return self._decoding_done and not self._card_faces
+
+    @property
+    def progress(self):
+        """
+        Returns the fraction of assets ready, between 0 and 1.
+        """
+        if self.done:
+            return 1.0
+        return min(self._done / self._total, 1.0)
@@ -0,0 +1,240 @@
+"""
+Headless rendering benchmarks for the UNO Online client.
+
+Runs pygame with the SDL dummy video driver and prints the results as
+JSON so they can be compared between releases.
+
+Usage:
+    python benchmarks/render_benchmark.py [--output results.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.chdir(ROOT_DIR) # resources are loaded with relative paths
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from card import UnoCard, CardType, CardColor
+from card_collections import UnoDeck, UnoHand
+from status_code import StatusCode, UnoMessage
+
+HAND_SIZES = [7, 30, 100, 500]
+PLAYER_COUNTS = [2, 10, 100, 1000]
+FRAME_HAND_SIZES = [7, 30, 100]
+
+def measure(fn, repeat, setup=None):
+    """
+    Times a function several times.
+
+    Args:
+        fn (callable): The function to time.
+        repeat (int): How many times the function is timed.
+        setup (callable, optional): Called before each run, untimed.
+
+    Returns:
+        dict: Mean, median, 95th percentile, min and max in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return summarize(timings)
+
+def summarize(timings):
+    """
+    Summarizes a list of timings.
+
+    Args:
+        timings (list): Timings in milliseconds.
+
+    Returns:
+        dict: Mean, median, 95th percentile, min and max in milliseconds.
+    """
+    ordered = sorted(timings)
+    return {
+        'runs': len(ordered),
+        'mean_ms': statistics.fmean(ordered),
+        'median_ms': statistics.median(ordered),
+        'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        'min_ms': ordered[0],
+        'max_ms': ordered[-1],
+    }
+
+def scripted_cards(count):
+    """
+    Returns cards from a fresh deck, repeating it for very large hands.
+
+    Args:
+        count (int): Number of cards.
+
+    Returns:
+        list: UnoCard objects in deck order.
+    """
+    deck = UnoDeck().cards
+    return [deck[i % len(deck)] for i in range(count)]
+
+def bench_create_card_view(game_instance):
+    """
+    Measures UnoCardViewDirector.create_card_view for every card type.
+    """
+    director = game_instance.card_pool.director
+    results = []
+    for card_type in CardType:
+        if card_type == CardType.NONE:
+            continue
+        color = (CardColor.DARK if card_type in
+                 (CardType.WILD, CardType.WILD_DRAW_FOUR) else CardColor.RED)
+        uno_card = UnoCard(card_type, color)
+        stats = measure(lambda: director.create_card_view(uno_card), 200)
+        stats['views_per_s'] = 1000 / stats['mean_ms']
+        results.append({'name': 'create_card_view',
+                        'params': {'card_type': card_type.name}, **stats})
+    return results
+
+def bench_organize_cards(game_instance):
+    """
+    Measures UnoHand.organize_cards against the hand size.
+    """
+    director = game_instance.card_pool.director
+    screen_rect = game_instance.get_rect()
+    results = []
+    for size in HAND_SIZES:
+        hand = UnoHand(pygame.sprite.Group(), screen_rect.left,
+                       screen_rect.bottom, screen_rect.width)
+        for uno_card in scripted_cards(size):
+            hand.add_card(director.create_card_view(uno_card))
+        stats = measure(hand.organize_cards, 200)
+        results.append({'name': 'organize_cards',
+                        'params': {'hand_size': size}, **stats})
+    return results
+
+def bench_set_player_list(play_screen):
+    """
+    Measures PlayScreen.set_player_list against the player count, for
+    turn changes and for roster changes.
+    """
+    results = []
+    for count in PLAYER_COUNTS:
+        names = [f"('10.0.0.{i}', {50000 + i})" for i in range(count)]
+        turn = [0]
+
+        def next_turn():
+            turn[0] = (turn[0] + 1) % count
+            play_screen.set_player_list(names, names[turn[0]])
+
+        play_screen.set_player_list(names, names[0])
+        stats = measure(next_turn, 200)
+        results.append({'name': 'set_player_list',
+                        'params': {'players': count, 'change': 'turn'},
+                        **stats})
+
+        def new_roster():
+            names.append(names.pop(0))
+            play_screen.set_player_list(list(names), names[0])
+
+        stats = measure(new_roster, 50)
+        results.append({'name': 'set_player_list',
+                        'params': {'players': count, 'change': 'roster'},
+                        **stats})
+    return results
+
+def bench_frame_time(game, play_screen_cls):
+    """
+    Measures whole GameInstance frames on the play screen with scripted
+    hands.
+    """
+    game_instance = game.game_instance
+    results = []
+    for size in FRAME_HAND_SIZES:
+        play_screen = play_screen_cls(game_instance)
+        game_instance.transition_to(play_screen)
+
+        client = game_instance.client
+        names = [client.name, "('10.0.0.2', 50001)"]
+        cards = scripted_cards(size + 1)
+        client.result_q.put(UnoMessage(StatusCode.CARD_DRAW, cards[:size]))
+        client.result_q.put(UnoMessage(StatusCode.GAME_STATE,
+                                       [0, names, cards[-1], False]))
+
+        def frame():
+            game._check_events()
+            game._update_screen()
+            game._draw_screen()
+
+        # Lets the messages and deal animations settle first
+        for _ in range(600):
+            frame()
+            if client.result_q.empty() and not len(play_screen.animator):
+                break
+
+        stats = measure(frame, 300)
+        stats['fps'] = 1000 / stats['mean_ms']
+        results.append({'name': 'frame_time',
+                        'params': {'hand_size': size}, **stats})
+
+        play_screen.release_card_views()
+    return results
+
+def run():
+    """
+    Runs every benchmark.
+
+    Returns:
+        dict: Environment information and benchmark results.
+    """
+    from game import Game
+    from states.play_screen import PlayScreen
+
+    game = Game()
+    game_instance = game.game_instance
+    game_instance.preloader.finish()
+    game_instance.client.name = "('127.0.0.1', 50000)"
+
+    play_screen = PlayScreen(game_instance)
+    game_instance.transition_to(play_screen)
+
+    results = []
+    results += bench_create_card_view(game_instance)
+    results += bench_organize_cards(game_instance)
+    results += bench_set_player_list(play_screen)
+    results += bench_frame_time(game, PlayScreen)
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'sdl': '.'.join(map(str, pygame.get_sdl_version())),
+            'video_driver': pygame.display.get_driver(),
+            'platform': platform.platform(),
+        },
+        'benchmarks': results,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Headless rendering benchmarks for UNO Online.')
+    parser.add_argument('--output', help='File the JSON results are written to')
+    args = parser.parse_args()
+
+    # The client logs every message, kept out of the JSON results
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = run()
+
+    report_json = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(report_json)
+    print(report_json)
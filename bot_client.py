@@ -0,0 +1,460 @@
+"""
+Headless bot players for UNO Online.
+
+Bots fill empty seats of a room or drive soak tests. Many bots share a
+single selector thread, a BotRunner, instead of an I/O thread each.
+
+Usage:
+    python bot_client.py HOST [--port 1234] [--bots 3] [--strategy heuristic]
+"""
+import argparse
+import queue
+import selectors
+import socket
+import time
+from client import Client
+from card import CardColor, CardType, UnoCard
+from status_code import StatusCode
+from bot_strategies import STRATEGIES, create_strategy
+
+class BotClient(Client):
+    """
+    A client that plays without a screen, keeping a model of its hand and
+    of the game state and asking its strategy for a move on each turn.
+
+    BotClients are connected and served by a BotRunner.
+    """
+    def __init__(self, strategy, ping_interval=None):
+        """
+        Initializes a new BotClient instance.
+
+        Args:
+            strategy (BotStrategy): Chooses the bot's moves.
+            ping_interval (float, optional): Seconds between round trip
+                time probes, None disables them. Defaults to None.
+        """
+        super().__init__(ping_interval)
+        self.strategy = strategy
+        self._hand = []
+        self._top_card = None
+        self._player_names = []
+        self._player_turn = 0
+        self._turn_increase = 1
+        self._turn_ready = False
+        self._awaiting = None
+        self._pending_play = None
+        self._hand_sizes = {}
+        self._discards = []
+        self.game_started = False
+        self.game_over = False
+        self.winner = None
+        self.moves_played = 0
+        self.cards_drawn = 0
+        self._response_handlers = {
+            StatusCode.GAME_START: self._on_game_start,
+            StatusCode.CARD_DRAW: self._on_card_draw,
+            StatusCode.GAME_STATE: self._on_game_state,
+            StatusCode.GAME_SNAPSHOT: self._on_game_snapshot,
+            StatusCode.MOVE_REJECTED: self._on_move_rejected,
+        }
+
+    def step(self):
+        """
+        Handles the responses received so far and plays if it is the bot's
+        turn, runs in the BotRunner thread.
+        """
+        for u_response in self._received_responses():
+            # A move is answered once its response arrives
+            if (self._awaiting is not None and
+                u_response.request_id == self._awaiting):
+                self._awaiting = None
+
+            handler = self._response_handlers.get(u_response.status_code)
+            if handler:
+                handler(u_response)
+
+        if self._turn_ready and self._awaiting is None and not self.game_over:
+            self._take_turn()
+
+    def _received_responses(self):
+        """
+        Retrieves every response received so far without blocking. Unlike
+        drain_responses, every GAME_STATE is kept so no move goes unseen.
+
+        Returns:
+            list: The received UnoMessages, in arrival order.
+        """
+        responses = []
+        while True:
+            try:
+                responses.append(self.result_q.get_nowait())
+            except queue.Empty:
+                return responses
+
+    def _on_game_start(self, u_response):
+        """
+        Requests the initial cards and game state once the game starts.
+
+        Args:
+            u_response (UnoMessage): The GAME_START message.
+        """
+        self.game_started = True
+        self.request_initial_cards()
+        self._awaiting = self.request_game_status().request_id
+
+    def _on_card_draw(self, u_response):
+        """
+        Adds drawn cards to the hand.
+
+        Args:
+            u_response (UnoMessage): Message holding the drawn UnoCards.
+        """
+        self._hand.extend(u_response.data)
+        self.cards_drawn += len(u_response.data)
+
+    def _on_game_state(self, u_response):
+        """
+        Updates the game state model.
+
+        Args:
+            u_response (UnoMessage): Message holding the player in turn
+                index, player names, top discarded card, whether the game
+                was won and the direction of play.
+        """
+        r_dta = u_response.data
+        if self._player_names and r_dta[1] != self._player_names:
+            # Players who resumed a recovered game have new names
+            self._hand_sizes = {
+                new: self._hand_sizes.get(old, 7)
+                for old, new in zip(self._player_names, r_dta[1])}
+            self._player_names = r_dta[1]
+        self._observe_move(r_dta[0], r_dta[1], r_dta[2])
+        self._player_turn = r_dta[0]
+        self._player_names = r_dta[1]
+        self._top_card = r_dta[2]
+        self._turn_increase = r_dta[4] if len(r_dta) > 4 else 1
+
+        if r_dta[3]:
+            self.game_over = True
+            self.winner = self._player_names[self._player_turn]
+
+        # States sent before the last move was answered are stale
+        self._turn_ready = self._awaiting is None and self.in_turn
+
+    def _on_game_snapshot(self, u_response):
+        """
+        Replaces the game state model with the snapshot sent by the server
+        when the bot resumes its seat, its hand included.
+
+        Args:
+            u_response (UnoMessage): Message holding the game state fields,
+                the number of cards of every seat, the number of cards in
+                the deck and the bot's hand.
+        """
+        r_dta = u_response.data
+        self._player_turn = r_dta[0]
+        self._player_names = r_dta[1]
+        self._top_card = r_dta[2]
+        self._turn_increase = r_dta[4]
+        self._hand_sizes = dict(zip(r_dta[1], r_dta[5]))
+        if r_dta[7] is not None:
+            self._hand = list(r_dta[7])
+        if not self._discards:
+            self._discards = [self._top_card]
+
+        if r_dta[3]:
+            self.game_over = True
+            self.winner = self._player_names[self._player_turn]
+        self._turn_ready = self._awaiting is None and self.in_turn
+
+    def _on_move_rejected(self, u_response):
+        """
+        Takes back a card the server did not accept and updates the game
+        state model with the state it sent.
+
+        Args:
+            u_response (UnoMessage): Message holding the unchanged game
+                state.
+        """
+        if self._pending_play and self._pending_play[0] == u_response.request_id:
+            uno_card = self._pending_play[1]
+            if uno_card.type in (CardType.WILD, CardType.WILD_DRAW_FOUR):
+                uno_card = UnoCard(uno_card.type, CardColor.DARK)
+            self._hand.append(uno_card)
+            self.moves_played -= 1
+        self._pending_play = None
+        self._on_game_state(u_response)
+
+    def _observe_move(self, player_turn, player_names, top_card):
+        """
+        Infers the move made between the previous and a new game state to
+        estimate the size of every hand and track the discarded cards.
+
+        Args:
+            player_turn (int): Index of the player in turn.
+            player_names (list): Names of the players.
+            top_card (UnoCard): The top card of the discard pile.
+        """
+        if not self._hand_sizes:
+            self._hand_sizes = {name: 7 for name in player_names}
+            self._discards = [top_card]
+            return
+
+        top_changed = (top_card.type != self._top_card.type or
+                       top_card.color != self._top_card.color)
+        previous = self._player_names[self._player_turn]
+
+        if top_changed:
+            # The previous player played the new top card
+            self._hand_sizes[previous] = max(
+                1, self._hand_sizes.get(previous, 7) - 1)
+            self._discards.append(top_card)
+            victim = player_names[player_turn]
+            if top_card.type == CardType.DRAW_TWO:
+                self._hand_sizes[victim] = self._hand_sizes.get(victim, 7) + 2
+            elif top_card.type == CardType.WILD_DRAW_FOUR:
+                self._hand_sizes[victim] = self._hand_sizes.get(victim, 7) + 4
+        elif player_turn != self._player_turn:
+            # The previous player drew a card instead
+            self._hand_sizes[previous] = self._hand_sizes.get(previous, 7) + 1
+
+    def _take_turn(self):
+        """
+        Plays the card chosen by the strategy, or draws one.
+        """
+        self._turn_ready = False
+        uno_card = self.strategy.choose_move(self)
+
+        if uno_card is None:
+            future = self.request_card_draw()
+        else:
+            self._remove_from_hand(uno_card)
+            future = self.request_card_play(uno_card, not self._hand)
+            self.moves_played += 1
+            self._pending_play = (future.request_id, uno_card)
+        self._awaiting = future.request_id
+
+    def _remove_from_hand(self, uno_card):
+        """
+        Removes a played card from the hand, wild cards are held without
+        the color picked for them.
+
+        Args:
+            uno_card (UnoCard): The card played.
+        """
+        for i, held in enumerate(self._hand):
+            if held.type == uno_card.type and (
+                held.color == uno_card.color or held.color == CardColor.DARK):
+                del self._hand[i]
+                return
+        raise ValueError(f'Card not in hand: {uno_card.type} {uno_card.color}')
+
+    def _shutdown(self):
+        """
+        Closes the connection and fails the requests still waiting for a
+        response, leaving the runner's selector open.
+        """
+        self.is_connected = False
+        try:
+            self._selector.unregister(self.client_socket)
+        except (KeyError, ValueError):
+            pass
+        self.client_socket.close()
+        self._fail_pending_requests()
+
+    @property
+    def hand(self):
+        """
+        Returns the UnoCards held by the bot.
+        """
+        return self._hand
+
+    @property
+    def top_card(self):
+        """
+        Returns the top card of the discard pile.
+        """
+        return self._top_card
+
+    @property
+    def player_names(self):
+        """
+        Returns the names of the players in turn order.
+        """
+        return self._player_names
+
+    @property
+    def player_turn(self):
+        """
+        Returns the index of the player in turn.
+        """
+        return self._player_turn
+
+    @property
+    def turn_increase(self):
+        """
+        Returns the direction of play, 1 or -1.
+        """
+        return self._turn_increase
+
+    @property
+    def hand_sizes(self):
+        """
+        Returns the number of cards of every player by name, estimated
+        from the game states for the other players.
+        """
+        sizes = dict(self._hand_sizes)
+        if self.name in sizes:
+            sizes[self.name] = len(self._hand)
+        return sizes
+
+    @property
+    def discards(self):
+        """
+        Returns the cards seen on the discard pile, in order.
+        """
+        return self._discards
+
+    @property
+    def in_turn(self):
+        """
+        Returns whether it is the bot's turn.
+        """
+        return (bool(self._player_names) and
+                self._player_names[self._player_turn] == self.name)
+
+class BotRunner:
+    """
+    Serves the sockets of many BotClients from a single thread with one
+    selector, so each bot costs only its socket and its models.
+    """
+    def __init__(self):
+        """
+        Initializes a new BotRunner instance.
+        """
+        self._selector = selectors.DefaultSelector()
+        self._bots = []
+
+    def add(self, bot, server_address, server_port):
+        """
+        Connects a bot to the server and starts serving it.
+
+        Args:
+            bot (BotClient): The bot to connect.
+            server_address (str): The IP address of the Uno server.
+            server_port (int): The port number of the Uno server.
+
+        Returns:
+            bool: True if the bot connected, False otherwise.
+        """
+        bot.server_address = server_address
+        bot.server_port = server_port
+        bot._selector = self._selector
+        if not bot.connection_attempt():
+            return False
+
+        self._selector.register(bot.client_socket, selectors.EVENT_READ, bot)
+        self._bots.append(bot)
+        return True
+
+    def resume(self, bot, server_address, server_port):
+        """
+        Reconnects a bot whose server restarted, the bot reclaims its seat
+        in the recovered game and gets its hand back from the server.
+
+        Args:
+            bot (BotClient): The disconnected bot.
+            server_address (str): The IP address of the Uno server.
+            server_port (int): The port the server resumes games on.
+
+        Returns:
+            bool: True if the bot reconnected, False otherwise.
+        """
+        if bot in self._bots:
+            self._bots.remove(bot)
+        bot.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        bot._recv_buffer = bot._send_buffer = b''
+        if not self.add(bot, server_address, server_port):
+            return False
+
+        bot._turn_ready = False
+        bot._awaiting = bot.request_resume().request_id
+        bot._queue_outgoing()
+        return True
+
+    def run(self, timeout=None):
+        """
+        Serves the bots until their games end or they disconnect.
+
+        Args:
+            timeout (float, optional): Seconds after which the bots stop
+                playing. Defaults to None, no limit.
+
+        Returns:
+            bool: True if every bot's game ended, False on timeout or
+                disconnection.
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+
+        while any(bot.is_connected and not bot.game_over for bot in self._bots):
+            if deadline is not None and time.perf_counter() > deadline:
+                return False
+
+            ready = set()
+            for key, mask in self._selector.select(0.5):
+                bot = key.data
+                if mask & selectors.EVENT_READ:
+                    bot._read_responses()
+                if mask & selectors.EVENT_WRITE:
+                    bot._write_requests()
+                ready.add(bot)
+
+            for bot in ready:
+                if not bot.is_connected:
+                    bot._shutdown()
+                    continue
+                bot.step()
+                # Sends what the bot requested while stepping
+                bot._queue_outgoing()
+
+        return all(bot.game_over for bot in self._bots)
+
+    def close(self):
+        """
+        Disconnects every bot.
+        """
+        for bot in self._bots:
+            if bot.client_socket.fileno() != -1:
+                bot._shutdown()
+        self._selector.close()
+
+    @property
+    def bots(self):
+        """
+        Returns the bots served by the runner.
+        """
+        return self._bots
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Headless UNO Online bots.')
+    parser.add_argument('host', help='Address of the Uno server')
+    parser.add_argument('--port', type=int, default=1234)
+    parser.add_argument('--bots', type=int, default=1,
+                        help='Number of bots to connect')
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES),
+                        default='heuristic')
+    args = parser.parse_args()
+
+    runner = BotRunner()
+    for i in range(args.bots):
+        if not runner.add(BotClient(create_strategy(args.strategy)),
+                          args.host, args.port):
+            print(f'Bot {i} could not connect')
+
+    try:
+        runner.run()
+    finally:
+        for bot in runner.bots:
+            print(f'{bot.name}: {bot.moves_played} cards played, '
+                  f'{bot.cards_drawn} drawn, winner {bot.winner}')
+        runner.close()
@@ -0,0 +1,248 @@
+import os
+import random
+import multiprocessing
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, wait
+from card import CardType, encode_card
+from card_collections import UnoDeck
+from rules import candidate_moves, card_points
+import rollouts
+
+class BotStrategy(ABC):
+    """
+    Chooses the moves of a bot player.
+    """
+    name = 'strategy'
+
+    @abstractmethod
+    def choose_move(self, bot):
+        """
+        Chooses the card a bot plays on its turn.
+
+        Args:
+            bot (BotPlayer): The bot in turn, its hand, top card and turn
+                order are read only.
+
+        Returns:
+            UnoCard: The card to play, wild cards carrying the picked
+                color, or None to draw a card.
+        """
+        pass
+
+class RandomStrategy(BotStrategy):
+    """
+    Plays a random legal card, draws only when nothing can be played.
+    """
+    name = 'random'
+
+    def __init__(self, seed=None):
+        """
+        Initializes a new RandomStrategy instance.
+
+        Args:
+            seed (int, optional): Seed of the strategy's random generator.
+        """
+        self._rng = random.Random(seed)
+
+    def choose_move(self, bot):
+        """
+        Chooses a random legal card.
+        """
+        moves = candidate_moves(bot.hand, bot.top_card)
+        return self._rng.choice(moves) if moves else None
+
+class GreedyStrategy(BotStrategy):
+    """
+    Sheds the legal card worth the most points, picking the color it
+    holds the most cards of for wild cards.
+    """
+    name = 'greedy'
+
+    def choose_move(self, bot):
+        """
+        Chooses the legal card worth the most points.
+        """
+        moves = candidate_moves(bot.hand, bot.top_card)
+        if not moves:
+            return None
+
+        colors = Counter(uno_card.color for uno_card in bot.hand)
+        return max(moves, key=lambda uno_card: (
+            card_points(uno_card), colors[uno_card.color]))
+
+class HeuristicStrategy(BotStrategy):
+    """
+    Keeps wild cards for when nothing else can be played and sheds the
+    color it holds the fewest cards of first, naming that color for wild
+    cards too since the other players are the least likely to hold it.
+    """
+    name = 'heuristic'
+
+    def choose_move(self, bot):
+        """
+        Chooses the legal card with the best heuristic score.
+        """
+        moves = candidate_moves(bot.hand, bot.top_card)
+        if not moves:
+            return None
+
+        colors = Counter(uno_card.color for uno_card in bot.hand)
+
+        def score(uno_card):
+            wild = uno_card.type in (CardType.WILD, CardType.WILD_DRAW_FOUR)
+            return (not wild, -colors[uno_card.color], card_points(uno_card))
+
+        return max(moves, key=score)
+
+class MonteCarloStrategy(BotStrategy):
+    """
+    Evaluates every candidate move with determinized rollouts: hidden
+    hands are sampled from the cards the bot has not seen, and random
+    games are played out from each move. The rollouts run on every core
+    through a process pool shared by all the bots of the process, under
+    a time budget per move.
+    """
+    name = 'monte_carlo'
+
+    # Shared by every MonteCarloStrategy of the process
+    _executor = None
+    _workers = 0
+
+    # Time the results take to come back from the workers
+    DISPATCH_MARGIN = 0.008
+
+    def __init__(self, time_budget=0.04, workers=None, seed=None):
+        """
+        Initializes a new MonteCarloStrategy instance.
+
+        Args:
+            time_budget (float, optional): Seconds a move may take, keep it
+                under the 50 ms a server-hosted bot has to answer.
+                Defaults to 0.04.
+            workers (int, optional): Worker processes of the shared pool.
+                Defaults to the number of cores.
+            seed (int, optional): Seed of the rollouts' random generators.
+        """
+        self.time_budget = time_budget
+        self._rng = random.Random(seed)
+        self._fallback = HeuristicStrategy()
+        self._deck_codes = Counter(
+            encode_card(uno_card) for uno_card in UnoDeck().cards)
+        self.rollouts = 0
+        MonteCarloStrategy.start_pool(workers or os.cpu_count() or 1)
+
+    @classmethod
+    def start_pool(cls, workers):
+        """
+        Starts the shared worker processes if they are not running yet.
+
+        Args:
+            workers (int): Number of worker processes.
+        """
+        if cls._executor:
+            return
+
+        # Spawned workers do not inherit the threads of the bot runner
+        cls._executor = ProcessPoolExecutor(
+            workers, multiprocessing.get_context('spawn'))
+        cls._workers = workers
+        wait([cls._executor.submit(rollouts.warm_up) for _ in range(workers)])
+
+    @classmethod
+    def shutdown_pool(cls):
+        """
+        Stops the shared worker processes.
+        """
+        if cls._executor:
+            cls._executor.shutdown(cancel_futures=True)
+            cls._executor = None
+            cls._workers = 0
+
+    def choose_move(self, bot):
+        """
+        Chooses the legal card that won the most rollouts.
+        """
+        moves = candidate_moves(bot.hand, bot.top_card)
+        if len(moves) <= 1:
+            return moves[0] if moves else None
+
+        names = bot.player_names
+        sizes = bot.hand_sizes
+        seat = names.index(bot.name)
+        encoded_moves = [encode_card(uno_card) for uno_card in moves]
+        args = (encoded_moves,
+                [encode_card(uno_card) for uno_card in bot.hand],
+                [sizes.get(name, 7) for name in names],
+                self._unseen_cards(bot),
+                encode_card(bot.top_card),
+                seat,
+                bot.turn_increase,
+                max(0.001, self.time_budget - self.DISPATCH_MARGIN))
+
+        futures = [self._executor.submit(
+                       rollouts.evaluate_moves, *args, self._rng.getrandbits(32))
+                   for _ in range(self._workers)]
+        done, _ = wait(futures, timeout=self.time_budget)
+
+        wins = [0] * len(moves)
+        games = [0] * len(moves)
+        for future in done:
+            if future.exception():
+                continue
+            for i, (w, g) in enumerate(zip(*future.result())):
+                wins[i] += w
+                games[i] += g
+
+        self.rollouts += sum(games)
+        if not any(games):
+            return self._fallback.choose_move(bot)
+
+        best = max(range(len(moves)),
+                   key=lambda i: wins[i] / games[i] if games[i] else -1)
+        return moves[best]
+
+    def _unseen_cards(self, bot):
+        """
+        Returns the cards that may be in the other hands or in the draw
+        pile: the whole deck but the bot's hand and the seen discards.
+
+        Args:
+            bot (BotClient): The bot in turn.
+
+        Returns:
+            list: The encoded unseen cards.
+        """
+        unseen = Counter(self._deck_codes)
+        seen = list(bot.hand) + list(bot.discards)
+        for uno_card in seen:
+            # Wild cards are in the deck without a color
+            code = encode_card(uno_card)
+            if uno_card.type in (CardType.WILD, CardType.WILD_DRAW_FOUR):
+                code = uno_card.type.value * 8 + rollouts.DARK
+            if unseen[code] > 0:
+                unseen[code] -= 1
+        return list(unseen.elements())
+
+STRATEGIES = {
+    RandomStrategy.name: RandomStrategy,
+    GreedyStrategy.name: GreedyStrategy,
+    HeuristicStrategy.name: HeuristicStrategy,
+    MonteCarloStrategy.name: MonteCarloStrategy,
+}
+
+def create_strategy(name, *args, **kwargs):
+    """
+    Creates a strategy from its name.
+
+    Args:
+        name (str): One of the names in STRATEGIES.
+
+    Returns:
+        BotStrategy: The new strategy.
+    """
+    try:
+        strategy_cls = STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f'Unknown bot strategy: {name}')
+    return strategy_cls(*args, **kwargs)
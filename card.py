@@ -69,5 +69,49 @@ class UnoCard:
         Returns:
             CardColor: The color of the UNO card.
         """        
-        return self._color    
-        
\ No newline at end of file
+        return self._color
+
+# Colors in the order of their index in encoded cards
+ENCODED_COLORS = (CardColor.RED, CardColor.GREEN, CardColor.BLUE,
+                  CardColor.YELLOW, CardColor.DARK)
+_COLOR_INDEX = {color: i for i, color in enumerate(ENCODED_COLORS)}
+
+def encode_card(uno_card):
+    """
+    Encodes a card as an int below 128, card type value * 8 + color 
+    index, for simulations and binary recordings.
+
+    Args:
+        uno_card (UnoCard): The card to encode.
+
+    Returns:
+        int: The encoded card.
+    """
+    return uno_card.type.value * 8 + _COLOR_INDEX[uno_card.color]
+
+def encode_hand_card(uno_card):
+    """
+    Encodes a card as held in a hand, wild cards are held without the 
+    color picked for them when played.
+
+    Args:
+        uno_card (UnoCard): The card to encode.
+
+    Returns:
+        int: The encoded card.
+    """
+    if uno_card.type in (CardType.WILD, CardType.WILD_DRAW_FOUR):
+        return uno_card.type.value * 8 + _COLOR_INDEX[CardColor.DARK]
+    return encode_card(uno_card)
+
+def decode_card(code):
+    """
+    Decodes a card encoded with encode_card.
+
+    Args:
+        code (int): The encoded card.
+
+    Returns:
+        UnoCard: The decoded card.
+    """
+    return UnoCard(CardType(code >> 3), ENCODED_COLORS[code & 7])
@@ -135,6 +135,7 @@ class UnoCardViewDirector:
         self._resource_manager = resource_manager
         self._settings = settings
         self._image_resources = self._settings.ImageResources
+        self._contents_cache = {}
         
     def create_card_view(self, uno_card):  
         """
@@ -146,41 +147,85 @@ class UnoCardViewDirector:
         Returns:
             UnoCardView: Created view.
         """
+        center_content, edge_content = self._card_contents(uno_card)
+        return self._build_view(uno_card, center_content, edge_content)
+    
+    def rebind_card_view(self, card_view, uno_card):
+        """
+        Redraws an existing view to show another Uno card.
+
+        Args:
+            card_view (UnoCardView): View to be reused.
+            uno_card (UnoCard): UnoCard to show on the view.
+
+        Returns:
+            UnoCardView: The rebound view.
+        """
+        center_content, edge_content = self._card_contents(uno_card)
+        card_view.rebind(uno_card, center_content, edge_content)
+        return card_view
+    
+    def clear_cache(self):
+        """
+        Forgets the card contents, so they are created again at the 
+        current card size.
+        """
+        self._contents_cache.clear()
+
+    @property
+    def card_width(self):
+        """
+        Returns the width of the card views created now.
+        """
+        return self._settings.CARD_WIDTH
+    
+    def _card_contents(self, uno_card):
+        """
+        Returns the center and edge content for a type of Uno card, 
+        creating them only once per type since they don't depend on color.
+
+        Args:
+            uno_card (UnoCard): UnoCard to get the contents of.
+
+        Returns:
+            tuple: Center content and resized edge content surfaces.
+        """
+        if uno_card.type in self._contents_cache:
+            return self._contents_cache[uno_card.type]
         
         # SKIP 
         if uno_card.type == CardType.SKIP:
-            return self._create_action_card_view(
-                uno_card, self._image_resources.SKIP)
+            contents = self._action_card_contents(self._image_resources.SKIP)
         # REVERSE 
         elif uno_card.type == CardType.REVERSE:
-            return self._create_action_card_view(
-                uno_card, self._image_resources.REVERSE)
+            contents = self._action_card_contents(
+                self._image_resources.REVERSE)
         # DRAW TWO
         elif uno_card.type == CardType.DRAW_TWO:
-            return self._create_action_card_view(
-                uno_card,
+            contents = self._action_card_contents(
                 self._image_resources.DRAW_TWO,
                 self._settings.DRAW_TWO_EDGE_CONTENT)
         # WILD DRAW FOUR
         elif uno_card.type == CardType.WILD_DRAW_FOUR:
-            return self._create_action_card_view(
-                uno_card,
+            contents = self._action_card_contents(
                 self._image_resources.WILD,
                 self._settings.DRAW_FOUR_EDGE_CONTENT)
         # WILD
         elif uno_card.type == CardType.WILD:
-            return self._create_action_card_view(
-                uno_card, self._image_resources.WILD, ' ')
+            contents = self._action_card_contents(
+                self._image_resources.WILD, ' ')
         # NUMBER
         else:
-            return self._create_number_card_view(uno_card)        
+            contents = self._number_card_contents(uno_card)
+        
+        self._contents_cache[uno_card.type] = contents
+        return contents
 
-    def _build_view(self, uno_card, center_content, edge_content=None):
+    def _edge_content(self, center_content, edge_content=None):
         """
-        Builds the view for a UNO card.
+        Resizes the edge content of a card.
 
         Args:
-            uno_card (UnoCard): Object holding type and color of card.
             center_content (Surface): Surface to be displayed on the 
                 center of the card.
             edge_content (Surface, optional): Surface to be 
@@ -188,7 +233,7 @@ class UnoCardViewDirector:
                 of the card. Defaults to None.
 
         Returns:
-            UnoCardView: View of Uno card.
+            Surface: Resized edge content.
         """
         # Creates the the necesarry edge content for the card if needed
         if not edge_content:
@@ -199,10 +244,24 @@ class UnoCardViewDirector:
         edge_content_w = pygame.Surface.get_width(edge_content) * edge_content_ratio
         edge_content_h = pygame.Surface.get_height(edge_content) * edge_content_ratio
         
-        edge_content = pygame.transform.scale(edge_content,
+        return pygame.transform.scale(edge_content,
                                       (edge_content_w,
                                        edge_content_h))   
-        
+
+    def _build_view(self, uno_card, center_content, edge_content):
+        """
+        Builds the view for a UNO card.
+
+        Args:
+            uno_card (UnoCard): Object holding type and color of card.
+            center_content (Surface): Surface to be displayed on the 
+                center of the card.
+            edge_content (Surface): Resized surface to be displayed on the
+                top-left and bottom right of the card.
+
+        Returns:
+            UnoCardView: View of Uno card.
+        """
         # Uses builder to build the uno view card
         self._builder.set_uno_card(uno_card)
         self._builder.set_center_content(center_content)
@@ -214,15 +273,15 @@ class UnoCardViewDirector:
         
         return self._builder.build_view()        
 
-    def _create_number_card_view(self, uno_card):
+    def _number_card_contents(self, uno_card):
         """
-        Creates a view for a UNO Number card.
+        Creates the contents for a UNO Number card.
 
         Args:
-            uno_card (UnoCard): UnoCard to create the view of.
+            uno_card (UnoCard): UnoCard to create the contents of.
 
         Returns:
-            UnoCardView: View of card.
+            tuple: Center and edge content of the card.
         """
         font = self._resource_manager.load_font(
             self._settings.FONT_DIR,
@@ -233,32 +292,25 @@ class UnoCardViewDirector:
             True,
             self._settings.CARD_FONT_COLOR)
         
-        return self._build_view(uno_card, center_content)
+        return center_content, self._edge_content(center_content)
     
     
-    def _create_action_card_view(self, uno_card, center_img_dir, edge_label=None):
+    def _action_card_contents(self, center_img_dir, edge_label=None):
         """
-        Creates a view for a UNO Action card.
+        Creates the contents for a UNO Action card.
 
         Args:
-            uno_card (UnoCard): Uno card to create the view of.
             center_img_dir (str): Directory path of center image.
             edge_label (str, optional): Label that will substitute 
                 edge content. Defaults to None.
 
         Returns:
-            UnoCardView: View of created UNO action card.
+            tuple: Center and edge content of the card.
         """
-        center_content = self._resource_manager.get_image(center_img_dir)
-        
-        # Resizes center content surface
+        # Resized center content surface for the current card size
         c_content_ratio = self._settings.CENTER_CONTENT_RATIO
-        c_content_w = pygame.Surface.get_width(center_content) * c_content_ratio
-        c_content_h = pygame.Surface.get_height(center_content) * c_content_ratio
-        
-        center_content = pygame.transform.scale(center_content,
-                                      (c_content_w,
-                                       c_content_h))  
+        center_content = self._resource_manager.get_scaled_image(
+            center_img_dir, c_content_ratio * self._settings.CARD_SCALE)
         
         if edge_label:
             font = self._resource_manager.load_font(
@@ -268,7 +320,7 @@ class UnoCardViewDirector:
             edge_label = font.render(
                 edge_label, True, self._settings.CARD_FONT_COLOR) 
         
-        return self._build_view(uno_card, center_content, edge_label)
+        return center_content, self._edge_content(center_content, edge_label)
     
     def create_custom_card_view(self, uno_card, center_content, edge_label=None):
         """
@@ -287,5 +339,4 @@ class UnoCardViewDirector:
         return self._build_view(
             UnoCard(CardType.NONE, CardColor.DARK),
             center_content,
-            edge_label)
-        
+            self._edge_content(center_content, edge_label))
@@ -5,11 +5,19 @@ class UnoDeck:
     """
     Represents a deck of Uno cards.
     """    
-    def __init__(self):
+    def __init__(self, rng=None, cards=None):
         """
         Initializes the UnoDeck by generating a standard Uno deck.
+
+        Args:
+            rng (random.Random, optional): Random generator of the shuffles,
+                seed it to make them reproducible. Defaults to the global 
+                random module.
+            cards (list, optional): UnoCards of a deck being restored, in 
+                order. Defaults to None, a standard deck.
         """        
-        self._cards = self._generate_deck()
+        self._rng = rng if rng is not None else random
+        self._cards = list(cards) if cards is not None else self._generate_deck()
 
     def _generate_deck(self):
         """
@@ -30,9 +38,9 @@ class UnoDeck:
 
     def shuffle(self):
         """
-        Shuffles the deck randomly.
+        Shuffles the deck with the deck's random generator.
         """        
-        random.shuffle(self._cards)
+        self._rng.shuffle(self._cards)
 
     def draw_card(self):
         """
@@ -62,7 +70,7 @@ class UnoDeck:
         Args:
             uno_card (UnoCard): The Uno card to be added.
         """        
-        self._cards.add(uno_card)  
+        self._cards.append(uno_card)
 
     @property
     def cards(self):
@@ -74,8 +82,15 @@ class UnoDeck:
 class UnoHand:
     """
     Represents a player's hand in Uno.
+    
+    The hand is virtualized: cards are laid out in fixed width slots that
+    are shifted by a scroll offset, and only the cards inside the view
+    are positioned, hit-tested and drawn.
     """    
-    def __init__(self, card_group, x = 0, y = 0):
+    CARD_MARGIN = 10
+    
+    def __init__(self, card_group, x = 0, y = 0, view_width = None,
+                 animator = None, animation_duration = 0.2):
         """
         Initializes the UnoHand.
 
@@ -84,10 +99,24 @@ class UnoHand:
             containing UnoCard objects.
             x (int): X-coordinate position of the hand (default is 0).
             y (int): Y-coordinate position of the hand (default is 0).
+            view_width (int, optional): Width of the visible area of the 
+                hand. Defaults to None, which shows every card.
+            animator (Animator, optional): Animator moving the visible cards
+                when cards are added or removed. Defaults to None, which
+                moves them instantly.
+            animation_duration (float, optional): Seconds a reflow takes.
+                Defaults to 0.2.
         """        
         self.card_group = card_group
         self._x = x
         self._y = y
+        self._view_width = view_width
+        self._animator = animator
+        self._animation_duration = animation_duration
+        self._scroll_offset = 0
+        self._card_list = list(card_group)
+        self._visible = []
+        self._layout_version = 0
         
     def add_card(self, card_view):
         """
@@ -97,19 +126,105 @@ class UnoHand:
             card_view (UnoCard): The Uno card to be added.
         """        
         self.card_group.add(card_view)
+        self._card_list.append(card_view)
+        self.organize_cards(animate=True)
+        
+    def remove_card(self, card_view):
+        """
+        Removes an UnoCard from the hand and organizes the cards.
+
+        Args:
+            card_view (UnoCard): The Uno card to be removed.
+        """        
+        self.card_group.remove(card_view)
+        self._card_list.remove(card_view)
+        self._scroll_offset = self._clamp_offset(self._scroll_offset)
+        self.organize_cards(animate=True)
+        
+    def clear(self):
+        """
+        Removes every card from the hand.
+
+        Returns:
+            list: The removed cards.
+        """
+        removed = self._card_list
+        self.card_group.empty()
+        self._card_list = []
+        self._scroll_offset = 0
         self.organize_cards()
+        return removed
         
-    def organize_cards(self):
+    def organize_cards(self, animate=False):
         """
-        Organizes the cards in the hand.
+        Organizes the cards that are visible in the hand.
+
+        Args:
+            animate (bool, optional): Whether the cards move to their place
+                with the animator. Defaults to False.
         """        
-        current_x = self._x
-        current_y = self._y
-        for card in self.card_group:
-            card.rect.bottom = current_y
-            card.rect.x = current_x
-            card.set_initial_pos(card.rect.x, card.rect.y)
-            current_x = card.rect.right + 10 # margin between cards
+        self._layout_version += 1
+        if not self._card_list:
+            self._visible = []
+            return
+        
+        card_pitch = self._card_pitch()
+        first, last = self._visible_range(card_pitch)
+        current_x = self._x + first * card_pitch - self._scroll_offset
+        
+        self._visible = self._card_list[first:last]
+        for card in self._visible:
+            target = (current_x, self._y - card.rect.height)
+            card.set_initial_pos(*target)
+            
+            if animate and self._animator is not None:
+                self._animator.move(card, target, self._animation_duration)
+            else:
+                if self._animator is not None:
+                    self._animator.cancel(card)
+                card.rect.topleft = target
+            current_x += card_pitch
+
+    def _card_pitch(self):
+        """
+        Returns the horizontal distance between the start of two 
+        consecutive cards.
+        """
+        return self._card_list[0].rect.width + UnoHand.CARD_MARGIN
+
+    def _visible_range(self, card_pitch):
+        """
+        Calculates the indexes of the cards inside the view.
+
+        Args:
+            card_pitch (int): Distance between two consecutive cards.
+
+        Returns:
+            tuple: First (inclusive) and last (exclusive) visible indexes.
+        """
+        if self._view_width is None:
+            return 0, len(self._card_list)
+        
+        first = int(self._scroll_offset // card_pitch)
+        last = -int(-(self._scroll_offset + self._view_width) // card_pitch)
+        return first, min(last, len(self._card_list))
+    
+    def _clamp_offset(self, offset):
+        """
+        Clamps a scroll offset to the scrollable width of the hand.
+
+        Args:
+            offset (int): The scroll offset to clamp.
+
+        Returns:
+            int: The clamped scroll offset.
+        """
+        if self._view_width is None or not self._card_list:
+            return 0
+        
+        content_w = len(self._card_list) * self._card_pitch()
+        content_w -= UnoHand.CARD_MARGIN
+        return max(0, min(offset, content_w - self._view_width))
 
     @property
     def x(self):
@@ -128,15 +243,36 @@ class UnoHand:
         """        
         self._x = value
         self.organize_cards()
+        
+    @property
+    def scroll_offset(self):
+        """
+        Returns how far the hand is scrolled to the right.
+        """
+        return self._scroll_offset
+    
+    @scroll_offset.setter
+    def scroll_offset(self, value):
+        """
+        Scrolls the hand, organizing only the visible cards.
+
+        Args:
+            value (int): The new scroll offset.
+        """
+        value = self._clamp_offset(value)
+        if value != self._scroll_offset:
+            self._scroll_offset = value
+            self.organize_cards()
 
     def blitme(self, surface):
         """
-        Draws the hand on the specified surface.
+        Draws the visible cards of the hand on the specified surface.
 
         Args:
             surface: The surface on which to draw the hand.
         """        
-        self.card_group.draw(surface) 
+        surface.blits([(card.image, card.rect) for card in self._visible],
+                      False) 
 
     @property
     def cards(self):
@@ -144,4 +280,17 @@ class UnoHand:
         Returns the Pygame sprite group containing UnoCard objects.
         """        
         return self.card_group              
-            
+    
+    @property
+    def visible_cards(self):
+        """
+        Returns the list of cards inside the view of the hand.
+        """
+        return self._visible
+
+    @property
+    def layout_version(self):
+        """
+        Returns a counter increased every time the cards are organized.
+        """
+        return self._layout_version
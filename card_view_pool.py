@@ -0,0 +1,88 @@
+class UnoCardViewPool:
+    """
+    Keeps released UnoCardView sprites so they can be rebound to other
+    Uno cards instead of allocating new surfaces every turn.
+    """
+    def __init__(self, director, max_size=128):
+        """
+        Initializes a new UnoCardViewPool instance.
+
+        Args:
+            director (UnoCardViewDirector): Director used to create and
+                rebind the card views.
+            max_size (int, optional): Maximum number of idle views kept.
+                Defaults to 128, more than the cards of a deck.
+        """
+        self._director = director
+        self._max_size = max_size
+        self._free = []
+        self.allocated = 0
+        self.reused = 0
+        self.released = 0
+        self.discarded = 0
+
+    def acquire(self, uno_card):
+        """
+        Returns a view of an Uno card, reusing an idle one when possible.
+
+        Args:
+            uno_card (UnoCard): UnoCard to get the view of.
+
+        Returns:
+            UnoCardView: View showing the Uno card.
+        """
+        if self._free:
+            self.reused += 1
+            return self._director.rebind_card_view(self._free.pop(), uno_card)
+
+        self.allocated += 1
+        return self._director.create_card_view(uno_card)
+
+    def release(self, card_view):
+        """
+        Gives a view back to the pool once it is no longer displayed.
+
+        Args:
+            card_view (UnoCardView): The view to be reused later.
+        """
+        card_view.kill()
+        self.released += 1
+        # Views of the card size before a resize are not reused
+        if (len(self._free) < self._max_size and 
+                card_view.rect.width == self._director.card_width):
+            self._free.append(card_view)
+        else:
+            self.discarded += 1
+
+    def clear(self):
+        """
+        Discards the idle views and the director's card contents, after
+        the card size changed.
+        """
+        self.discarded += len(self._free)
+        self._free = []
+        self._director.clear_cache()
+
+    def stats(self):
+        """
+        Returns the allocation counters of the pool.
+
+        Returns:
+            dict: Views allocated, reused, released, discarded, idle and
+                in use.
+        """
+        return {
+            'allocated': self.allocated,
+            'reused': self.reused,
+            'released': self.released,
+            'discarded': self.discarded,
+            'idle': len(self._free),
+            'in_use': self.allocated - self.discarded - len(self._free),
+        }
+
+    @property
+    def director(self):
+        """
+        Returns the director used to create the card views.
+        """
+        return self._director
@@ -1,23 +1,59 @@
 import socket
-from status_code import StatusCode, UnoMessage
+from status_code import (StatusCode, UnoMessage, MalformedMessageError,
+                         unpack_messages)
 import pickle
 import threading
 import queue
+import itertools
+import selectors
+import time
+from collections import deque
+from concurrent.futures import Future
+from network_stats import ConnectionStats
 
 class Client:
     """
-    Represents a client in the Uno game application, responsible for 
+    Represents a client in the Uno game application, responsible for
         communication with the server.
-    """    
-    def __init__(self):
+
+    A single I/O thread owns the socket and multiplexes reads, writes and
+    wake-ups from the main thread with a selector. Every request returns a
+    Future resolved by the server response carrying the same request id.
+    Once the game starts, the I/O thread also pings the server periodically
+    to measure the connection quality, available through the stats
+    attribute.
+    """
+    CONNECTION_TIMEOUT = 5
+
+    def __init__(self, ping_interval=2.0):
         """
         Initializes the Client instance.
-        """        
+
+        Args:
+            ping_interval (float, optional): Seconds between round trip
+                time probes, None disables them. Defaults to 2.0.
+        """
         self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.is_connected = False
         self.result_q = queue.Queue()
-        self.pending_responses = []
-                
+        self._recv_buffer = b''
+        self._send_buffer = b''
+        self._outgoing = queue.Queue()
+        self._pending_requests = {}
+        self._pending_lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        self._selector = None
+        self._wakeup_r = self._wakeup_w = None
+        self.stats = ConnectionStats()
+        self._ping_interval = ping_interval
+        self._next_ping = None
+        self._resolved_ids = deque(maxlen=256)
+        self._summary_printed = False
+        self._lobby_socket = None
+        self.resume_token = None
+        self._resume_on_connect = False
+        self._io_thread = None
+
     def connect_to_server(self, server_address, server_port):
         """
         Initiates a connection to the Uno server.
@@ -25,110 +61,443 @@ class Client:
         Args:
             server_address (str): The IP address of the Uno server.
             server_port (int): The port number of the Uno server.
-        """        
+        """
         self.server_address = server_address
         self.server_port = server_port
-        connection_thread = threading.Thread(target=self.connection_attempt)
-        connection_thread.start()   
-            
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self._io_thread = threading.Thread(
+            target=self._run_io_loop, daemon=True)
+        self._io_thread.start()
+
+    def resume_game(self, server_address, server_port):
+        """
+        Reconnects to a server that restarted and reclaims the seat of the
+        game in progress with the token received with GAME_START. The
+        GAME_SNAPSHOT of the game, or CONNECTION_FAILED, is put in the
+        result queue.
+
+        Args:
+            server_address (str): The IP address of the Uno server.
+            server_port (int): The port the server resumes games on.
+        """
+        # The I/O thread of the lost connection closes it first
+        if self._io_thread:
+            self._io_thread.join()
+        self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._recv_buffer = self._send_buffer = b''
+        self._resume_on_connect = True
+        self.connect_to_server(server_address, server_port)
+
+    def connect_to_matchmaking(self, lobby_address, lobby_port, table_size):
+        """
+        Queues in the matchmaking lobby, then connects to the game server
+        of the table the lobby forms. MATCH_QUEUED and MATCH_FOUND messages
+        are put in the result queue while waiting.
+
+        Args:
+            lobby_address (str): The IP address of the lobby.
+            lobby_port (int): The port number of the lobby.
+            table_size (int): Number of players to play with.
+        """
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self._io_thread = threading.Thread(
+            target=self._run_matchmaking,
+            args=(lobby_address, lobby_port, table_size), daemon=True)
+        self._io_thread.start()
+
+    def _run_matchmaking(self, lobby_address, lobby_port, table_size):
+        """
+        Waits in the lobby for a table and serves the connection to its 
+        game server, runs in the I/O thread.
+        """
+        table_address = self._find_match(lobby_address, lobby_port, table_size)
+        if table_address is None:
+            self.result_q.put(UnoMessage(StatusCode.CONNECTION_FAILED))
+            return
+
+        self.server_address, self.server_port = table_address
+        self._run_io_loop()
+
+    def _find_match(self, lobby_address, lobby_port, table_size):
+        """
+        Queues in the lobby until a table is formed, runs in the I/O thread.
+
+        Returns:
+            tuple: Address and port of the table's game server, or None if
+                the lobby could not be reached.
+        """
+        try:
+            self._lobby_socket = socket.create_connection(
+                (lobby_address, lobby_port), Client.CONNECTION_TIMEOUT)
+            self._lobby_socket.settimeout(None)
+            self._lobby_socket.sendall(pickle.dumps(
+                UnoMessage(StatusCode.MATCH_REQUEST, table_size)))
+
+            buffer = b''
+            while True:
+                data = self._lobby_socket.recv(4096)
+                if not data:
+                    raise ConnectionError('The lobby closed the connection')
+                uno_msgs, buffer = unpack_messages(buffer + data)
+                for uno_msg in uno_msgs:
+                    self.result_q.put(uno_msg)
+                    if uno_msg.status_code == StatusCode.MATCH_FOUND:
+                        return uno_msg.data
+        except Exception as e:
+            print(f'{e}')
+            return None
+        finally:
+            if self._lobby_socket:
+                self._lobby_socket.close()
+                self._lobby_socket = None
+
     def connection_attempt(self):
         """
-        Handles the connection attempt to the Uno server in a separate thread.
-        """        
+        Connects to the Uno server, runs in the I/O thread.
+
+        Returns:
+            bool: True if the connection succeeded, False otherwise.
+        """
         try:
+            self.client_socket.settimeout(Client.CONNECTION_TIMEOUT)
             self.client_socket.connect((self.server_address, self.server_port))
+            self.client_socket.setblocking(False)
             self.is_connected = True
             self.name = str(self.client_socket.getsockname())
             r = UnoMessage(StatusCode.CONNECTION_SUCCESS)
-            
-            # Client starts handling server responses
-            game_thread = threading.Thread(target=self.handle_responses)
-            game_thread.start()  
         except Exception as e:
             print(f'{e}')
             r = UnoMessage(StatusCode.CONNECTION_FAILED)
-        
+
         self.result_q.put(r)
+        return self.is_connected
+
+    def _run_io_loop(self):
+        """
+        Connects to the server and serves the socket until the connection
+        is closed, runs in the I/O thread.
+        """
+        if not self.connection_attempt():
+            return
+
+        self._selector.register(self.client_socket, selectors.EVENT_READ, self)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+
+        # A reconnected client reclaims its seat before anything else
+        if self._resume_on_connect:
+            self._resume_on_connect = False
+            self.request_resume()
+
+        try:
+            while self.is_connected:
+                for key, mask in self._selector.select(self._time_to_ping()):
+                    if key.fileobj is self._wakeup_r:
+                        self._drain_wakeups()
+                        self._queue_outgoing()
+                    else:
+                        if mask & selectors.EVENT_READ:
+                            self._read_responses()
+                        if mask & selectors.EVENT_WRITE:
+                            self._write_requests()
+
+                if self._time_to_ping() == 0:
+                    self._send_ping()
+        except OSError as e:
+            print(f'Connection Exception: {e}\n')
+        finally:
+            self._shutdown()
+
+    def _time_to_ping(self):
+        """
+        Returns how long the I/O thread can wait before the next ping.
+
+        Returns:
+            float: Seconds until the next ping, or None without pings.
+        """
+        if self._next_ping is None:
+            return None
+        return max(0, self._next_ping - time.perf_counter())
+
+    def _send_ping(self):
+        """
+        Sends a round trip time probe carrying its send time, runs in the
+        I/O thread.
+        """
+        now = time.perf_counter()
+        self._send_buffer += pickle.dumps(UnoMessage(StatusCode.PING, now))
+        self.stats.record_ping()
+        self._next_ping = now + self._ping_interval
+        self._write_requests()
+
+    def _drain_wakeups(self):
+        """
+        Empties the wake-up socket.
+        """
+        try:
+            while self._wakeup_r.recv(512):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _queue_outgoing(self):
+        """
+        Moves the requests made by the main thread to the send buffer.
+        """
+        while True:
+            try:
+                self._send_buffer += self._outgoing.get_nowait()
+            except queue.Empty:
+                break
+        self._write_requests()
+
+    def _write_requests(self):
+        """
+        Sends as much of the send buffer as the socket accepts, waiting for
+        the socket to be writable again if needed.
+        """
+        if self._send_buffer:
+            try:
+                sent = self.client_socket.send(self._send_buffer)
+                self._send_buffer = self._send_buffer[sent:]
+                self.stats.record_bytes_out(sent)
+            except BlockingIOError:
+                pass
+
+        events = selectors.EVENT_READ
+        if self._send_buffer:
+            events |= selectors.EVENT_WRITE
+        self._selector.modify(self.client_socket, events, self)
+
+    def _read_responses(self):
+        """
+        Receives the available bytes and dispatches every complete response.
+        """
+        try:
+            response = self.client_socket.recv(4096)
+        except BlockingIOError:
+            return
+
+        # An empty read means the server closed the connection
+        if not response:
+            print('Server closed the connection\n')
+            self.is_connected = False
+            return
+
+        self.stats.record_bytes_in(len(response))
+        try:
+            uno_responses = self._unpack_responses(response)
+        except MalformedMessageError as e:
+            print(f'Dropping the connection: {e}\n')
+            self.is_connected = False
+            return
         
+        for uno_response in uno_responses:
+            # Ping echoes only feed the statistics
+            if uno_response.status_code == StatusCode.PING:
+                rtt = time.perf_counter() - uno_response.data
+                self.stats.record_rtt(rtt * 1000)
+                continue
+            # The token reclaims the seat if the server restarts
+            if uno_response.status_code == StatusCode.GAME_START:
+                self.resume_token = uno_response.data
+            # The server reads the players' messages once they are seated,
+            # earlier pings would measure the wait for the room to fill
+            if (uno_response.status_code in (StatusCode.GAME_START,
+                                             StatusCode.GAME_SNAPSHOT) and
+                    self._ping_interval and self._next_ping is None):
+                self._next_ping = time.perf_counter()
+            self.result_q.put(uno_response)
+            self._resolve_request(uno_response)
+
+    def _resolve_request(self, uno_response):
+        """
+        Resolves the future of the request a response answers.
+
+        Args:
+            uno_response (UnoMessage): The received response.
+        """
+        request_id = getattr(uno_response, 'request_id', None)
+        if request_id is None:
+            return
+
+        # The server resends responses it considers unacknowledged
+        if request_id in self._resolved_ids:
+            self.stats.record_retransmit()
+            return
+        self._resolved_ids.append(request_id)
+
+        with self._pending_lock:
+            future = self._pending_requests.pop(request_id, None)
+        if future and not future.done():
+            future.set_result(uno_response)
+
+    def _shutdown(self):
+        """
+        Closes the connection and fails the requests still waiting for a
+        response, runs in the I/O thread.
+        """
+        self.is_connected = False
+        self._next_ping = None
+        self._selector.close()
+        self.client_socket.close()
+        self.print_session_summary()
+        self._fail_pending_requests()
+
+    def _fail_pending_requests(self):
+        """
+        Fails the requests still waiting for a response.
+        """
+        with self._pending_lock:
+            pending = list(self._pending_requests.values())
+            self._pending_requests.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(ConnectionError('Connection closed'))
+
     def get_response(self):
         """
         Retrieves a response from the server.
 
         Returns:
             UnoMessage: The received UnoMessage from the server.
-        """        
+        """
         r = self.result_q.get()
         print(f'RECEIVING : {r.status_code}\n')
         return r
-    
+
     def response_received(self):
         """
         Checks if there are any pending responses in the result queue.
 
         Returns:
             bool: True if there are pending responses, False otherwise.
-        """        
-        return not self.result_q.empty()    
-            
-    def handle_responses(self):
         """
-        Handles and processes incoming responses from the server.
-        """        
-        while self.is_connected:
-            
+        return not self.result_q.empty()
+
+    def drain_responses(self):
+        """
+        Retrieves every response received so far without blocking.
+        Only the latest broadcast GAME_STATE is kept since it supersedes 
+        the previous ones.
+
+        Returns:
+            list: The received UnoMessages, in arrival order.
+        """
+        responses = []
+        while True:
             try:
-                if not self.pending_responses:
-                    self.client_socket.settimeout(None)
-                
-                response = self.client_socket.recv(512)
-                uno_response = pickle.loads(response) 
-                self.result_q.put(uno_response)
-                
-                if self.pending_responses:
-                    self.pending_responses.pop(0)
-                
-            except socket.timeout:
-                uno_msg = self.pending_responses.pop(0)
-                self.send_request(uno_msg.status_code, uno_msg.data)
-                
-            except Exception as e:
-                print(f'Receiving Exception: {e}\n')
-        
+                responses.append(self.result_q.get_nowait())
+            except queue.Empty:
+                break
+
+        last_state = None
+        for i, r in enumerate(responses):
+            if r.status_code == StatusCode.GAME_STATE:
+                last_state = i
+
+        # Responses to this client's requests are always kept
+        responses = [r for i, r in enumerate(responses)
+                     if r.status_code != StatusCode.GAME_STATE or
+                     i == last_state or r.request_id is not None]
+        for r in responses:
+            print(f'RECEIVING : {r.status_code}\n')
+        return responses
+
+    def _unpack_responses(self, data):
+        """
+        Deserializes every complete message received, keeping a trailing
+        partial message until the rest of it arrives.
+
+        Args:
+            data (bytes): The bytes just received.
+
+        Returns:
+            list: The complete UnoMessages.
+
+        Raises:
+            MalformedMessageError: If the server sent something else than
+                UnoMessages.
+        """
+        responses, self._recv_buffer = unpack_messages(
+            self._recv_buffer + data)
+        return responses
+
     def request_initial_cards(self):
         """
         Sends a request to the server for initial card drawing.
-        """        
-        self.send_request(StatusCode.INITIAL_DRAW)  
-        
+
+        Returns:
+            Future: Resolved with the CARD_DRAW response, or with 
+                MOVE_REJECTED if the cards were already dealt.
+        """
+        return self.send_request(StatusCode.INITIAL_DRAW)
+
     def request_card_draw(self):
         """
         Sends a request to the server to draw a card.
-        """        
-        self.send_request(StatusCode.CARD_DRAW)  
-        
+
+        Returns:
+            Future: Resolved with the CARD_DRAW response, or with 
+                MOVE_REJECTED if it is not the player's turn.
+        """
+        return self.send_request(StatusCode.CARD_DRAW)
+
     def request_card_play(self, uno_card, is_winning_card):
         """
         Sends a request to the server to play a card.
 
         Args:
             uno_card: The Uno card to be played.
-            is_winning_card (bool): Flag indicating whether the played card 
-                leads to a win.
-        """        
-        self.send_request(StatusCode.CARD_PLAY, [uno_card, is_winning_card])
+            is_winning_card (bool): Flag indicating whether the played card
+                leads to a win, the server decides the win from the hand
+                it tracks.
+
+        Returns:
+            Future: Resolved with the GAME_STATE following the play, or
+                with MOVE_REJECTED if the server did not apply it.
+        """
+        return self.send_request(
+            StatusCode.CARD_PLAY, [uno_card, is_winning_card])
 
     def request_game_status(self):
         """
         Sends a request to the server for the current game state.
-        """        
-        self.send_request(StatusCode.GAME_STATE)        
+
+        Returns:
+            Future: Resolved with the GAME_STATE response.
+        """
+        return self.send_request(StatusCode.GAME_STATE)
+
+    def request_resume(self, resume_token=None):
+        """
+        Sends a request to reclaim the player's seat in a game the server
+        recovered after a restart.
+
+        Args:
+            resume_token (str, optional): The token of the seat. Defaults
+                to the one received with GAME_START.
+
+        Returns:
+            Future: Resolved with the GAME_SNAPSHOT of the resumed game,
+                holding the player's hand, or with CONNECTION_FAILED if
+                the seat could not be resumed.
+        """
+        if resume_token is None:
+            resume_token = self.resume_token
+        return self.send_request(StatusCode.RESUME, resume_token)
 
     def request_win(self):
         """
         Sends a request to the server indicating a win.
-        """        
-        self.send_request(StatusCode.WIN)                          
-        
+        """
+        return self.send_request(StatusCode.WIN)
+
     def send_request(self, status_code, dta=None):
         """
         Sends a request to the server with a given status code and optional data.
@@ -136,27 +505,63 @@ class Client:
         Args:
             status_code: The status code of the request.
             dta: Optional data associated with the request.
-        """        
-        uno_msg = UnoMessage(status_code, dta)
+
+        Returns:
+            Future: Resolved with the response to the request, or failed
+                if the connection closes first. Its request_id attribute
+                holds the id sent to the server.
+        """
+        future = Future()
+        future.request_id = None
+        if not self.is_connected:
+            print(f"Not connected, dropping request: {status_code}")
+            future.set_exception(ConnectionError('Not connected'))
+            return future
+
+        uno_msg = UnoMessage(status_code, dta, next(self._request_ids))
+        future.request_id = uno_msg.request_id
         print(f'SENDING : {uno_msg.status_code}\n')
-        
+
+        with self._pending_lock:
+            self._pending_requests[uno_msg.request_id] = future
+
+        # Serializes data with pickle, the I/O thread does the sending
+        self._outgoing.put(pickle.dumps(uno_msg))
+        self._wake_io_thread()
+        return future
+
+    def _wake_io_thread(self):
+        """
+        Interrupts the I/O thread's select call.
+        """
+        if self._wakeup_w is None:
+            return # served by an outside I/O loop, see BotRunner
         try:
-            # Serializes data with pickle
-            serialized_msg = pickle.dumps(uno_msg)
-            self.client_socket.send(serialized_msg) 
-            self.pending_responses.insert(0, uno_msg)
-            self.client_socket.settimeout(1)
-            
-        except socket.error as se:
-            print(f"Socket error during send: {se}")
-        except Exception as e:
-            print(f"Unexpected error during send: {e}")     
-            
+            self._wakeup_w.send(b'\0')
+        except BlockingIOError:
+            pass # a wake-up is already pending
+
     def close_connection(self):
         """
         Closes the connection with the Uno server.
-        """        
+        """
+        # Leaves the matchmaking queue
+        lobby_socket = self._lobby_socket
+        if lobby_socket:
+            try:
+                lobby_socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            
         if self.is_connected:
-            self.client_socket.close()
-            self.is_connected = not self.is_connected
-    
\ No newline at end of file
+            self.is_connected = False
+            self._wake_io_thread()
+            self.print_session_summary()
+
+    def print_session_summary(self):
+        """
+        Prints the connection statistics of the session once.
+        """
+        if not self._summary_printed:
+            self._summary_printed = True
+            print(self.stats.summary())
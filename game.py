@@ -16,7 +16,8 @@ class Game:
         self._settings = Settings()
         self._resource_manager = ResourceManager()
         
-        pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN])
+        pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN,
+                                  pygame.VIDEORESIZE])
         pygame.display.set_caption(self._settings.TITLE)
         
         
@@ -28,6 +29,7 @@ class Game:
         The main game loop.
         """
         while 1:
+            self.game_instance.profiler.begin_frame()
             self._check_events()
             self._update_screen()
             self._draw_screen()
@@ -45,7 +47,11 @@ class Game:
     def _draw_screen(self):
         """Draws game instance current screen(state)"""
         self.game_instance.blit_state()
-        pygame.display.flip()
+        profiler = self.game_instance.profiler
+        profiler.blitme(self.game_instance.get_screen())
+        self.game_instance.network_overlay.blitme(self.game_instance.get_screen())
+        with profiler.section('flip'):
+            pygame.display.flip()
 
 
 if __name__ == "__main__":
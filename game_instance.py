@@ -1,6 +1,11 @@
 import pygame
 from states.start_screen import StartScreen
 from client import Client
+from profiler import FrameProfiler
+from network_stats import ConnectionStatsOverlay
+from card_builder_director import UnoCardViewBuilder, UnoCardViewDirector
+from card_view_pool import UnoCardViewPool
+from asset_preloader import AssetPreloader
 
 class GameInstance:
     """Represents an instance of the game"""
@@ -19,18 +24,47 @@ class GameInstance:
 
         self.settings = settings
         self.resource_manager = resource_manager
-        flags = pygame.DOUBLEBUF
+        flags = pygame.DOUBLEBUF | pygame.RESIZABLE
 
-        # Initializes initial screen surface
+        # Initializes initial screen surface with the desktop's pixel 
+        # format so assets converted to it blit without conversion
         self.screen = pygame.display.set_mode(
             (self.settings.SCREEN_WIDTH, self.settings.SCREEN_HEIGHT),
-            flags, 8
+            flags
         )
         
         self.screen_rect = self.screen.get_rect()
+        
+        # Cards are sized, and their images scaled, for the actual display
+        self.settings.set_display_size(*self.screen.get_size())
+        
+        # Cached render of the paused states underneath the current one
+        self._paused_snapshot = None
+        self._paused_states = []
+        
+        # Initializes the opt-in frame profiler
+        self.profiler = FrameProfiler(
+            self.settings.PROFILER_ENABLED,
+            self.settings.PROFILER_HISTORY,
+            self.settings.PROFILER_CSV_PATH)
+        self.profiler.set_font(self.resource_manager.load_font(
+            self.settings.FONT_DIR, self.settings.PROFILER_FONT_SIZE))
+
+        # Card views are reused across turns and games
+        self.card_pool = UnoCardViewPool(UnoCardViewDirector(
+            UnoCardViewBuilder(), self.resource_manager, self.settings))
+        
+        # Prepares the play screen assets while the start screen shows
+        self.preloader = AssetPreloader(
+            self.resource_manager, self.settings, self.card_pool)
 
         # Initializes the client
-        self._client = Client()
+        self._client = Client(self.settings.PING_INTERVAL)
+        self.network_overlay = ConnectionStatsOverlay(
+            self._client.stats,
+            self.resource_manager.load_font(
+                self.settings.FONT_DIR, self.settings.NETWORK_OVERLAY_FONT_SIZE),
+            self.settings.NETWORK_OVERLAY_ENABLED)
 
         # Transitions the game screen to the start screen
         self.transition_to(StartScreen(self))
@@ -84,16 +118,73 @@ class GameInstance:
         Updates the current screen (state).
         """
         for state in self._states:
-            state.update()
+            with self.profiler.section('update', type(state).__name__):
+                state.update()
 
     def blit_state(self):
-        """Blits current screen(state)"""
-        for state in self._states:
+        """
+        Blits current screen(state).
+        
+        Paused screens are drawn once into a snapshot that is reused
+        every frame until one of them is invalidated or the screen stack
+        changes.
+        """
+        paused_states = [s for s in self._states if s.is_paused()]
+        
+        if paused_states:
+            # Every paused state must consume its invalidation
+            invalidated = [s.consume_invalidation() for s in paused_states]
+            
+            if (any(invalidated) or self._paused_snapshot is None or
+                paused_states != self._paused_states):
+                for state in paused_states:
+                    with self.profiler.section('blit', type(state).__name__):
+                        state.blit()
+                self._cache_paused_snapshot(paused_states)
+            else:
+                with self.profiler.section('blit', 'PausedSnapshot'):
+                    self.screen.blit(self._paused_snapshot, (0, 0))
+        else:
+            self._paused_states = []
+
+        state = self._states[-1]
+        with self.profiler.section('blit', type(state).__name__):
             state.blit()
+            
+    def _cache_paused_snapshot(self, paused_states):
+        """
+        Stores what is on the screen as the snapshot of the paused states.
+
+        Args:
+            paused_states (list): The screens (states) drawn on the screen.
+        """
+        if self._paused_snapshot is None:
+            self._paused_snapshot = self.screen.copy()
+        else:
+            self._paused_snapshot.blit(self.screen, (0, 0))
+        self._paused_states = paused_states
+
+    def resize(self):
+        """
+        Adapts the screens (states) to the new size of the window, with
+        the card assets scaled again for it.
+        """
+        self.screen = pygame.display.get_surface()
+        self.screen_rect = self.screen.get_rect()
+        self._paused_snapshot = None
+        
+        self.settings.set_display_size(*self.screen.get_size())
+        self.resource_manager.clear_scaled_images()
+        self.card_pool.clear()
+        
+        for state in self._states:
+            state.resize()
 
     def check_state_events(self):
         """checks current screen(state) input events"""
-        return self._states[-1]._check_screen_events()
+        state = self._states[-1]
+        with self.profiler.section('events', type(state).__name__):
+            return state._check_screen_events()
 
     def get_screen(self):
         """
@@ -0,0 +1,311 @@
+"""
+Write-ahead journal of UNO Online games.
+
+Every move of every room is appended to the journal before the server
+applies it. A single writer thread commits the moves of all the rooms of
+a process in groups, one write and one fsync per group, so rooms moving
+at the same time share the cost of the disk flush. Rooms are snapshotted
+periodically, and a restarted server rebuilds them from their last
+snapshot and the moves journaled after it.
+
+Layout of the journal directory:
+    wal-<n>.log             log segments, records of every room
+    snapshots/<room>.snap   last snapshot of each room
+"""
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+RECORD = struct.Struct('<IIQI')
+
+class RoomLog:
+    """
+    What the journal holds about an unfinished room.
+    """
+    def __init__(self, room_id):
+        """
+        Initializes a new RoomLog instance.
+
+        Args:
+            room_id (int): Id of the room, the seed of its game.
+        """
+        self.room_id = room_id
+        self.start = None
+        self.snapshot = None
+        self.moves = []
+
+    @property
+    def snapshot_index(self):
+        """
+        Returns the number of moves the snapshot includes, 0 without one.
+        """
+        return self.snapshot['moves'] if self.snapshot else 0
+
+class GameJournal:
+    """
+    Journals the moves of rooms with group commit and keeps their
+    snapshots, deleting log segments once snapshots cover them.
+    """
+    SEGMENT_BYTES = 4 * 1024 * 1024
+    SNAPSHOT_INTERVAL = 32
+
+    def __init__(self, directory):
+        """
+        Initializes a new GameJournal instance, opening a new log segment
+        and starting the writer thread. Segments left by a previous
+        process are only read by recover.
+
+        Args:
+            directory (str): Directory of the journal, created if needed.
+        """
+        self.directory = directory
+        self._snapshot_dir = os.path.join(directory, 'snapshots')
+        os.makedirs(self._snapshot_dir, exist_ok=True)
+
+        self._cond = threading.Condition()
+        self._pending = []
+        self._appended = 0
+        self._committed = 0
+        self._error = None
+        self._closed = False
+        self.commits = 0
+        self.records = 0
+
+        # Rooms with records in each segment and the last index written,
+        # a segment is deleted once every one of them is snapshotted past it
+        self._segments_lock = threading.Lock()
+        self._segment_rooms = {}
+        self._snapshots = {}
+        self._ended = set()
+
+        segments = self._segment_numbers()
+        self._segment = segments[-1] + 1 if segments else 0
+        self._file = self._open_segment(self._segment)
+
+        self._writer = threading.Thread(target=self._run_writer, daemon=True)
+        self._writer.start()
+
+    def _segment_numbers(self):
+        """
+        Returns the numbers of the log segments on disk, in order.
+        """
+        numbers = []
+        for file_name in os.listdir(self.directory):
+            if file_name.startswith('wal-') and file_name.endswith('.log'):
+                numbers.append(int(file_name[4:-4]))
+        return sorted(numbers)
+
+    def _segment_path(self, number):
+        """
+        Returns the path of a log segment.
+        """
+        return os.path.join(self.directory, f'wal-{number:08d}.log')
+
+    def _open_segment(self, number):
+        """
+        Opens a new log segment for appending.
+        """
+        self._segment_rooms[number] = {}
+        return open(self._segment_path(number), 'ab')
+
+    def append(self, room_id, index, entry):
+        """
+        Appends an entry of a room and waits until it is on disk.
+
+        Args:
+            room_id (int): Id of the room.
+            index (int): Number of moves of the room the entry follows.
+            entry (tuple): The entry, pickled.
+
+        Raises:
+            OSError: If the journal could not be written.
+            ValueError: If the journal is closed.
+        """
+        payload = pickle.dumps(entry)
+        record = RECORD.pack(len(payload), zlib.crc32(payload), room_id,
+                             index) + payload
+
+        with self._cond:
+            if self._closed:
+                raise ValueError('The game journal is closed')
+            self._pending.append((room_id, index, record))
+            self._appended += 1
+            sequence = self._appended
+            self._cond.notify_all()
+
+            while self._committed < sequence and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                raise self._error
+
+    def _run_writer(self):
+        """
+        Commits the pending records in groups, runs in the writer thread.
+        Records appended while a group is flushed form the next group.
+        """
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                group, self._pending = self._pending, []
+                sequence = self._appended
+
+            try:
+                self._file.write(b''.join(record for _, _, record in group))
+                self._file.flush()
+                os.fsync(self._file.fileno())
+
+                with self._segments_lock:
+                    rooms = self._segment_rooms[self._segment]
+                    for room_id, index, _ in group:
+                        rooms[room_id] = index
+                if self._file.tell() >= self.SEGMENT_BYTES:
+                    self._rotate_segment()
+            except OSError as e:
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                return
+
+            with self._cond:
+                self._committed = sequence
+                self.commits += 1
+                self.records += len(group)
+                self._cond.notify_all()
+
+    def _rotate_segment(self):
+        """
+        Closes the current log segment and opens the next one.
+        """
+        self._file.close()
+        with self._segments_lock:
+            self._segment += 1
+            self._file = self._open_segment(self._segment)
+        self._collect_segments()
+
+    def snapshot(self, room_id, state):
+        """
+        Writes the snapshot of a room, replacing its previous one.
+
+        Args:
+            room_id (int): Id of the room.
+            state (dict): The state returned by Server.snapshot_state.
+        """
+        path = os.path.join(self._snapshot_dir, f'{room_id}.snap')
+        with open(path + '.tmp', 'wb') as snapshot_file:
+            pickle.dump(state, snapshot_file)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(path + '.tmp', path)
+
+        with self._segments_lock:
+            self._snapshots[room_id] = state['moves']
+        self._collect_segments()
+
+    def end(self, room_id, index):
+        """
+        Journals the end of a room's game and drops its snapshot, the room
+        is not recovered anymore.
+
+        Args:
+            room_id (int): Id of the room.
+            index (int): Number of moves of the room.
+        """
+        self.append(room_id, index, ('end',))
+        try:
+            os.remove(os.path.join(self._snapshot_dir, f'{room_id}.snap'))
+        except FileNotFoundError:
+            pass
+        with self._segments_lock:
+            self._ended.add(room_id)
+            self._snapshots.pop(room_id, None)
+        self._collect_segments()
+
+    def _collect_segments(self):
+        """
+        Deletes the log segments, but the current one, whose every room
+        ended or has a snapshot past its records.
+        """
+        with self._segments_lock:
+            for number, rooms in list(self._segment_rooms.items()):
+                if number == self._segment:
+                    continue
+                if all(room_id in self._ended or
+                       self._snapshots.get(room_id, -1) >= index
+                       for room_id, index in rooms.items()):
+                    del self._segment_rooms[number]
+                    try:
+                        os.remove(self._segment_path(number))
+                    except FileNotFoundError:
+                        pass
+
+    def recover(self):
+        """
+        Reads the snapshots and the segments left by a previous process.
+        A record torn by a crash ends its segment.
+
+        Returns:
+            dict: RoomLog of every room whose game did not end, by room id.
+        """
+        logs = {}
+        ended = set()
+
+        for number in self._segment_numbers():
+            if number == self._segment:
+                continue
+            rooms = self._segment_rooms.setdefault(number, {})
+            with open(self._segment_path(number), 'rb') as segment:
+                data = segment.read()
+
+            offset = 0
+            while offset + RECORD.size <= len(data):
+                length, crc, room_id, index = RECORD.unpack_from(data, offset)
+                payload = data[offset + RECORD.size:
+                               offset + RECORD.size + length]
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                offset += RECORD.size + length
+                rooms[room_id] = index
+
+                entry = pickle.loads(payload)
+                log = logs.setdefault(room_id, RoomLog(room_id))
+                if entry[0] == 'start':
+                    log.start = entry
+                elif entry[0] == 'move':
+                    log.moves.append((index, entry))
+                elif entry[0] == 'end':
+                    ended.add(room_id)
+
+        for file_name in os.listdir(self._snapshot_dir):
+            if not file_name.endswith('.snap'):
+                continue
+            room_id = int(file_name[:-5])
+            with open(os.path.join(self._snapshot_dir, file_name), 'rb') as f:
+                state = pickle.load(f)
+            logs.setdefault(room_id, RoomLog(room_id)).snapshot = state
+            self._snapshots[room_id] = state['moves']
+
+        self._ended.update(ended)
+        active = {}
+        for room_id, log in logs.items():
+            if room_id in ended or (log.start is None and log.snapshot is None):
+                continue
+            log.moves = [move for move in log.moves
+                         if move[0] > log.snapshot_index]
+            active[room_id] = log
+        self._collect_segments()
+        return active
+
+    def close(self):
+        """
+        Commits the pending records and stops the writer thread.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._writer.join()
+        self._file.close()
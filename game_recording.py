@@ -0,0 +1,330 @@
+"""
+Binary game recordings for UNO Online.
+
+A recording is a 16 byte header, magic, version, number of players and
+seed, followed by fixed-width 4 byte events: event type, seat, encoded
+card and an argument. The server appends events to a buffer and writes
+them in batches, and the replay engine re-runs recordings through the
+rules to audit them.
+
+Usage:
+    python game_recording.py recordings/*.unorec
+"""
+import argparse
+import struct
+import time
+from enum import IntEnum
+from card import CardType, CardColor, ENCODED_COLORS, encode_card, decode_card
+
+MAGIC = b'UNOR'
+VERSION = 1
+HEADER = struct.Struct('<4sBBxxQ')
+EVENT = struct.Struct('<BBBB')
+NO_SEAT = 255
+
+class EventType(IntEnum):
+    """
+    Enumeration of the recorded events.
+
+    Attributes:
+        JOIN (int): A player took a seat.
+        FLIP (int): The first card was turned over on the discard pile.
+        DRAW (int): A player drew a card, the argument is a DrawReason.
+        PLAY (int): A player played a card, wild cards as held, the
+            argument is 1 if the player claimed the win.
+        WILD_COLOR (int): Color picked for the wild card just played, as
+            a color index in the card field.
+        EFFECT (int): A +2 or +4 made the seat draw, the argument is the
+            number of cards.
+        RESHUFFLE (int): The discard pile went back into the deck, the
+            argument is the number of cards.
+        WIN (int): The seat won the game, the argument is 1 if the game
+            timer ended it.
+        SKIP (int): The turn timer passed the seat's turn.
+    """
+    JOIN = 1
+    FLIP = 2
+    DRAW = 3
+    PLAY = 4
+    WILD_COLOR = 5
+    EFFECT = 6
+    RESHUFFLE = 7
+    WIN = 8
+    SKIP = 9
+
+class DrawReason(IntEnum):
+    """
+    Enumeration of the reasons a card is drawn.
+    """
+    INITIAL = 0
+    TURN = 1
+    EFFECT = 2
+
+_DARK = ENCODED_COLORS.index(CardColor.DARK)
+_WILD_TYPES = (CardType.WILD.value, CardType.WILD_DRAW_FOUR.value)
+
+class GameRecorder:
+    """
+    Appends the events of a game to a recording file, writing them in
+    batches so recording adds no system call to most turns.
+    """
+    BATCH_EVENTS = 1024
+
+    def __init__(self, path, seed, num_players):
+        """
+        Initializes a new GameRecorder instance and writes the header.
+
+        Args:
+            path (str): Path of the recording file.
+            seed (int): Seed of the game.
+            num_players (int): Number of players in the game.
+        """
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, num_players, seed))
+        self._buffer = bytearray()
+        self._batch_bytes = self.BATCH_EVENTS * EVENT.size
+        self.path = path
+
+    def record(self, event, seat=NO_SEAT, card=0, arg=0):
+        """
+        Appends an event to the batch being buffered.
+
+        Args:
+            event (EventType): The event.
+            seat (int, optional): Seat of the player concerned.
+            card (int, optional): Encoded card of the event.
+            arg (int, optional): Argument of the event, 0 to 255.
+        """
+        self._buffer += EVENT.pack(event, seat, card, arg)
+        if len(self._buffer) >= self._batch_bytes:
+            self.flush()
+
+    def record_card(self, event, seat, uno_card, arg=0):
+        """
+        Appends an event concerning a card, wild cards are recorded as
+        held and their color with a WILD_COLOR event.
+
+        Args:
+            event (EventType): The event.
+            seat (int): Seat of the player concerned.
+            uno_card (UnoCard): The card of the event.
+            arg (int, optional): Argument of the event, 0 to 255.
+        """
+        code = encode_card(uno_card)
+        if code >> 3 in _WILD_TYPES and code & 7 != _DARK:
+            self.record(event, seat, (code >> 3) * 8 + _DARK, arg)
+            self.record(EventType.WILD_COLOR, seat, code & 7)
+        else:
+            self.record(event, seat, code, arg)
+
+    def flush(self):
+        """
+        Writes the buffered events to the file, if it is still open.
+        """
+        if self._file.closed:
+            return
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self):
+        """
+        Writes the buffered events and closes the file.
+        """
+        self.flush()
+        self._file.close()
+
+def read_header(data):
+    """
+    Reads the header of a recording.
+
+    Args:
+        data (bytes): The recording.
+
+    Returns:
+        tuple: Number of players and seed.
+
+    Raises:
+        ValueError: If the data is not a recording of a known version.
+    """
+    magic, version, num_players, seed = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Not an UNO Online recording of a known version')
+    return num_players, seed
+
+def read_events(data):
+    """
+    Decodes the events of a recording, for analytics.
+
+    Args:
+        data (bytes): The recording.
+
+    Yields:
+        tuple: Event type, seat or None, UnoCard or color index or None,
+            and argument of each event.
+    """
+    read_header(data)
+    end = len(data) - (len(data) - HEADER.size) % EVENT.size
+    for event, seat, card, arg in EVENT.iter_unpack(
+            memoryview(data)[HEADER.size:end]):
+        event = EventType(event)
+        if event in (EventType.DRAW, EventType.PLAY, EventType.FLIP):
+            card = decode_card(card)
+        elif event != EventType.WILD_COLOR:
+            card = None
+        yield event, None if seat == NO_SEAT else seat, card, arg
+
+class ReplayAudit:
+    """
+    The outcome of replaying a recording.
+    """
+    def __init__(self, seed, num_players):
+        """
+        Initializes a new ReplayAudit instance.
+
+        Args:
+            seed (int): Seed of the recorded game.
+            num_players (int): Number of players in the game.
+        """
+        self.seed = seed
+        self.num_players = num_players
+        self.events = 0
+        self.winner = None
+        self.hand_sizes = [0] * num_players
+        self.plays = [0] * num_players
+        self.draws = [0] * num_players
+        self.violations = []
+
+    @property
+    def valid(self):
+        """
+        Returns whether the recording followed the rules.
+        """
+        return not self.violations
+
+def replay_recording(data):
+    """
+    Re-runs a recording through the rules: every play must come from the
+    player in turn, be held and match the discard pile, and the turn
+    order, direction and draw effects are checked as rules.turn_after_play
+    and Server.handle_card_effects apply them.
+
+    Args:
+        data (bytes): The recording.
+
+    Returns:
+        ReplayAudit: The final hands, counters and rule violations found.
+    """
+    n, seed = read_header(data)
+    audit = ReplayAudit(seed, n)
+    violations = audit.violations
+    hands = [[0] * 128 for _ in range(n)]
+    sizes = audit.hand_sizes
+    plays = audit.plays
+    draws = audit.draws
+
+    skip, reverse = CardType.SKIP.value, CardType.REVERSE.value
+    draw_two, draw_four = CardType.DRAW_TWO.value, CardType.WILD_DRAW_FOUR.value
+    DRAW, PLAY, WILD_COLOR, EFFECT, FLIP, WIN, SKIP = (
+        EventType.DRAW, EventType.PLAY, EventType.WILD_COLOR,
+        EventType.EFFECT, EventType.FLIP, EventType.WIN, EventType.SKIP)
+    TURN_DRAW = DrawReason.TURN
+
+    top = 0
+    turn = 0
+    inc = 1
+    played = None
+    effect_due = 0
+    end = len(data) - (len(data) - HEADER.size) % EVENT.size
+    i = -1
+
+    for i, (event, seat, card, arg) in enumerate(
+            EVENT.iter_unpack(memoryview(data)[HEADER.size:end])):
+        if played is not None and event != WILD_COLOR:
+            # The played card takes effect once its color is known
+            top, card_type = played, played >> 3
+            played = None
+            turn = (turn + inc) % n
+            if card_type == skip:
+                turn = (turn + inc) % n
+            elif card_type == reverse:
+                inc = -inc
+                turn = (turn + inc) % n
+            if card_type == draw_two:
+                effect_due = 2
+            elif card_type == draw_four:
+                effect_due = 4
+
+        if event == DRAW:
+            hands[seat][card] += 1
+            sizes[seat] += 1
+            draws[seat] += 1
+            if arg == TURN_DRAW:
+                if seat != turn:
+                    violations.append((i, 'draw out of turn'))
+                turn = (seat + inc) % n
+
+        elif event == PLAY:
+            if seat != turn:
+                violations.append((i, 'play out of turn'))
+            if effect_due:
+                violations.append((i, 'draw effect not applied'))
+                effect_due = 0
+            if hands[seat][card]:
+                hands[seat][card] -= 1
+                sizes[seat] -= 1
+            else:
+                violations.append((i, 'card not in hand'))
+            if not (card & 7 == _DARK or card >> 3 == top >> 3 or
+                    card & 7 == top & 7):
+                violations.append((i, 'card does not match the discard pile'))
+            plays[seat] += 1
+            turn = seat
+            played = card
+
+        elif event == WILD_COLOR:
+            played = (played >> 3) * 8 + card
+
+        elif event == EFFECT:
+            if seat != turn or arg != effect_due:
+                violations.append((i, 'wrong draw effect'))
+            effect_due = 0
+
+        elif event == FLIP:
+            top = card
+
+        elif event == SKIP:
+            if seat != turn:
+                violations.append((i, 'skip out of turn'))
+            turn = (seat + inc) % n
+
+        elif event == WIN:
+            if sizes[seat] and not arg:
+                violations.append((i, 'win with cards in hand'))
+            audit.winner = seat
+
+    audit.events = i + 1
+    return audit
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Replays and audits UNO Online game recordings.')
+    parser.add_argument('recordings', nargs='+')
+    args = parser.parse_args()
+
+    total_events = 0
+    start = time.perf_counter()
+    for path in args.recordings:
+        with open(path, 'rb') as recording:
+            audit = replay_recording(recording.read())
+        total_events += audit.events
+        status = 'valid' if audit.valid else f'{len(audit.violations)} violations'
+        print(f'{path}: seed {audit.seed}, {audit.events} events, '
+              f'winner {audit.winner}, {status}')
+        for index, reason in audit.violations[:10]:
+            print(f'  event {index}: {reason}')
+
+    elapsed = time.perf_counter() - start
+    print(f'{total_events} events in {elapsed:.3f} s, '
+          f'{total_events / elapsed:,.0f} events/s')
@@ -0,0 +1,174 @@
+import pygame
+
+class SpatialIndex:
+    """
+    A uniform grid of rectangles used to find the topmost item under a
+    point without testing every item.
+    """
+    def __init__(self, cell_size):
+        """
+        Initializes a new SpatialIndex instance.
+
+        Args:
+            cell_size (int): The width and height of each grid cell.
+        """
+        self._cell_size = max(1, int(cell_size))
+        self._cells = {}
+        self._entries = {}
+
+    def insert(self, item, rect, z):
+        """
+        Adds an item to the index.
+
+        Args:
+            item: The item to be indexed.
+            rect (pygame.Rect): The area covered by the item.
+            z (int): The z-order of the item, higher is on top.
+        """
+        if item in self._entries:
+            self.remove(item)
+
+        rect = pygame.Rect(rect)
+        cells = self._cells_for(rect)
+        for cell in cells:
+            self._cells.setdefault(cell, []).append(item)
+        self._entries[item] = (rect, z, cells)
+
+    def remove(self, item):
+        """
+        Removes an item from the index.
+
+        Args:
+            item: The item to be removed.
+        """
+        entry = self._entries.pop(item, None)
+        if not entry:
+            return
+
+        for cell in entry[2]:
+            self._cells[cell].remove(item)
+            if not self._cells[cell]:
+                del self._cells[cell]
+
+    def clear(self):
+        """
+        Removes every item from the index.
+        """
+        self._cells.clear()
+        self._entries.clear()
+
+    def topmost_at(self, pos):
+        """
+        Finds the item with the highest z-order that contains a point.
+
+        Args:
+            pos (tuple): The point to test.
+
+        Returns:
+            The topmost item under the point, or None.
+        """
+        cell = (int(pos[0] // self._cell_size), int(pos[1] // self._cell_size))
+        topmost = None
+        topmost_z = None
+        for item in self._cells.get(cell, ()):
+            rect, z, _ = self._entries[item]
+            if rect.collidepoint(pos) and (topmost_z is None or z > topmost_z):
+                topmost, topmost_z = item, z
+        return topmost
+
+    def _cells_for(self, rect):
+        """
+        Returns the grid cells overlapped by a rectangle.
+
+        Args:
+            rect (pygame.Rect): The rectangle to place on the grid.
+
+        Returns:
+            list: Coordinates of the overlapped cells.
+        """
+        size = self._cell_size
+        return [(cx, cy)
+                for cx in range(rect.left // size, (rect.right - 1) // size + 1)
+                for cy in range(rect.top // size, (rect.bottom - 1) // size + 1)]
+
+    def __len__(self):
+        """
+        Returns the number of indexed items.
+        """
+        return len(self._entries)
+
+class CardInputRouter:
+    """
+    Routes mouse events to the cards of a hand, resolving the topmost card
+    under the pointer once per event instead of broadcasting the event to
+    every card.
+    """
+    def __init__(self, hand, cell_size):
+        """
+        Initializes a new CardInputRouter instance.
+
+        Args:
+            hand (UnoHand): The hand whose cards receive the events.
+            cell_size (int): Grid cell size of the spatial index, the
+                card width is a good fit.
+        """
+        self._hand = hand
+        self._index = SpatialIndex(cell_size)
+        self._layout_version = None
+        self._grabbed_card = None
+
+    def handle_event(self, event):
+        """
+        Sends a mouse event to the card it concerns.
+
+        Args:
+            event (pygame.event.Event): The pygame event object.
+        """
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            if self._grabbed_card:
+                return
+            # The index already resolved the hit, even for a moving card
+            card = self.card_at(event.pos)
+            if card:
+                card.grab(event.pos)
+                self._grabbed_card = card
+
+        elif self._grabbed_card and event.type in (
+            pygame.MOUSEMOTION, pygame.MOUSEBUTTONUP):
+            self._grabbed_card.handle_event(event)
+            if not self._grabbed_card.grabbed:
+                self._grabbed_card = None
+
+    def card_at(self, pos):
+        """
+        Returns the topmost card of the hand under a point.
+
+        Args:
+            pos (tuple): The point to test.
+
+        Returns:
+            UnoCardView: The card under the point, or None.
+        """
+        self._sync()
+        return self._index.topmost_at(pos)
+
+    def _sync(self):
+        """
+        Rebuilds the spatial index when the hand layout has changed.
+        """
+        if self._layout_version == self._hand.layout_version:
+            return
+
+        self._index.clear()
+        # Cards are indexed where they are placed, even while still moving
+        for z, card in enumerate(self._hand.visible_cards):
+            self._index.insert(
+                card, pygame.Rect(card.initial_pos, card.rect.size), z)
+        self._layout_version = self._hand.layout_version
+
+    @property
+    def grabbed_card(self):
+        """
+        Returns the card being dragged, or None.
+        """
+        return self._grabbed_card
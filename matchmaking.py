@@ -0,0 +1,393 @@
+"""
+Matchmaking lobby for UNO Online.
+
+Players connect to the lobby and queue for a table size. The lobby forms
+tables in batches, starting a Server for each one and sending its
+players the address of the game. A player who waits too long gets a
+smaller table with whoever is queued with it, trading fill rate for
+wait time.
+
+Usage:
+    python matchmaking.py [--host 127.0.0.1] [--port 1233] [--max-wait 20]
+        [--turn-timeout 60] [--join-timeout 30] [--journal journal]
+"""
+import argparse
+import pickle
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from status_code import (StatusCode, UnoMessage, MalformedMessageError,
+                         unpack_messages)
+from server import Server
+from game_journal import GameJournal
+from network_stats import percentile
+
+class Ticket:
+    """
+    A player waiting in the matchmaking queue.
+    """
+    def __init__(self, player_socket, table_size, enqueued):
+        """
+        Initializes a new Ticket instance.
+
+        Args:
+            player_socket (socket): The player's lobby connection.
+            table_size (int): Number of players the player wants to play
+                with.
+            enqueued (float): time.monotonic() value the player queued at.
+        """
+        self.player_socket = player_socket
+        self.table_size = table_size
+        self.enqueued = enqueued
+
+class MatchmakingStats:
+    """
+    Queue and matching metrics of the lobby.
+    """
+    def __init__(self, history=1000):
+        """
+        Initializes a new MatchmakingStats instance.
+
+        Args:
+            history (int, optional): Number of recent times to match kept
+                for the percentiles. Defaults to 1000.
+        """
+        self.rooms_created = 0
+        self.players_matched = 0
+        self.seats_requested = 0
+        self.abandoned = 0
+        self._times_to_match = deque(maxlen=history)
+
+    def record_room(self, tickets, now):
+        """
+        Records a formed table.
+
+        Args:
+            tickets (list): Tickets of the table's players.
+            now (float): time.monotonic() value the table formed at.
+        """
+        self.rooms_created += 1
+        self.players_matched += len(tickets)
+        self.seats_requested += tickets[0].table_size
+        for ticket in tickets:
+            self._times_to_match.append(now - ticket.enqueued)
+
+    def snapshot(self, queues):
+        """
+        Returns the current metrics.
+
+        Args:
+            queues (dict): Deque of Tickets of each table size.
+
+        Returns:
+            dict: Queue depth per table size, tables formed, fill rate and
+                times to match in seconds.
+        """
+        waits = sorted(self._times_to_match)
+        return {
+            'queue_depth': {size: len(queue) for size, queue in
+                            sorted(queues.items()) if queue},
+            'waiting': sum(len(queue) for queue in queues.values()),
+            'rooms_created': self.rooms_created,
+            'players_matched': self.players_matched,
+            'abandoned': self.abandoned,
+            'fill_rate': (self.players_matched / self.seats_requested
+                          if self.seats_requested else None),
+            'time_to_match_mean_s': sum(waits) / len(waits) if waits else None,
+            'time_to_match_p50_s': percentile(waits, 0.50),
+            'time_to_match_p95_s': percentile(waits, 0.95),
+            'time_to_match_max_s': waits[-1] if waits else None,
+        }
+
+class MatchmakingService:
+    """
+    Serves the lobby from a single thread with one selector, queueing the
+    players by table size and forming tables every batch interval.
+    """
+    BATCH_INTERVAL = 0.25
+    MAX_WAIT = 20.0
+    MIN_TABLE_SIZE = 2
+    MAX_TABLE_SIZE = 10
+    STATS_INTERVAL = 10.0
+    JOIN_TIMEOUT = 30.0
+
+    def __init__(self, server_address, port, max_wait=MAX_WAIT,
+                 batch_interval=BATCH_INTERVAL, journal=None,
+                 turn_timeout=None, join_timeout=JOIN_TIMEOUT):
+        """
+        Initializes a new MatchmakingService instance.
+
+        Args:
+            server_address (str): The IP address of the lobby, the game
+                servers of the tables are started on it too.
+            port (int): The port number of the lobby.
+            max_wait (float, optional): Seconds a player waits for a full
+                table before a smaller one is formed.
+            batch_interval (float, optional): Seconds between two rounds of
+                matching, players queued in between are matched together.
+            journal (GameJournal, optional): Journal shared by the tables.
+            turn_timeout (float, optional): Turn time limit of the tables.
+            join_timeout (float, optional): Seconds the players of a table
+                have to connect to its game server before it is cancelled.
+        """
+        self.server_address = server_address
+        self.max_wait = max_wait
+        self.batch_interval = batch_interval
+        self.journal = journal
+        self.turn_timeout = turn_timeout
+        self.join_timeout = join_timeout
+        self.stats = MatchmakingStats()
+        # Servers of the tables whose game is not over
+        self.rooms = []
+        self._queues = {}
+        # Ticket of every queued player, by lobby connection
+        self._tickets = {}
+        self._buffers = {}
+        self._running = False
+
+        host_address = server_address
+        if not host_address == Server.LOCAL_IP_ADDRESS:
+            host_address = '0.0.0.0'
+        self._lobby_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._lobby_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._lobby_socket.bind((host_address, port))
+        self._lobby_socket.listen()
+        self._lobby_socket.setblocking(False)
+        self.port = self._lobby_socket.getsockname()[1]
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._lobby_socket, selectors.EVENT_READ)
+        print(f'Lobby is listening on {server_address}:{self.port}')
+
+    def run(self, duration=None):
+        """
+        Serves the lobby until stopped.
+
+        Args:
+            duration (float, optional): Seconds after which the lobby
+                stops. Defaults to None, until stop is called.
+        """
+        self._running = True
+        start = next_batch = next_stats = time.monotonic()
+        next_stats += self.STATS_INTERVAL
+
+        while self._running:
+            now = time.monotonic()
+            if duration is not None and now - start >= duration:
+                break
+
+            for key, _ in self._selector.select(max(0, next_batch - now)):
+                if key.fileobj is self._lobby_socket:
+                    self._accept()
+                else:
+                    self._read(key.fileobj)
+
+            now = time.monotonic()
+            if now >= next_batch:
+                self.match(now)
+                next_batch = now + self.batch_interval
+            if now >= next_stats:
+                print(f'Matchmaking: {self.stats.snapshot(self._queues)}')
+                next_stats = now + self.STATS_INTERVAL
+
+        self.close()
+
+    def stop(self):
+        """
+        Stops the lobby after its current round.
+        """
+        self._running = False
+
+    def _accept(self):
+        """
+        Accepts a player connecting to the lobby.
+        """
+        try:
+            player_socket, addr = self._lobby_socket.accept()
+        except BlockingIOError:
+            return
+        player_socket.setblocking(False)
+        self._buffers[player_socket] = b''
+        self._selector.register(player_socket, selectors.EVENT_READ)
+
+    def _read(self, player_socket):
+        """
+        Reads the matchmaking request of a player, or its disconnection.
+        """
+        try:
+            data = player_socket.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+
+        if not data:
+            self._drop(player_socket)
+            return
+
+        try:
+            messages, self._buffers[player_socket] = unpack_messages(
+                self._buffers[player_socket] + data)
+        except MalformedMessageError as e:
+            print(f'Dropping a player of the lobby: {e}')
+            self._drop(player_socket)
+            return
+        
+        for uno_msg in messages:
+            if uno_msg.status_code == StatusCode.MATCH_REQUEST:
+                self._enqueue(player_socket, uno_msg.data)
+
+    def _enqueue(self, player_socket, table_size):
+        """
+        Queues a player for a table size.
+
+        Args:
+            player_socket (socket): The player's lobby connection.
+            table_size (int): Number of players the player wants.
+        """
+        if not isinstance(table_size, int) or not (
+                self.MIN_TABLE_SIZE <= table_size <= self.MAX_TABLE_SIZE):
+            table_size = self.MIN_TABLE_SIZE
+        
+        # A player queues once, a new request replaces its ticket
+        ticket = self._tickets.pop(player_socket, None)
+        if ticket is not None:
+            self._queues[ticket.table_size].remove(ticket)
+        
+        queue = self._queues.setdefault(table_size, deque())
+        ticket = Ticket(player_socket, table_size, time.monotonic())
+        queue.append(ticket)
+        self._tickets[player_socket] = ticket
+        self._send(player_socket, UnoMessage(
+            StatusCode.MATCH_QUEUED, (len(queue), len(queue))))
+
+    def _drop(self, player_socket):
+        """
+        Forgets a player who left the lobby before being matched.
+        """
+        ticket = self._tickets.get(player_socket)
+        if ticket is not None:
+            self._queues[ticket.table_size].remove(ticket)
+            self.stats.abandoned += 1
+        self._close_player(player_socket)
+
+    def match(self, now):
+        """
+        Forms the tables of a round of matching. Full tables form first,
+        then the players who waited longer than max_wait get a table with
+        every player of their queue, if there are enough of them.
+
+        Args:
+            now (float): time.monotonic() value of the round.
+        """
+        for table_size, queue in self._queues.items():
+            changed = False
+            while len(queue) >= table_size:
+                self.start_room([queue.popleft() for _ in range(table_size)],
+                                now)
+                changed = True
+
+            if (queue and len(queue) >= self.MIN_TABLE_SIZE and
+                    now - queue[0].enqueued >= self.max_wait):
+                self.start_room([queue.popleft() for _ in range(len(queue))],
+                                now)
+                changed = True
+
+            # Tells the players left in the queue where they stand
+            if changed:
+                for position, ticket in enumerate(queue, 1):
+                    self._send(ticket.player_socket, UnoMessage(
+                        StatusCode.MATCH_QUEUED, (position, len(queue))))
+
+    def start_room(self, tickets, now):
+        """
+        Starts the game server of a table and sends its players there.
+
+        Args:
+            tickets (list): Tickets of the table's players.
+            now (float): time.monotonic() value of the round.
+        """
+        server = Server(self.server_address, 0, len(tickets),
+                        journal=self.journal, turn_timeout=self.turn_timeout)
+        port = server.server_socket.getsockname()[1]
+        threading.Thread(target=server.run, args=(self.join_timeout,),
+                         daemon=True).start()
+        self.rooms = [room for room in self.rooms
+                      if not room.game_won and not room.game_abandoned]
+        self.rooms.append(server)
+        self.stats.record_room(tickets, now)
+
+        for ticket in tickets:
+            self._send(ticket.player_socket, UnoMessage(
+                StatusCode.MATCH_FOUND, (self.server_address, port)))
+            self._close_player(ticket.player_socket)
+
+    def _send(self, player_socket, uno_msg):
+        """
+        Sends a lobby message to a player, lobby messages are small enough
+        not to block.
+        """
+        try:
+            player_socket.send(pickle.dumps(uno_msg))
+        except OSError as e:
+            print(f'Error sending to lobby player: {e}')
+
+    def _close_player(self, player_socket):
+        """
+        Closes a player's lobby connection.
+        """
+        self._buffers.pop(player_socket, None)
+        self._tickets.pop(player_socket, None)
+        try:
+            self._selector.unregister(player_socket)
+        except (KeyError, ValueError):
+            pass
+        player_socket.close()
+
+    def close(self):
+        """
+        Closes the lobby and the connections of the queued players.
+        """
+        for queue in self._queues.values():
+            for ticket in queue:
+                self._close_player(ticket.player_socket)
+            queue.clear()
+        self._selector.close()
+        self._lobby_socket.close()
+
+    def snapshot(self):
+        """
+        Returns the current matchmaking metrics, see MatchmakingStats.
+        """
+        return self.stats.snapshot(self._queues)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='UNO Online matchmaking lobby.')
+    parser.add_argument('--host', default=Server.LOCAL_IP_ADDRESS,
+                        help='Address of the lobby and of its game servers')
+    parser.add_argument('--port', type=int, default=1233)
+    parser.add_argument('--max-wait', type=float,
+                        default=MatchmakingService.MAX_WAIT,
+                        help='Seconds before a smaller table is formed')
+    parser.add_argument('--turn-timeout', type=float,
+                        default=Server.TURN_TIMEOUT)
+    parser.add_argument('--join-timeout', type=float,
+                        default=MatchmakingService.JOIN_TIMEOUT,
+                        help='Seconds before a table whose players did not '
+                             'all join is cancelled')
+    parser.add_argument('--journal', help='Directory of the game journal')
+    args = parser.parse_args()
+
+    journal = GameJournal(args.journal) if args.journal else None
+    service = MatchmakingService(args.host, args.port, args.max_wait,
+                                 journal=journal,
+                                 turn_timeout=args.turn_timeout,
+                                 join_timeout=args.join_timeout)
+    try:
+        service.run()
+    except KeyboardInterrupt:
+        service.stop()
+    finally:
+        print(f'Matchmaking: {service.snapshot()}')
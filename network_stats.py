@@ -0,0 +1,210 @@
+import threading
+import time
+from collections import deque
+import pygame
+
+class ConnectionStats:
+    """
+    Collects connection quality telemetry for a client: round trip times
+    from ping/pong messages, duplicated (retransmitted) responses and
+    bytes sent and received. Safe to update from the I/O thread while
+    the main thread reads it.
+    """
+    def __init__(self, history=200):
+        """
+        Initializes a new ConnectionStats instance.
+
+        Args:
+            history (int, optional): Number of RTT samples kept for the
+                statistics. Defaults to 200.
+        """
+        self._lock = threading.Lock()
+        self._rtts = deque(maxlen=history)
+        self._jitter = 0.0
+        self._started = time.time()
+        self.pings_sent = 0
+        self.pongs_received = 0
+        self.retransmits = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def record_rtt(self, rtt_ms):
+        """
+        Adds a round trip time sample.
+
+        Args:
+            rtt_ms (float): Round trip time in milliseconds.
+        """
+        with self._lock:
+            # Smoothed jitter as in RFC 3550
+            if self._rtts:
+                delta = abs(rtt_ms - self._rtts[-1])
+                self._jitter += (delta - self._jitter) / 16
+            self._rtts.append(rtt_ms)
+            self.pongs_received += 1
+
+    def record_ping(self):
+        """
+        Counts a ping sent to the server.
+        """
+        with self._lock:
+            self.pings_sent += 1
+
+    def record_retransmit(self):
+        """
+        Counts a response received more than once.
+        """
+        with self._lock:
+            self.retransmits += 1
+
+    def record_bytes_in(self, count):
+        """
+        Counts bytes received from the server.
+
+        Args:
+            count (int): Number of bytes.
+        """
+        with self._lock:
+            self.bytes_in += count
+
+    def record_bytes_out(self, count):
+        """
+        Counts bytes sent to the server.
+
+        Args:
+            count (int): Number of bytes.
+        """
+        with self._lock:
+            self.bytes_out += count
+
+    def snapshot(self):
+        """
+        Returns the current connection statistics.
+
+        Returns:
+            dict: RTT last, mean, jitter, p50, p95, p99 and max in
+                milliseconds, ping, retransmit and byte counters.
+        """
+        with self._lock:
+            rtts = sorted(self._rtts)
+            stats = {
+                'rtt_last_ms': self._rtts[-1] if self._rtts else None,
+                'rtt_mean_ms': sum(rtts) / len(rtts) if rtts else None,
+                'rtt_jitter_ms': self._jitter,
+                'rtt_p50_ms': percentile(rtts, 0.50),
+                'rtt_p95_ms': percentile(rtts, 0.95),
+                'rtt_p99_ms': percentile(rtts, 0.99),
+                'rtt_max_ms': rtts[-1] if rtts else None,
+                'pings_sent': self.pings_sent,
+                'pongs_received': self.pongs_received,
+                'retransmits': self.retransmits,
+                'bytes_in': self.bytes_in,
+                'bytes_out': self.bytes_out,
+                'session_s': time.time() - self._started,
+            }
+        return stats
+
+    def summary(self):
+        """
+        Returns a readable summary of the session's connection quality.
+
+        Returns:
+            str: The summary.
+        """
+        stats = self.snapshot()
+        lines = ['Connection summary:']
+        for key, value in stats.items():
+            if isinstance(value, float):
+                value = f'{value:.2f}'
+            lines.append(f'  {key}: {value}')
+        return '\n'.join(lines)
+
+def percentile(ordered, fraction):
+    """
+    Returns a percentile of an ordered list of samples.
+
+    Args:
+        ordered (list): Samples sorted in ascending order.
+        fraction (float): Percentile between 0 and 1.
+
+    Returns:
+        float: The sample at the percentile, or None without samples.
+    """
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+class ConnectionStatsOverlay:
+    """
+    Draws the connection statistics on top of the game.
+    """
+    def __init__(self, stats, font, visible=False):
+        """
+        Initializes a new ConnectionStatsOverlay instance.
+
+        Args:
+            stats (ConnectionStats): The statistics to display.
+            font (pygame.font.Font): The font for the overlay's text.
+            visible (bool, optional): Whether the overlay starts shown.
+                Defaults to False.
+        """
+        self._stats = stats
+        self._font = font
+        self.visible = visible
+        self._surface = None
+        self._last_render = 0
+
+    def toggle(self):
+        """
+        Shows or hides the overlay.
+        """
+        self.visible = not self.visible
+
+    def _render(self):
+        """
+        Renders the statistics text.
+        """
+        stats = self._stats.snapshot()
+
+        def ms(value):
+            return '-' if value is None else f'{value:.1f}'
+
+        lines = [
+            f"RTT {ms(stats['rtt_last_ms'])} ms  "
+            f"mean {ms(stats['rtt_mean_ms'])}  "
+            f"jitter {ms(stats['rtt_jitter_ms'])}",
+            f"p50 {ms(stats['rtt_p50_ms'])}  p95 {ms(stats['rtt_p95_ms'])}  "
+            f"p99 {ms(stats['rtt_p99_ms'])}",
+            f"retransmits {stats['retransmits']}  "
+            f"in {stats['bytes_in']} B  out {stats['bytes_out']} B",
+        ]
+        rendered = [self._font.render(line, True, (255, 255, 255))
+                    for line in lines]
+
+        width = max(line.get_width() for line in rendered)
+        height = sum(line.get_height() for line in rendered)
+        self._surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self._surface.fill((0, 0, 0, 150))
+        y = 0
+        for line in rendered:
+            self._surface.blit(line, (0, y))
+            y += line.get_height()
+
+    def blitme(self, surface):
+        """
+        Draws the overlay at the bottom right of the specified surface.
+
+        Args:
+            surface (pygame.Surface): The surface on which to draw.
+        """
+        if not self.visible:
+            return
+
+        # Re-renders the text twice per second to keep the overlay cheap
+        now = time.perf_counter()
+        if not self._surface or now - self._last_render > 0.5:
+            self._render()
+            self._last_render = now
+
+        surface.blit(self._surface, self._surface.get_rect(
+            bottomright=surface.get_rect().bottomright))
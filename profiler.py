@@ -0,0 +1,237 @@
+import csv
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+import pygame
+
+class FrameProfiler:
+    """
+    Measures where the client's frame time goes.
+
+    Every frame is split into named sections (events, update, blit,
+    flip, network...) whose timings can be drawn as a live overlay and
+    streamed to a CSV trace. A disabled profiler does no timing at all.
+    """
+    SECTION_COLORS = {
+        'events': (255, 200, 0),
+        'update': (0, 200, 255),
+        'network': (255, 0, 200),
+        'blit': (0, 255, 100),
+        'flip': (255, 80, 80),
+    }
+    OTHER_COLOR = (180, 180, 180)
+
+    def __init__(self, enabled=False, history=240, csv_path=None):
+        """
+        Initializes a new FrameProfiler instance.
+
+        Args:
+            enabled (bool, optional): Whether timings are recorded.
+                Defaults to False.
+            history (int, optional): Number of frames kept for the
+                overlay. Defaults to 240.
+            csv_path (str, optional): Path of the CSV trace file.
+                Defaults to None, which disables the trace.
+        """
+        self.enabled = enabled
+        self.overlay_visible = enabled
+        self._frames = deque(maxlen=history)
+        self._frame_count = 0
+        self._frame_start = None
+        self._sections = []
+        self._font = None
+        self._graph = None
+        self._text_surface = None
+        self._csv_file = self._csv_writer = None
+
+        if enabled and csv_path:
+            self._csv_file = open(csv_path, 'w', newline='')
+            self._csv_writer = csv.writer(self._csv_file)
+            self._csv_writer.writerow(
+                ['frame', 'category', 'name', 'ms'])
+
+    def section(self, category, name=''):
+        """
+        Returns a context manager timing a section of the frame.
+
+        Args:
+            category (str): The kind of work timed, e.g. 'update'.
+            name (str, optional): What is being timed, e.g. a state name.
+
+        Returns:
+            A context manager recording the elapsed time on exit.
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._timed_section(category, name)
+
+    @contextmanager
+    def _timed_section(self, category, name):
+        """
+        Times the body of a with statement.
+
+        Args:
+            category (str): The kind of work timed.
+            name (str): What is being timed.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self._sections.append((category, name, elapsed))
+
+    def begin_frame(self):
+        """
+        Marks the start of a frame, closing the previous one.
+        """
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self._end_frame((now - self._frame_start) * 1000)
+        self._frame_start = now
+
+    def _end_frame(self, frame_ms):
+        """
+        Stores the timings of the finished frame.
+
+        Args:
+            frame_ms (float): Time between the start of the frame and
+                the start of the next one.
+        """
+        self._frame_count += 1
+        sections = self._sections
+        self._sections = []
+        self._frames.append((frame_ms, sections))
+
+        if self._csv_writer:
+            self._csv_writer.writerow(
+                [self._frame_count, 'frame', '', f'{frame_ms:.3f}'])
+            for category, name, ms in sections:
+                self._csv_writer.writerow(
+                    [self._frame_count, category, name, f'{ms:.3f}'])
+
+        if self._graph:
+            self._draw_graph_column(frame_ms, sections)
+
+        # Re-renders the text every half second to keep the overlay cheap
+        if self._font and self._frame_count % 30 == 0:
+            self._render_text()
+
+    def set_font(self, font):
+        """
+        Sets the font used by the overlay.
+
+        Args:
+            font (pygame.font.Font): The font for the overlay's text.
+        """
+        self._font = font
+
+    def toggle_overlay(self):
+        """
+        Shows or hides the overlay.
+        """
+        self.overlay_visible = not self.overlay_visible
+
+    def averages(self):
+        """
+        Calculates the average time per section over the kept history.
+
+        Returns:
+            dict: Average milliseconds keyed by (category, name), with
+                the whole frame under ('frame', '').
+        """
+        totals = {}
+        for frame_ms, sections in self._frames:
+            totals[('frame', '')] = totals.get(('frame', ''), 0) + frame_ms
+            for category, name, ms in sections:
+                key = (category, name)
+                totals[key] = totals.get(key, 0) + ms
+
+        count = max(1, len(self._frames))
+        return {key: total / count for key, total in totals.items()}
+
+    def _draw_graph_column(self, frame_ms, sections):
+        """
+        Scrolls the graph one pixel and draws the newest frame as a
+        stacked column of its sections.
+
+        Args:
+            frame_ms (float): Duration of the frame.
+            sections (list): (category, name, ms) timings of the frame.
+        """
+        graph = self._graph
+        h = graph.get_height()
+        x = graph.get_width() - 1
+        scale = h / 33.3 # graph top is two 60 FPS frames
+
+        graph.scroll(-1, 0)
+        graph.fill((0, 0, 0, 150), (x, 0, 1, h))
+
+        bottom = h
+        for category, _, ms in sections:
+            # Network is timed inside update, stacking it would count twice
+            if category == 'network':
+                continue
+            top = max(0, bottom - ms * scale)
+            color = FrameProfiler.SECTION_COLORS.get(
+                category, FrameProfiler.OTHER_COLOR)
+            pygame.draw.line(graph, color, (x, bottom), (x, top))
+            bottom = top
+
+        graph.set_at((x, max(0, int(h - frame_ms * scale))), (255, 255, 255))
+        graph.set_at((x, int(h - 16.7 * scale)), (255, 255, 0))
+
+    def _render_text(self):
+        """
+        Renders the averages shown above the graph.
+        """
+        lines = []
+        for (category, name), ms in sorted(self.averages().items()):
+            label = f'{category} {name}'.strip()
+            lines.append(self._font.render(
+                f'{label}: {ms:.2f} ms', True,
+                FrameProfiler.SECTION_COLORS.get(
+                    category, FrameProfiler.OTHER_COLOR)))
+
+        width = max(line.get_width() for line in lines)
+        height = sum(line.get_height() for line in lines)
+        self._text_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self._text_surface.fill((0, 0, 0, 150))
+        y = 0
+        for line in lines:
+            self._text_surface.blit(line, (0, y))
+            y += line.get_height()
+
+    def blitme(self, surface):
+        """
+        Draws the overlay on the specified surface.
+
+        Args:
+            surface (pygame.Surface): The surface on which to draw.
+        """
+        if not self.enabled or not self.overlay_visible:
+            return
+
+        if not self._graph:
+            self._graph = pygame.Surface(
+                (self._frames.maxlen, 100), pygame.SRCALPHA)
+            self._graph.fill((0, 0, 0, 150))
+
+        graph_rect = self._graph.get_rect(
+            topright=surface.get_rect().topright)
+        surface.blit(self._graph, graph_rect)
+        if self._text_surface:
+            surface.blit(self._text_surface,
+                         self._text_surface.get_rect(
+                             topright=graph_rect.bottomright))
+
+    def close(self):
+        """
+        Flushes and closes the CSV trace.
+        """
+        if self._csv_file:
+            self._csv_file.close()
+            self._csv_file = self._csv_writer = None
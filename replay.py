@@ -0,0 +1,93 @@
+"""
+Deterministic replays of UNO Online games.
+
+A game is replayed from the record returned by Server.game_record, its
+seed and its moves, through the same Server code that played it.
+
+Usage:
+    from replay import replay_game
+    replayed = replay_game(server.game_record())
+"""
+from server import Server
+from status_code import UnoMessage
+
+class ReplaySeat:
+    """
+    Stands in for a player's socket during a replay, keeping the messages
+    the server sends to it.
+    """
+    def __init__(self, seat):
+        """
+        Initializes a new ReplaySeat instance.
+
+        Args:
+            seat (int): Index of the player.
+        """
+        self.seat = seat
+        self.received = []
+
+    def settimeout(self, timeout):
+        """
+        Ignores the acknowledgement timeouts, a replay does not wait.
+        """
+        pass
+
+class ReplayServer(Server):
+    """
+    A Server without sockets that re-applies the recorded moves of a game.
+    """
+    def __init__(self, seed, usernames):
+        """
+        Initializes a new ReplayServer instance and starts the game.
+
+        Args:
+            seed (int): Seed of the recorded game.
+            usernames (list): Names of the players, in seat order.
+        """
+        self._init_game(len(usernames), seed)
+        self.players = [ReplaySeat(seat) for seat in range(len(usernames))]
+        self.usernames = list(usernames)
+        self.start_game()
+
+    def start_game(self):
+        """
+        Sets up the deck like Server.start_game, without notifying players
+        or starting handler threads.
+        """
+        self.setup_deck()
+
+    def apply_move(self, seat, status_code, data):
+        """
+        Applies a recorded move.
+
+        Args:
+            seat (int): Index of the player who made the move.
+            status_code (StatusCode): The move, INITIAL_DRAW, CARD_DRAW or
+                CARD_PLAY.
+            data: The data the player sent with the move.
+        """
+        self.handle_client_message(
+            self.players[seat], UnoMessage(status_code, data))
+        self.pending_acknoledgements.clear()
+
+    def send_response(self, client_socket, uno_message):
+        """
+        Keeps the message for the replay seat instead of sending it.
+        """
+        client_socket.received.append(uno_message)
+
+def replay_game(record):
+    """
+    Replays a recorded game.
+
+    Args:
+        record (dict): The record returned by Server.game_record.
+
+    Returns:
+        ReplayServer: The server in the state the game ended in, its
+            players hold every message sent to them.
+    """
+    server = ReplayServer(record['seed'], record['usernames'])
+    for seat, status_code, data in record['moves']:
+        server.apply_move(seat, status_code, data)
+    return server
@@ -9,6 +9,7 @@ class ResourceManager:
         Initializes the ResourceManager instance.
         """        
         self.images = {}
+        self.scaled_images = {}
         self.font_cache = {}
         
     def add_image(self, image_name, image):
@@ -21,6 +22,20 @@ class ResourceManager:
         """        
         self.images[image_name] = image
         
+    def load_image(self, image_name, image_path):
+        """
+        Loads an image converted to the display's pixel format and adds it
+        to the resource manager.
+
+        Args:
+            image_name (str): The name to associate with the image.
+            image_path (str): The path to the image file.
+        """
+        image = pygame.image.load(image_path)
+        if pygame.display.get_surface():
+            image = image.convert_alpha()
+        self.add_image(image_name, image)
+        
     def load_font(self, font_path, size):
         """
         Loads a font and caches it for reuse.
@@ -42,6 +57,17 @@ class ResourceManager:
         self.font_cache[key] = font
         return font    
     
+    def add_font(self, font_path, size, font):
+        """
+        Adds an already loaded font to the font cache.
+
+        Args:
+            font_path (str): The path to the font file.
+            size (int): The size of the font.
+            font (pygame.font.Font): The loaded font.
+        """
+        self.font_cache[(font_path, size)] = font
+
     def render_font(self, text, color, font_path, size):
         """
         Renders text with a specified font and color.
@@ -59,7 +85,7 @@ class ResourceManager:
         font = self.load_font(font_path, size)
 
         text_surface = font.render(text, True, color) 
-        return text_surface  # Returns Surface     
+        return self.to_display_format(text_surface)  # Returns Surface     
 
     def get_image(self, image_name):
         """
@@ -72,6 +98,45 @@ class ResourceManager:
             pygame.Surface: The requested image surface.
         """        
         return self.images[image_name]
-        
-        
-        
\ No newline at end of file
+
+    def get_scaled_image(self, image_name, scale):
+        """
+        Retrieves an image resized by a scale, resizing it only once.
+
+        Args:
+            image_name (str): The name of the image to retrieve.
+            scale (float): The ratio applied to the image's size.
+
+        Returns:
+            pygame.Surface: The resized image surface.
+        """
+        key = (image_name, round(scale, 3))
+        if key not in self.scaled_images:
+            image = self.get_image(image_name)
+            size = (round(image.get_width() * scale),
+                    round(image.get_height() * scale))
+            self.scaled_images[key] = self.to_display_format(
+                pygame.transform.smoothscale(image, size))
+        return self.scaled_images[key]
+
+    def clear_scaled_images(self):
+        """
+        Forgets the resized images, once the display they were made for
+        changed size.
+        """
+        self.scaled_images.clear()
+
+    def to_display_format(self, surface):
+        """
+        Converts a surface with per pixel alpha to the display's pixel 
+        format, once a display has been set.
+
+        Args:
+            surface (pygame.Surface): The surface to convert.
+
+        Returns:
+            pygame.Surface: The converted surface.
+        """
+        if pygame.display.get_surface():
+            return surface.convert_alpha()
+        return surface
@@ -0,0 +1,191 @@
+"""
+Fast Uno game simulation for Monte Carlo move evaluation.
+
+Cards are encoded as ints with card.encode_card, so games can be copied
+and simulated quickly in worker processes. The turn order and draw
+effects follow rules.turn_after_play and Server.handle_card_effects.
+"""
+import random
+import time
+from card import CardType, CardColor, ENCODED_COLORS
+
+DARK = ENCODED_COLORS.index(CardColor.DARK)
+
+_REVERSE = CardType.REVERSE.value
+_SKIP = CardType.SKIP.value
+_DRAW_TWO = CardType.DRAW_TWO.value
+_WILD = CardType.WILD.value
+_WILD_DRAW_FOUR = CardType.WILD_DRAW_FOUR.value
+
+MAX_ROLLOUT_TURNS = 300
+
+def _matches(code, top):
+    """
+    Same as rules.card_matches_discard for encoded cards.
+    """
+    return (code & 7 == DARK or code >> 3 == top >> 3 or
+            code & 7 == top & 7)
+
+def _held(code):
+    """
+    Returns the card of a hand a move plays, wild cards are held without
+    a color.
+    """
+    if code >> 3 in (_WILD, _WILD_DRAW_FOUR):
+        return (code >> 3) * 8 + DARK
+    return code
+
+def _best_color(hand, rng):
+    """
+    Picks the color a hand holds the most cards of for a wild card.
+    """
+    counts = [0, 0, 0, 0]
+    for code in hand:
+        if code & 7 != DARK:
+            counts[code & 7] += 1
+    best = max(counts)
+    return rng.choice([i for i, count in enumerate(counts) if count == best])
+
+class _Game:
+    """
+    A determinized game: every hand and the draw pile are known.
+    """
+    __slots__ = ('hands', 'pile', 'discards', 'top', 'turn', 'inc', 'rng')
+
+    def __init__(self, hands, pile, top, turn, inc, rng):
+        self.hands = hands
+        self.pile = pile
+        self.discards = []
+        self.top = top
+        self.turn = turn
+        self.inc = inc
+        self.rng = rng
+
+    def draw(self, seat, count):
+        """
+        Draws cards for a player, reshuffling the discards into the draw
+        pile when it runs out.
+        """
+        hand = self.hands[seat]
+        for _ in range(count):
+            if not self.pile:
+                if not self.discards:
+                    return
+                # Wild cards go back without the color picked for them
+                self.pile = [_held(code) for code in self.discards]
+                self.discards = []
+                self.rng.shuffle(self.pile)
+            hand.append(self.pile.pop())
+
+    def play(self, code):
+        """
+        Plays a card for the player in turn and applies its effects.
+
+        Returns:
+            bool: True if the card was the player's last.
+        """
+        hand = self.hands[self.turn]
+        hand.remove(_held(code))
+        self.discards.append(self.top)
+        self.top = code
+        if not hand:
+            return True
+
+        n = len(self.hands)
+        card_type = code >> 3
+        self.turn = (self.turn + self.inc) % n
+        if card_type == _SKIP:
+            self.turn = (self.turn + self.inc) % n
+        elif card_type == _REVERSE:
+            self.inc = -self.inc
+            self.turn = (self.turn + self.inc) % n
+
+        if card_type == _DRAW_TWO:
+            self.draw(self.turn, 2)
+        elif card_type == _WILD_DRAW_FOUR:
+            self.draw(self.turn, 4)
+        return False
+
+    def rollout(self):
+        """
+        Plays random legal moves until a player wins.
+
+        Returns:
+            int: Seat of the winner, or of the player with the fewest
+                cards if the game runs too long.
+        """
+        rng = self.rng
+        for _ in range(MAX_ROLLOUT_TURNS):
+            hand = self.hands[self.turn]
+            top = self.top
+            playable = [code for code in hand if _matches(code, top)]
+            if not playable:
+                self.draw(self.turn, 1)
+                self.turn = (self.turn + self.inc) % len(self.hands)
+                continue
+
+            code = rng.choice(playable)
+            if code & 7 == DARK:
+                code = (code >> 3) * 8 + _best_color(hand, rng)
+            if self.play(code):
+                return self.turn
+
+        sizes = [len(hand) for hand in self.hands]
+        return sizes.index(min(sizes))
+
+def evaluate_moves(moves, hand, hand_sizes, unseen, top, seat, inc,
+                   budget, seed):
+    """
+    Runs determinized rollouts for each candidate move until the time
+    budget is spent, runs in a worker process.
+
+    Args:
+        moves (list): Encoded candidate moves, wild cards with a color.
+        hand (list): Encoded cards of the searching player.
+        hand_sizes (list): Number of cards of every player, by seat.
+        unseen (list): Encoded cards that may be in the other hands or in
+            the draw pile.
+        top (int): Encoded top card of the discard pile.
+        seat (int): Seat of the searching player, in turn.
+        inc (int): Direction of play, 1 or -1.
+        budget (float): Seconds the worker may search for.
+        seed (int): Seed of the worker's random generator.
+
+    Returns:
+        tuple: Wins and rollouts of each move, as lists.
+    """
+    end = time.perf_counter() + budget
+    rng = random.Random(seed)
+    wins = [0] * len(moves)
+    games = [0] * len(moves)
+
+    i = 0
+    while time.perf_counter() < end:
+        m = i % len(moves)
+        i += 1
+
+        # Samples hidden hands consistent with what the player has seen
+        pool = unseen[:]
+        rng.shuffle(pool)
+        hands = []
+        for s, size in enumerate(hand_sizes):
+            if s == seat:
+                hands.append(hand[:])
+            else:
+                dealt = len(pool) - min(size, len(pool))
+                hands.append(pool[dealt:])
+                del pool[dealt:]
+
+        game = _Game(hands, pool, top, seat, inc, rng)
+        winner = seat if game.play(moves[m]) else game.rollout()
+        wins[m] += winner == seat
+        games[m] += 1
+
+    return wins, games
+
+def warm_up():
+    """
+    Does nothing, submitted once per worker so processes are started
+    before the first move is searched.
+    """
+    return True
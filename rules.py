@@ -0,0 +1,117 @@
+from card import CardType, CardColor, UnoCard
+
+def card_matches_discard(uno_card, top_card):
+    """
+    Checks if a card can be played on top of the discard pile.
+
+    Args:
+        uno_card (UnoCard): The card to be played.
+        top_card (UnoCard): The top card of the discard pile.
+
+    Returns:
+        bool: True if the card matches the type or color of the top card,
+            or is a wild card.
+    """
+    return (uno_card.type == top_card.type or
+            uno_card.color == top_card.color or
+            uno_card.color == CardColor.DARK)
+
+def next_player(player_turn, turn_increase, num_players):
+    """
+    Calculates the index of the next player in turn.
+
+    Args:
+        player_turn (int): Index of the player in turn.
+        turn_increase (int): Direction of play, 1 or -1.
+        num_players (int): Number of players in the game.
+
+    Returns:
+        int: Index of the next player in turn.
+    """
+    return (player_turn + turn_increase) % num_players
+
+def turn_after_play(uno_card, player_turn, turn_increase, num_players):
+    """
+    Calculates who plays next and in which direction after a card is
+    played, applying the Skip and Reverse effects.
+
+    Args:
+        uno_card (UnoCard): The card played.
+        player_turn (int): Index of the player who played the card.
+        turn_increase (int): Direction of play, 1 or -1.
+        num_players (int): Number of players in the game.
+
+    Returns:
+        tuple: Index of the next player in turn and direction of play.
+    """
+    player_turn = next_player(player_turn, turn_increase, num_players)
+
+    if uno_card.type == CardType.SKIP:
+        player_turn = next_player(player_turn, turn_increase, num_players)
+
+    if uno_card.type == CardType.REVERSE:
+        turn_increase *= -1
+        player_turn = next_player(player_turn, turn_increase, num_players)
+
+    return player_turn, turn_increase
+
+WILD_COLORS = (CardColor.RED, CardColor.GREEN, CardColor.BLUE, CardColor.YELLOW)
+
+def playable_cards(hand, top_card):
+    """
+    Returns the cards of a hand that can be played on the discard pile.
+
+    Args:
+        hand (list): The UnoCards of the hand.
+        top_card (UnoCard): The top card of the discard pile.
+
+    Returns:
+        list: The playable UnoCards, in hand order.
+    """
+    return [uno_card for uno_card in hand
+            if card_matches_discard(uno_card, top_card)]
+
+def candidate_moves(hand, top_card):
+    """
+    Returns every card play available to a hand, wild cards once for each
+    color that can be picked for them.
+
+    Args:
+        hand (list): The UnoCards of the hand.
+        top_card (UnoCard): The top card of the discard pile.
+
+    Returns:
+        list: The UnoCards that can be sent as a card play, wild cards
+            carrying the picked color.
+    """
+    moves = []
+    seen = set()
+    for uno_card in playable_cards(hand, top_card):
+        key = (uno_card.type, uno_card.color)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        if uno_card.color == CardColor.DARK:
+            moves.extend(UnoCard(uno_card.type, color) for color in WILD_COLORS)
+        else:
+            moves.append(uno_card)
+    return moves
+
+def card_points(uno_card):
+    """
+    Returns the points a card scores for the winner of a round.
+
+    Args:
+        uno_card (UnoCard): The card left in a losing hand.
+
+    Returns:
+        int: Face value for number cards, 20 for Skip, Reverse and +2 and
+            50 for wild cards.
+    """
+    if uno_card.color == CardColor.DARK or uno_card.type in (
+            CardType.WILD, CardType.WILD_DRAW_FOUR):
+        return 50
+    if uno_card.type in (CardType.SKIP, CardType.REVERSE, CardType.DRAW_TWO):
+        return 20
+    return uno_card.type.value
@@ -1,55 +1,204 @@
+import os
+import hmac
+import secrets
 import socket
-from status_code import StatusCode, UnoMessage
+import random
+import time
+from status_code import (StatusCode, UnoMessage, MalformedMessageError,
+                         unpack_messages)
 import pickle
 import threading
-from card import CardType 
+from collections import Counter
+from card import (CardType, CardColor, UnoCard, encode_card, decode_card,
+                  encode_hand_card)
 from card_collections import UnoDeck
+from rules import (next_player, turn_after_play, card_matches_discard,
+                   WILD_COLORS)
+from game_recording import GameRecorder, EventType, DrawReason, NO_SEAT
+from game_journal import GameJournal
+from turn_timers import TimerService
+from spectators import SpectatorFanout
+
+class VacantSeat:
+    """
+    Stands in for the socket of a player who left the game or has not
+    reclaimed its seat in a recovered game, what is sent to it is dropped.
+    """
+    def send(self, data):
+        """
+        Drops the data.
+        """
+        return len(data)
+
+    def settimeout(self, timeout):
+        """
+        Ignores the acknowledgement timeouts.
+        """
+        pass
 
 class Server:
     """
     Represents the Uno game server for handling multiplayer gameplay.
     """    
     LOCAL_IP_ADDRESS = '127.0.0.1'
+    JOURNAL_DIR = 'journal'
+    TURN_TIMEOUT = 60
+    SPECTATOR_PORT = 1235
+    RESUME_PORT = 1240
+    RESUME_DEADLINE = 120
 
-    def __init__(self, server_address, port, num_players):
+    def __init__(self, server_address, port, num_players, seed=None,
+                 record_dir=None, journal=None, turn_timeout=None,
+                 game_timeout=None, timeout_action='draw', timers=None,
+                 spectator_port=None):
         """
         Initializes the Uno game server.
 
         Args:
             server_address (str): The IP address to bind the server.
-            port (int): The port number for the server.
+            port (int): The port number for the server, None for a 
+                recovered game whose players come through a ResumeRouter.
             num_players (int): Number of players in the game.
+            seed (int, optional): Seed of the game's shuffles, a random one
+                is picked at start_game if not given.
+            record_dir (str, optional): Directory the game is recorded to,
+                the game is not recorded if not given.
+            journal (GameJournal, optional): Journal the moves are written
+                to before they are applied, so the game survives a restart.
+            turn_timeout (float, optional): Seconds a player has to move
+                before the server moves for it, no limit if not given.
+            game_timeout (float, optional): Seconds after which the game
+                ends, won by the player with the fewest cards. No limit if
+                not given.
+            timeout_action (str, optional): 'draw' to draw a card for a 
+                player whose turn timed out, 'skip' to pass its turn.
+                Defaults to 'draw'.
+            timers (TimerService, optional): Timer service of the turn and
+                game timers. Defaults to the one shared by the process.
+            spectator_port (int, optional): Port spectators watch the game
+                on, 0 picks a free one. No spectators if not given.
+
+        Raises:
+            ValueError: If the seed does not fit in 64 unsigned bits.
         """        
-        # Game variables
+        self._init_game(num_players, seed, record_dir, journal)
+        self.turn_timeout = turn_timeout
+        self.game_timeout = game_timeout
+        self.timeout_action = timeout_action
+        self._timers = timers
+        host_address = Server.LOCAL_IP_ADDRESS
+        
+        # Sets up server ip address
+        if not host_address == server_address:
+            host_address = '0.0.0.0'
+        
+        # Initialize the server socket
+        self.server_socket = None
+        if port is not None:
+            self.server_socket = socket.socket(
+                socket.AF_INET, socket.SOCK_STREAM)
+            self.server_socket.bind((host_address, port))
+            self.server_socket.listen(self.num_players)
+            print(f"\nServer is listening on {server_address}:{port}")
+        
+        if spectator_port is not None:
+            self.spectators = SpectatorFanout(host_address, spectator_port)
+        
+    def _init_game(self, num_players, seed, record_dir=None, journal=None):
+        """
+        Initializes the game variables.
+
+        Args:
+            num_players (int): Number of players in the game.
+            seed (int): Seed of the game's shuffles, or None.
+            record_dir (str, optional): Directory the game is recorded to.
+            journal (GameJournal, optional): Journal of the moves.
+
+        Raises:
+            ValueError: If the seed does not fit in 64 unsigned bits.
+        """
+        # Recordings and the journal store the seed as an unsigned 64 bit
+        # field, checked here rather than when the first event is written
+        if seed is not None and not 0 <= seed < 2 ** 64:
+            raise ValueError(f'Seed out of the 64 bit range: {seed}')
+        
         self.player_turn = 0
         self.players = []
         self.usernames = []
         self.pending_acknoledgements = []
         self.apply_card_effects = False
         self.game_won = False
+        self.game_abandoned = False
         self.num_players = num_players
-        host_address = Server.LOCAL_IP_ADDRESS
         
         self._deck = self._discarded_pile = None
         self.turn_increase = 1
         
-        # Sets up server ip address
-        if not host_address == server_address:
-            host_address = '0.0.0.0'
+        # The seed and the moves are enough to replay the game exactly
+        self.seed = seed
+        self._rng = None
+        self.move_log = []
+        self.record_dir = record_dir
+        self.recorder = None
+        self.journal = journal
+        self.hand_sizes = [0] * num_players
+        self.spectators = None
         
-        # Initialize the server socket
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.bind((host_address, port))
-        self.server_socket.listen(self.num_players)
-        print(f"\nServer is listening on {server_address}:{port}")
+        # Hands hold encoded cards, wild ones without a color, see _deal
+        self.hands = [Counter() for _ in range(num_players)]
+        self.dealt = [False] * num_players
+        self._snapshot = None
+        self._snapshot_moves = None
+        self.rejected_moves = 0
         
-    def run(self):
+        # A player reclaims its seat after a restart with the token sent to
+        # it at the start of the game
+        self.resume_tokens = []
+        
+        # Timers are matched to the turn they were set for, a timer firing
+        # as the turn ends is ignored
+        self.turn_timeout = self.game_timeout = None
+        self.timeout_action = 'draw'
+        self._timers = None
+        self._timers_started = False
+        self._turn_timer = None
+        self._turn_number = 0
+        
+        # Timeouts are applied in order on the timer service's workers, so
+        # a room waiting on the journal or a socket does not hold up the
+        # timer thread
+        self._timeout_queue = None
+        
+        # Handler threads change the game and broadcast it one at a time,
+        # so every player receives the game states in the same order
+        self._game_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        
+    def run(self, join_timeout=None):
         """
         Runs the server to accept and handle incoming connections.
+
+        Args:
+            join_timeout (float, optional): Seconds the players have to
+                connect, the game is cancelled if some do not. Defaults to
+                None, no limit.
         """        
+        if join_timeout is not None:
+            end = time.monotonic() + join_timeout
+        
         # Accept and handle incoming connections
         while len(self.players) < self.num_players:
-            client_socket, addr = self.server_socket.accept()
+            if join_timeout is not None:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    self.cancel_game()
+                    return
+                self.server_socket.settimeout(remaining)
+            try:
+                client_socket, addr = self.server_socket.accept()
+            except socket.timeout:
+                continue
+            client_socket.settimeout(None)
             self.players.append(client_socket)
             print(f"Player {len(self.players)} connected from {addr}")
             print(f"peer: {client_socket.getpeername()}")
@@ -62,90 +211,349 @@ class Server:
 
         self.server_socket.close()        
 
+    def cancel_game(self):
+        """
+        Cancels a game whose players did not all connect in time, the ones
+        who did are told the connection failed.
+        """
+        print(f'{len(self.players)} of {self.num_players} players joined, '
+              'game cancelled')
+        self.game_abandoned = True
+        for player in self.players:
+            try:
+                self.send_response(player, UnoMessage(
+                    StatusCode.CONNECTION_FAILED))
+                player.close()
+            except OSError as e:
+                print(f'Error cancelling the game: {e}')
+        self.server_socket.close()
+        if self.spectators:
+            self.spectators.close()
+
     def start_game(self):
         """
         Initializes the game state and notifies players that the game has started.
         """        
-        self._deck = UnoDeck()
-        self._deck.shuffle()
+        self.setup_deck()
+        self.resume_tokens = [secrets.token_hex(16) for _ in self.players]
         
-        self._discarded_pile = []
-        self._discarded_pile.append(self._deck.draw_card())
+        # The seed identifies the room in the journal
+        if self.journal:
+            self.journal.append(self.seed, 0, (
+                'start', list(self.usernames), self.num_players,
+                list(self.resume_tokens)))
         
-        # Tells all players game started
-        for player in self.players:
-            data = pickle.dumps(UnoMessage(StatusCode.GAME_START))
+        # Tells all players game started, with the token of their seat
+        for player, token in zip(self.players, self.resume_tokens):
+            data = pickle.dumps(UnoMessage(StatusCode.GAME_START, token))
             player.send(data)
             
             client_handler = threading.Thread(
                 target=self.handle_client_requests, args=(player,))
             client_handler.start()
+        
+        with self._game_lock:
+            # Spectators joining before the first turn ends see the game
+            self.publish_to_spectators()
+            self.start_timers()
+            
+    def start_timers(self):
+        """
+        Starts the game timer and the first turn's timer, if the game has
+        time limits and they did not start yet. Called with the game lock
+        held.
+        """
+        if self._timers_started:
+            return
+        self._timers_started = True
+        self._timeout_queue = self._get_timers().serial_queue()
+        if self.game_timeout is not None:
+            self._get_timers().schedule(
+                self.game_timeout, self._on_timeout, None, 'game')
+        self._schedule_turn_timer()
+        
+    def _get_timers(self):
+        """
+        Returns the timer service, the process's shared one by default.
+        """
+        if self._timers is None:
+            self._timers = TimerService.shared()
+        return self._timers
+        
+    def _schedule_turn_timer(self):
+        """
+        Replaces the timer of the previous turn with one for the turn that
+        begins.
+        """
+        self._turn_number += 1
+        if self._turn_timer is not None:
+            self._turn_timer.cancel()
+            self._turn_timer = None
+        if (self.turn_timeout is not None and not self.game_won and
+                not self.game_abandoned):
+            self._turn_timer = self._get_timers().schedule(
+                self.turn_timeout, self._on_timeout, self._turn_number,
+                self.timeout_action)
+            
+    def _on_timeout(self, turn_number, action):
+        """
+        Hands a timer that expired to the room's timeout queue, runs in
+        the timer thread and does not block.
+
+        Args:
+            turn_number (int): Turn the timer was set for, None for the
+                game timer.
+            action (str): 'draw', 'skip' or 'game'.
+        """
+        self._timeout_queue.submit(self._apply_timeout, turn_number, action)
+
+    def _apply_timeout(self, turn_number, action):
+        """
+        Makes the move of a timer that expired, runs in a timer service
+        worker.
+
+        Args:
+            turn_number (int): Turn the timer was set for, None for the
+                game timer.
+            action (str): 'draw', 'skip' or 'game'.
+        """
+        with self._game_lock:
+            if self.game_won or self.game_abandoned or (
+                    turn_number is not None and
+                    turn_number != self._turn_number):
+                return
+            print(f'Timeout of player {self.player_turn}: {action}')
+            self.handle_client_message(
+                self.players[self.player_turn],
+                UnoMessage(StatusCode.TURN_TIMEOUT, action))
+            
+    def setup_deck(self):
+        """
+        Shuffles the deck with the game's seed, picking and recording one 
+        if needed, and turns over the first discarded card.
+        """
+        if self.seed is None:
+            self.seed = random.SystemRandom().getrandbits(64)
+        print(f'Game seed: {self.seed}')
+        
+        # Every game owns its random generator so it can be replayed
+        self._rng = random.Random(self.seed)
+        self._deck = UnoDeck(self._rng)
+        self._deck.shuffle()
+        
+        self._discarded_pile = []
+        self._discarded_pile.append(self._deck.draw_card())
+        
+        if self.record_dir:
+            self.recorder = GameRecorder(
+                os.path.join(self.record_dir, f'{self.seed}.unorec'),
+                self.seed, len(self.players))
+            for seat in range(len(self.players)):
+                self._record(EventType.JOIN, seat)
+            self._record(EventType.FLIP, NO_SEAT, self.top_discarded_card())
             
+    def _record(self, event, seat=NO_SEAT, uno_card=None, arg=0):
+        """
+        Records an event of the game if it is being recorded.
+
+        Args:
+            event (EventType): The event.
+            seat (int, optional): Seat of the player concerned.
+            uno_card (UnoCard, optional): The card of the event.
+            arg (int, optional): Argument of the event.
+        """
+        if self.recorder is None:
+            return
+        if uno_card is None:
+            self.recorder.record(event, seat, 0, arg)
+        else:
+            self.recorder.record_card(event, seat, uno_card, arg)
             
-    def broadcast(self, status_code, dta):
+    def broadcast(self, status_code, dta, requester=None, request_id=None):
         """
         Broadcasts a message to all connected players.
 
         Args:
             status_code (StatusCode): The status code of the message.
             data: The data to be sent to the players.
+            requester (socket, optional): Player whose request caused the
+                broadcast, its copy carries the request id.
+            request_id (int, optional): Id of the request answered.
         """        
         for player in self.players:
+            r_id = request_id if player is requester else None
             self.send_response(player, UnoMessage(
-                status_code, dta))
+                status_code, dta, r_id))
+        
+        if status_code == StatusCode.GAME_STATE:
+            self.publish_to_spectators(dta)
+            
+    def publish_to_spectators(self, dta=None):
+        """
+        Publishes a game state to the spectators, with the snapshot of the
+        game sent to the ones joining next. Spectators get the states 
+        through their own fan-out thread.
+
+        Args:
+            dta (list, optional): The game state data, the current game 
+                state if not given.
+        """
+        if not self.spectators:
+            return
+        if dta is None:
+            dta = self.game_state_data()
+        self.spectators.publish(
+            UnoMessage(StatusCode.GAME_STATE, dta),
+            UnoMessage(StatusCode.GAME_SNAPSHOT, self.late_join_snapshot()))
             
-    def next_turn(self):
+    def next_turn(self, requester=None, request_id=None):
         """
         Handles the transition to the next player's turn.
+
+        Args:
+            requester (socket, optional): Player whose request ended the 
+                turn.
+            request_id (int, optional): Id of the request that ended it.
         """        
         if not self.game_won:
-            # Set next player's turn
-            self.calc_player_turn()
-            
             # Apply effects from discarded card
             if self.apply_card_effects:
+                # Set next player's turn, skipping or reversing if needed
+                self.player_turn, self.turn_increase = turn_after_play(
+                    self.top_discarded_card(), self.player_turn,
+                    self.turn_increase, len(self.players))
                 self.handle_card_effects()  
                 self.apply_card_effects = False
+            else:
+                # Set next player's turn
+                self.calc_player_turn()
         
         # Sends the player in turn and a list of all players to all players
-        data = [self.player_turn, self.usernames,
-                self.top_discarded_card(), self.game_won]
+        self.broadcast(StatusCode.GAME_STATE, self.game_state_data(),
+                       requester, request_id)
+        self._schedule_turn_timer()
         
-        self.broadcast(StatusCode.GAME_STATE, data)
+    def game_state_data(self):
+        """
+        Returns the game state sent to the players.
+
+        Returns:
+            list: Player in turn index, player names, top discarded card,
+                whether the game was won and the direction of play.
+        """
+        return [self.player_turn, self.usernames,
+                self.top_discarded_card(), self.game_won, self.turn_increase]
+    
+    def late_join_snapshot(self, seat=None):
+        """
+        Returns the state of the game sent to a spectator or a player
+        joining mid-game. The public part is built once per move, whatever
+        the number of joins.
+
+        Args:
+            seat (int, optional): Seat of the player joining, None for a
+                spectator.
+
+        Returns:
+            list: The game_state_data fields, the number of cards of every
+                seat, the number of cards in the deck and the UnoCards of 
+                the player's hand, None for a spectator.
+        """
+        if self._snapshot is None or self._snapshot_moves != len(self.move_log):
+            self._snapshot = self.game_state_data() + [
+                list(self.hand_sizes), len(self._deck)]
+            self._snapshot[1] = list(self.usernames)
+            self._snapshot_moves = len(self.move_log)
+        
+        hand = None
+        if seat is not None:
+            hand = [decode_card(code)
+                    for code in self.hands[seat].elements()]
+        return self._snapshot + [hand]
             
-    def handle_client_requests(self, client_socket):
+    def handle_client_requests(self, client_socket, received=b''):
         """
         Handles incoming requests from a connected client.
 
         Args:
             client_socket (socket): The socket of the connected client.
+            received (bytes, optional): Bytes already read from the socket,
+                by the ResumeRouter that routed the client.
         """        
         client_socket.settimeout(None)
+        recv_buffer = b''
+        request = received
         
         while True:
             try:
-                # Resets timeouts if there are no pending acknoledgements
-                if not self.pending_acknoledgements:
-                    client_socket.settimeout(None)
-                    
-                request = client_socket.recv(512)
+                # Handles what was already received before reading more
+                if not request:
+                    # Resets timeouts if there are no pending acknoledgements
+                    if not self.pending_acknoledgements:
+                        client_socket.settimeout(None)
+                        
+                    request = client_socket.recv(4096)
+                    if not request:
+                        print('Client closed the connection')
+                        break
                 
-                # Deserializes message
-                uno_msg = pickle.loads(request)
+                # Deserializes every complete message received
+                uno_msgs, recv_buffer = unpack_messages(recv_buffer + request)
+                request = b''
                 
-                self.handle_client_message(client_socket, uno_msg)
+                for uno_msg in uno_msgs:
+                    # Only the server's timers make timeout moves
+                    if uno_msg.status_code == StatusCode.TURN_TIMEOUT:
+                        continue
+                    # Echoes probes without waiting for the game, so the
+                    # client measures the network round trip. Pings are not
+                    # acknowledgements of game messages
+                    if uno_msg.status_code == StatusCode.PING:
+                        self.send_response(client_socket, UnoMessage(
+                            StatusCode.PING, uno_msg.data,
+                            getattr(uno_msg, 'request_id', None)))
+                        continue
+                    with self._game_lock:
+                        self.handle_client_message(client_socket, uno_msg)
                             
-                if self.pending_acknoledgements:
-                    uno_msg = self.pending_acknoledgements.pop(0)
+                        if self.pending_acknoledgements:
+                            self.pending_acknoledgements.pop(0)
                 
             except socket.timeout:
-                uno_msg = self.pending_acknoledgements.pop(0)
-                self.send_response(client_socket, uno_msg)
-                self.pending_acknoledgements.insert(0, uno_msg)
+                with self._game_lock:
+                    # Another player may have acknowledged it meanwhile
+                    if self.pending_acknoledgements:
+                        uno_msg = self.pending_acknoledgements[0]
+                        self.send_response(client_socket, uno_msg)
+            except MalformedMessageError as e:
+                print(f'Dropping the client: {e}')
+                break
             except Exception as e:
                 print(f'Error handling client request: {e}')
                 break
+            
+        # Keeps what was recorded of a game left unfinished
+        with self._game_lock:
+            if self.recorder:
+                self.recorder.flush()
+            self.leave_seat(client_socket)
+        client_socket.close()
+            
+    def leave_seat(self, client_socket):
+        """
+        Frees the seat of a disconnected player, its turns time out from
+        now on. A game every player left is abandoned.
 
+        Args:
+            client_socket (socket): The socket of the player.
+        """
+        if client_socket not in self.players:
+            return
+        self.players[self.players.index(client_socket)] = VacantSeat()
+        
+        if (not self.game_won and not self.game_abandoned and
+                all(isinstance(p, VacantSeat) for p in self.players)):
+            self.abandon_game()
 
     def handle_client_message(self, client_socket, uno_msg):   
         """
@@ -157,37 +565,419 @@ class Server:
         """        
         print(f'RECEIVING : {uno_msg.status_code}')
         status_code = uno_msg.status_code
+        request_id = getattr(uno_msg, 'request_id', None)
+        
+        # Moves the game does not allow are answered with the unchanged
+        # game state, before anything is logged or broadcast
+        if (status_code in (StatusCode.INITIAL_DRAW, StatusCode.CARD_DRAW,
+                            StatusCode.CARD_PLAY) and
+                not self.is_valid_move(client_socket, status_code,
+                                       uno_msg.data)):
+            self.reject_move(client_socket, request_id)
+            return
+        
+        # Logs the moves, in the order the game lock applies them
+        is_move = status_code in (StatusCode.INITIAL_DRAW,
+                                  StatusCode.CARD_DRAW, StatusCode.CARD_PLAY,
+                                  StatusCode.TURN_TIMEOUT)
+        if is_move:
+            seat = self.players.index(client_socket)
+            self.move_log.append((seat, status_code, uno_msg.data))
+            
+            # Write-ahead, the move is on disk before it is applied
+            if self.journal:
+                self.journal.append(self.seed, len(self.move_log), (
+                    'move', seat, status_code, uno_msg.data))
+            
         # send initial draw of cards to client
         if status_code == StatusCode.INITIAL_DRAW:
             card_list = []
             for i in range(7):
                 uno_card = self.draw_from_deck()
+                if uno_card is None:
+                    break
                 card_list.append(uno_card)
+                self._record(EventType.DRAW, seat, uno_card,
+                             DrawReason.INITIAL)
+            self._deal(seat, card_list)
+            self.dealt[seat] = True
                 
-            u = UnoMessage(StatusCode.CARD_DRAW, card_list)
+            u = UnoMessage(StatusCode.CARD_DRAW, card_list, request_id)
             self.send_response(client_socket, u)
             
+            # Only the hand sizes changed, the spectators' snapshot with them
+            self.publish_to_spectators()
+            
         elif status_code == StatusCode.CARD_DRAW:
-            uno_card = self.draw_from_deck()
-            u = UnoMessage(StatusCode.CARD_DRAW, [uno_card])
-            self.send_response(client_socket, u)
-            self.next_turn()
+            self.draw_turn_card(seat, request_id)
             
         elif status_code == StatusCode.CARD_PLAY:
+            # The server decides the win, the client's claim is ignored
             card_played = uno_msg.data[0]
-            self.game_won = uno_msg.data[1]
             self._discarded_pile.append(card_played)
+            self._take_from_hand(seat, card_played)
+            self.game_won = self.hand_sizes[seat] == 0
+            self._record(EventType.PLAY, seat, card_played, int(self.game_won))
             self.apply_card_effects = True
-            self.next_turn()
+            self.next_turn(client_socket, request_id)
+            
+            if self.game_won:
+                self.finish_game(seat)
+                
+        elif status_code == StatusCode.TURN_TIMEOUT:
+            if uno_msg.data == 'game':
+                self.end_game_on_timeout()
+            elif uno_msg.data == 'draw':
+                self.draw_turn_card(seat)
+            else:
+                self._record(EventType.SKIP, seat)
+                self.next_turn()
             
         elif status_code == StatusCode.GAME_STATE:
-            data = [self.player_turn, self.usernames,
-                    self.top_discarded_card(), self.game_won]
-            u = UnoMessage(StatusCode.GAME_STATE, data)        
+            u = UnoMessage(StatusCode.GAME_STATE, self.game_state_data(),
+                           request_id)        
             self.send_response(client_socket, u)   
             self.pending_acknoledgements.append(u)
             client_socket.settimeout(1)
+            
+        elif status_code == StatusCode.RESUME:
+            self.resume_seat(client_socket, uno_msg.data, request_id)
+            
+        if (is_move and self.journal and not self.game_won and
+                len(self.move_log) % GameJournal.SNAPSHOT_INTERVAL == 0):
+            self.journal.snapshot(self.seed, self.snapshot_state())
+
+    def is_valid_move(self, client_socket, status_code, data):
+        """
+        Checks a draw or a play against the server's view of the game. A
+        seat is dealt its initial cards once. Draws and plays must come
+        from the player in turn of a game not won, and a card played must
+        be in the player's hand and match the discard pile. Every check is
+        constant time.
 
+        Args:
+            client_socket (socket): The socket of the player.
+            status_code (StatusCode): INITIAL_DRAW, CARD_DRAW or CARD_PLAY.
+            data: The data of the request, the card played and the
+                client's win claim for a CARD_PLAY.
+
+        Returns:
+            bool: True if the move can be applied, False otherwise.
+        """
+        if status_code == StatusCode.INITIAL_DRAW:
+            return (client_socket in self.players and
+                    not self.dealt[self.players.index(client_socket)])
+        if self.game_won or self.players[self.player_turn] is not client_socket:
+            return False
+        if status_code == StatusCode.CARD_DRAW:
+            return True
+        
+        try:
+            uno_card = data[0]
+            is_wild = uno_card.type in (CardType.WILD, CardType.WILD_DRAW_FOUR)
+            # A wild card is played with the color picked for it
+            if is_wild and uno_card.color not in WILD_COLORS:
+                return False
+            if not self.hands[self.player_turn][encode_hand_card(uno_card)]:
+                return False
+        except (TypeError, IndexError, KeyError, AttributeError):
+            return False
+        return is_wild or card_matches_discard(
+            uno_card, self.top_discarded_card())
+
+    def reject_move(self, client_socket, request_id=None):
+        """
+        Answers a move that is not applied with MOVE_REJECTED and the
+        unchanged game state, the client takes back a card it played.
+
+        Args:
+            client_socket (socket): The socket of the player.
+            request_id (int, optional): Id of the rejected request.
+        """
+        self.rejected_moves += 1
+        print(f'Move rejected, {self.rejected_moves} so far')
+        self.send_response(client_socket, UnoMessage(
+            StatusCode.MOVE_REJECTED, self.game_state_data(), request_id))
+
+    def draw_turn_card(self, seat, request_id=None):
+        """
+        Draws a card for the player in turn and passes the turn.
+
+        Args:
+            seat (int): Seat of the player in turn.
+            request_id (int, optional): Id of the CARD_DRAW request.
+        """
+        uno_card = self.draw_from_deck()
+        if uno_card is None:
+            # Every card is in the hands, the turn passes without one
+            self._record(EventType.SKIP, seat)
+            card_list = []
+        else:
+            self._record(EventType.DRAW, seat, uno_card, DrawReason.TURN)
+            card_list = [uno_card]
+        self._deal(seat, card_list)
+        u = UnoMessage(StatusCode.CARD_DRAW, card_list, request_id)
+        self.send_response(self.players[seat], u)
+        self.next_turn()
+
+    def _deal(self, seat, cards):
+        """
+        Adds the cards a player drew to its hand.
+
+        Args:
+            seat (int): Seat of the player.
+            cards (list): The UnoCards drawn.
+        """
+        hand = self.hands[seat]
+        for uno_card in cards:
+            hand[encode_card(uno_card)] += 1
+        self.hand_sizes[seat] += len(cards)
+
+    def _take_from_hand(self, seat, uno_card):
+        """
+        Removes a card a player played from its hand, a wild card is held
+        without the color picked for it.
+
+        Args:
+            seat (int): Seat of the player.
+            uno_card (UnoCard): The card played.
+        """
+        code = encode_hand_card(uno_card)
+        hand = self.hands[seat]
+        if hand[code] > 1:
+            hand[code] -= 1
+        else:
+            del hand[code]
+        self.hand_sizes[seat] -= 1
+
+    def end_game_on_timeout(self):
+        """
+        Ends the game when its timer expires, the player with the fewest
+        cards wins, the first in turn order on a tie.
+        """
+        n = len(self.players)
+        order = [(self.player_turn + i * self.turn_increase) % n
+                 for i in range(n)]
+        winner = min(order, key=lambda seat: self.hand_sizes[seat])
+        
+        self.player_turn = winner
+        self.game_won = True
+        self.broadcast(StatusCode.GAME_STATE, self.game_state_data())
+        self.finish_game(winner, by_timeout=True)
+
+    def finish_game(self, seat, by_timeout=False):
+        """
+        Records the winner and closes the game.
+
+        Args:
+            seat (int): Seat of the winner.
+            by_timeout (bool, optional): Whether the game timer ended the
+                game.
+        """
+        self._record(EventType.WIN, seat, arg=int(by_timeout))
+        self._close_game()
+
+    def abandon_game(self):
+        """
+        Closes a game every player left, or that no player resumed in
+        time after a restart. It is not resumed again.
+        """
+        print(f'Game {self.seed} abandoned')
+        self.game_abandoned = True
+        self._close_game()
+
+    def _close_game(self):
+        """
+        Stops the timers and the spectators, closes the recording and ends
+        the game in the journal.
+        """
+        self._schedule_turn_timer()
+        if self._timeout_queue:
+            self._timeout_queue.close()
+        if self.spectators:
+            self.spectators.close()
+        if self.recorder:
+            self.recorder.close()
+        if self.journal:
+            self.journal.end(self.seed, len(self.move_log))
+
+    def snapshot_state(self):
+        """
+        Returns the state of the game, to be restored after a restart.
+
+        Returns:
+            dict: The game variables, the order of the deck, the state of 
+                the random generator and the moves applied.
+        """
+        return {
+            'seed': self.seed,
+            'num_players': self.num_players,
+            'usernames': list(self.usernames),
+            'player_turn': self.player_turn,
+            'turn_increase': self.turn_increase,
+            'game_won': self.game_won,
+            'resume_tokens': list(self.resume_tokens),
+            'apply_card_effects': self.apply_card_effects,
+            'hand_sizes': list(self.hand_sizes),
+            'dealt': list(self.dealt),
+            'hands': [dict(hand) for hand in self.hands],
+            'deck': self._deck.cards,
+            'discarded_pile': list(self._discarded_pile),
+            'rng_state': self._rng.getstate(),
+            'move_log': list(self.move_log),
+            'moves': len(self.move_log),
+        }
+
+    def restore_state(self, state):
+        """
+        Restores the state of the game from a snapshot.
+
+        Args:
+            state (dict): The state returned by snapshot_state.
+        """
+        self.seed = state['seed']
+        self.usernames = list(state['usernames'])
+        self.player_turn = state['player_turn']
+        self.turn_increase = state['turn_increase']
+        self.game_won = state['game_won']
+        self.resume_tokens = list(state['resume_tokens'])
+        self.apply_card_effects = state['apply_card_effects']
+        self.hand_sizes = list(state['hand_sizes'])
+        self.dealt = list(state['dealt'])
+        self.hands = [Counter(hand) for hand in state['hands']]
+        self._rng = random.Random()
+        self._rng.setstate(state['rng_state'])
+        self._deck = UnoDeck(self._rng, state['deck'])
+        self._discarded_pile = list(state['discarded_pile'])
+        self.move_log = list(state['move_log'])
+
+    @classmethod
+    def recover(cls, room_log, server_address, journal=None, **kwargs):
+        """
+        Rebuilds an interrupted game from its last snapshot and the moves
+        journaled after it. Its players reclaim their seats through a
+        ResumeRouter.
+
+        Args:
+            room_log (RoomLog): What the journal holds about the game.
+            server_address (str): The IP address of the server.
+            journal (GameJournal, optional): Journal of the resumed game.
+            **kwargs: Time limits of the resumed game, as for Server.
+
+        Returns:
+            Server: The server of the rebuilt game.
+        """
+        if room_log.snapshot:
+            num_players = room_log.snapshot['num_players']
+            usernames = room_log.snapshot['usernames']
+            resume_tokens = room_log.snapshot['resume_tokens']
+        else:
+            _, usernames, num_players, resume_tokens = room_log.start
+        
+        server = cls(server_address, None, num_players, room_log.room_id,
+                     **kwargs)
+        server.players = [VacantSeat() for _ in range(num_players)]
+        server.usernames = list(usernames)
+        server.resume_tokens = list(resume_tokens)
+        if room_log.snapshot:
+            server.restore_state(room_log.snapshot)
+        else:
+            server.setup_deck()
+        
+        # Timers start once the players are back, see resume_seat
+        turn_timeout, server.turn_timeout = server.turn_timeout, None
+        for _, (_, seat, status_code, data) in room_log.moves:
+            server.handle_client_message(
+                server.players[seat], UnoMessage(status_code, data))
+            server.pending_acknoledgements.clear()
+        server.turn_timeout = turn_timeout
+        
+        # Moves replayed from the journal are not journaled again
+        server.journal = journal
+        return server
+
+    def awaits_players(self):
+        """
+        Returns whether a recovered game still has seats to reclaim.
+
+        Returns:
+            bool: True if a seat is vacant in a game still in progress.
+        """
+        with self._game_lock:
+            return (not self.game_won and not self.game_abandoned and
+                    any(isinstance(p, VacantSeat) for p in self.players))
+
+    def abandon_unclaimed(self):
+        """
+        Abandons a recovered game none of whose players reclaimed a seat.
+        """
+        with self._game_lock:
+            if (all(isinstance(p, VacantSeat) for p in self.players) and
+                    not self.game_won and not self.game_abandoned):
+                self.abandon_game()
+
+    def resume_seat(self, client_socket, resume_token, request_id=None):
+        """
+        Gives a reconnected player back its seat, sends it the snapshot of
+        the game with its hand and everyone the game state with its new 
+        name.
+
+        Args:
+            client_socket (socket): The socket of the reconnected player.
+            resume_token (str): The token of the seat, sent to the player
+                with GAME_START.
+            request_id (int, optional): Id of the RESUME request.
+        """
+        seat = self.seat_of_token(resume_token)
+        if seat is not None and client_socket not in self.players:
+            if isinstance(self.players[seat], VacantSeat):
+                self.players[seat] = client_socket
+                self.usernames[seat] = str(client_socket.getpeername())
+                self._snapshot = None
+                if self.journal:
+                    self.journal.snapshot(self.seed, self.snapshot_state())
+                self.send_response(client_socket, UnoMessage(
+                    StatusCode.GAME_SNAPSHOT, self.late_join_snapshot(seat),
+                    request_id))
+                self.broadcast(StatusCode.GAME_STATE, self.game_state_data())
+                
+                # The timers restart with the first player back, the seats
+                # still vacant time out like idle players. The game timer's
+                # restart is not journaled
+                self.start_timers()
+                return
+        
+        print('No seat to resume for the token received')
+        self.send_response(client_socket, UnoMessage(
+            StatusCode.CONNECTION_FAILED, None, request_id))
+
+    def seat_of_token(self, resume_token):
+        """
+        Returns the seat a resume token was issued for.
+
+        Args:
+            resume_token (str): The token sent by the player.
+
+        Returns:
+            int: The seat, None if the token matches none.
+        """
+        received = str(resume_token).encode()
+        for seat, token in enumerate(self.resume_tokens):
+            if hmac.compare_digest(token.encode(), received):
+                return seat
+        return None
+
+            
+    def game_record(self):
+        """
+        Returns what is needed to replay the game.
+
+        Returns:
+            dict: The game's seed, the player names and the moves, as
+                (seat, status code, data) tuples in the order applied.
+        """
+        return {'seed': self.seed, 'usernames': list(self.usernames),
+                'moves': list(self.move_log)}
             
     def send_response(self, client_socket, uno_message):   
         """
@@ -199,29 +989,31 @@ class Server:
         """        
         r_dta = pickle.dumps(uno_message)
         print(f'SENDING : {uno_message.status_code}')
-        client_socket.send(r_dta)        
+        # Ping echoes are sent outside the game lock, so sends to a socket
+        # are serialized on their own
+        with self._send_lock:
+            client_socket.send(r_dta)        
         
     def handle_card_effects(self): 
         """
-        Handles special effects of the discarded card.
+        Handles the draw effects of the discarded card, Skip and Reverse
+        are applied to the turn by the shared rules.
         """        
         uno_card = self.top_discarded_card()
         
-        # Skip
-        if uno_card.type == CardType.SKIP:
-            self.calc_player_turn()
-            
-        # Reverse
-        if uno_card.type == CardType.REVERSE:
-            self.turn_increase *= -1
-            self.calc_player_turn()
-        
         # +2 Card
         if uno_card.type == CardType.DRAW_TWO:
             l = []
             c_s = self.players[self.player_turn]
+            self._record(EventType.EFFECT, self.player_turn, arg=2)
             for i in range(2):
-                l.append(self.draw_from_deck())
+                drawn = self.draw_from_deck()
+                if drawn is None:
+                    break
+                l.append(drawn)
+                self._record(EventType.DRAW, self.player_turn, l[-1],
+                             DrawReason.EFFECT)
+            self._deal(self.player_turn, l)
             uno_msg = UnoMessage(StatusCode.CARD_DRAW, l)
             self.send_response(c_s, uno_msg) 
             self.pending_acknoledgements.append(uno_msg)
@@ -231,8 +1023,15 @@ class Server:
         if uno_card.type == CardType.WILD_DRAW_FOUR:
             l = []
             c_s = self.players[self.player_turn]
+            self._record(EventType.EFFECT, self.player_turn, arg=4)
             for i in range(4):
-                l.append(self.draw_from_deck())
+                drawn = self.draw_from_deck()
+                if drawn is None:
+                    break
+                l.append(drawn)
+                self._record(EventType.DRAW, self.player_turn, l[-1],
+                             DrawReason.EFFECT)
+            self._deal(self.player_turn, l)
             uno_msg = UnoMessage(StatusCode.CARD_DRAW, l)
             self.send_response(c_s, uno_msg)  
             self.pending_acknoledgements.append(uno_msg)
@@ -249,23 +1048,137 @@ class Server:
         """
         Calculates the next player's turn.
         """        
-        self.player_turn += self.turn_increase
-        self.player_turn %= len(self.players)
+        self.player_turn = next_player(
+            self.player_turn, self.turn_increase, len(self.players))
         
     def draw_from_deck(self):
         """
         Draws a card from the Uno deck.
 
         Returns:
-            UnoCard: The drawn Uno card.
+            UnoCard: The drawn Uno card, None if every card but the top
+                discarded one is in the hands.
         """        
         if len(self._deck) == 0:
+            if len(self._discarded_pile) == 1:
+                return None
+
+            # Reshuffles the discard pile but its top card into the deck,
+            # wild cards lose the color picked for them
+            top_card = self._discarded_pile.pop()
             for card in self._discarded_pile:
+                if card.type in (CardType.WILD, CardType.WILD_DRAW_FOUR):
+                    card = UnoCard(card.type, CardColor.DARK)
                 self._deck.add(card)
+            self._discarded_pile = [top_card]
+            self._deck.shuffle()
+            self._record(EventType.RESHUFFLE, arg=len(self._deck))
         return self._deck.draw_card()
             
         
         
+class ResumeRouter:
+    """
+    Serves the players of every game recovered after a restart on one 
+    port. A player's first message must be a RESUME request, its token 
+    routes the connection to the game the seat belongs to.
+    """
+    ROUTE_TIMEOUT = 10
+
+    def __init__(self, server_address, port, servers):
+        """
+        Initializes a new ResumeRouter instance.
+
+        Args:
+            server_address (str): The IP address to bind the router.
+            port (int): The port the players reconnect to, 0 picks a free
+                one.
+            servers (list): The Servers of the recovered games.
+        """
+        self.servers = servers
+        host_address = Server.LOCAL_IP_ADDRESS
+        if not host_address == server_address:
+            host_address = '0.0.0.0'
+        
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.bind((host_address, port))
+        self.server_socket.listen()
+        self.port = self.server_socket.getsockname()[1]
+        print(f"\nResuming {len(servers)} games on {server_address}:{self.port}")
+
+    def run(self, deadline=Server.RESUME_DEADLINE):
+        """
+        Routes the reconnecting players until every seat is reclaimed or
+        the deadline passes. A game no player reclaimed by then is 
+        abandoned.
+
+        Args:
+            deadline (float, optional): Seconds the players have to 
+                reclaim their seats. Defaults to Server.RESUME_DEADLINE.
+        """
+        end = time.monotonic() + deadline
+        while any(server.awaits_players() for server in self.servers):
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            
+            self.server_socket.settimeout(min(remaining, 1.0))
+            try:
+                client_socket, addr = self.server_socket.accept()
+            except socket.timeout:
+                continue
+            print(f"Player reconnected from {addr}")
+            
+            # A connection that sends nothing does not hold up the others
+            client_handler = threading.Thread(
+                target=self.route, args=(client_socket,))
+            client_handler.start()
+        self.server_socket.close()
+        
+        for server in self.servers:
+            server.abandon_unclaimed()
+
+    def route(self, client_socket):
+        """
+        Reads the RESUME request of a reconnected player and hands the 
+        connection to the game its token belongs to, runs in the thread
+        that then handles the player's requests.
+
+        Args:
+            client_socket (socket): The socket of the reconnected player.
+        """
+        client_socket.settimeout(ResumeRouter.ROUTE_TIMEOUT)
+        received = b''
+        uno_msgs = []
+        try:
+            while not uno_msgs:
+                request = client_socket.recv(4096)
+                if not request:
+                    raise ConnectionError('Client closed the connection')
+                received += request
+                uno_msgs, _ = unpack_messages(received)
+        except (OSError, MalformedMessageError) as e:
+            print(f'Error routing a reconnected player: {e}')
+            client_socket.close()
+            return
+        
+        uno_msg = uno_msgs[0]
+        if uno_msg.status_code == StatusCode.RESUME:
+            for server in self.servers:
+                if (not server.game_abandoned and 
+                        server.seat_of_token(uno_msg.data) is not None):
+                    server.handle_client_requests(client_socket, received)
+                    return
+        
+        print('No seat to resume for the token received')
+        try:
+            client_socket.send(pickle.dumps(UnoMessage(
+                StatusCode.CONNECTION_FAILED, None,
+                getattr(uno_msg, 'request_id', None))))
+        except OSError as e:
+            print(f'Error refusing a reconnected player: {e}')
+        client_socket.close()
+
 def get_local_ipv4():
     """
     Retrieves the local IPv4 address.
@@ -296,6 +1209,8 @@ if __name__ == "__main__":
     The main block for configuring and running the Uno game server.
 
     - Sets the server address based on user input.
+    - Resumes the games interrupted by a restart, if any, on
+      Server.RESUME_PORT.
     - Prompts the user to input the number of players for the game.
     - Creates a Server and runs it.
     """    
@@ -318,6 +1233,17 @@ if __name__ == "__main__":
     else:
         host_address = local_ipv4
         
+    # Rebuilds the games the journal holds, their players reconnect to
+    # the resume port with the token of their seat
+    journal = GameJournal(Server.JOURNAL_DIR)
+    room_logs = journal.recover()
+    if room_logs:
+        servers = [Server.recover(room_log, host_address, journal,
+                                  turn_timeout=Server.TURN_TIMEOUT)
+                   for room_log in room_logs.values()]
+        router = ResumeRouter(host_address, Server.RESUME_PORT, servers)
+        threading.Thread(target=router.run).start()
+    
     # Sets the ammount of player that will play
     num_players = 0
     while num_players < 2 or num_players > 10:
@@ -325,5 +1251,7 @@ if __name__ == "__main__":
             '\nInput the amount of players(2-10) | inclusive: '))
     
     # Make a game instance, and run the game.
-    server = Server(host_address, 1234, num_players)
-    server.run()    
+    server = Server(host_address, 1234, num_players, journal=journal,
+                    turn_timeout=Server.TURN_TIMEOUT,
+                    spectator_port=Server.SPECTATOR_PORT)
+    server.run()
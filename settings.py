@@ -24,6 +24,13 @@ class Settings:
         """Initialize the game's settings."""
         
         self.SERVER_PORT = 1234
+        # Port a restarted server resumes the games in progress on
+        self.RESUME_PORT = 1240
+        
+        # Matchmaking (joins the lobby's queue instead of a server)
+        self.MATCHMAKING_ENABLED = False
+        self.LOBBY_PORT = 1233
+        self.TABLE_SIZE = 4
         
         # Screen settings
         self.TITLE = 'UNO Online'
@@ -36,6 +43,7 @@ class Settings:
         self.JOIN_BTN_INACTIVE_COLOR = (0, 204, 0, 255)
         self.JOIN_BTN_ACTIVE_COLOR = (0, 153, 0, 255)
         self.JOIN_BTN_TEXT_COLOR = (255, 255, 255, 255)
+        self.JOIN_BTN_FONT_SIZE = 35
         self.IP_TF_FONT_SIZE = 35
         self.IP_TF_WIDTH = self.IP_TF_FONT_SIZE * 8 # 8 seemed like a correct multiplier
         self.IP_TF_HEIGHT = 50
@@ -46,16 +54,19 @@ class Settings:
         
         # Font settings
         self.FONT_DIR = 'resources/arial.ttf'
-        self.CARD_CENTER_FONT_SIZE = 70
-        self.CARD_BACK_FONT_SIZE = 35
         #self.CARD_EDGE_FONT_SIZE = self.CARD_CENTER_FONT_SIZE - 10
         self.CARD_FONT_COLOR = (255, 255, 255) 
+        self.DIALOG_TITLE_FONT_SIZE = 50
+        self.DIALOG_FONT_SIZE = 35
 
-        # Card settings   
-        self.CARD_WIDTH = 120
-        self.CARD_HEIGHT = self.CARD_WIDTH * 1.5
-        self.CARD_INNER_WIDTH = self.CARD_WIDTH - 10
-        self.CARD_INNER_HEIGHT = self.CARD_HEIGHT - 15
+        # Card settings, at SCREEN_WIDTH x SCREEN_HEIGHT. The cards follow
+        # the size of the window, see set_display_size
+        self.BASE_CARD_WIDTH = 120 # card width the images were made for
+        self.LAYOUT_CARD_WIDTH = 120
+        self.LAYOUT_CARD_CENTER_FONT_SIZE = 70
+        self.LAYOUT_CARD_BACK_FONT_SIZE = 35
+        self.MIN_DISPLAY_SCALE = 0.5
+        self.set_display_size(self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
         #self.FONT_SIZE = 100
         self.FONT_COLOR = (255, 255, 255) 
         self.EDGE_CONTENT_RATIO = 0.4 
@@ -69,4 +80,46 @@ class Settings:
         self.PLAYER_LIST_FONT_SIZE = 30
         self.PLAYER_LIST_FONT_COLOR = (255, 255, 255)
         self.PLAYER_LIST_IN_TURN_COLOR = (0, 255, 0)
-        
\ No newline at end of file
+        
+        # Shows played cards before the server confirms them
+        self.OPTIMISTIC_PLAY = True
+        
+        # Card Animations (seconds)
+        self.ANIMATION_TIMESTEP = 1 / 120
+        self.CARD_MOVE_DURATION = 0.25
+        self.HAND_REFLOW_DURATION = 0.15
+        self.DEAL_STAGGER = 0.05
+        
+        # Frame Profiler (F3 toggles the overlay when enabled)
+        self.PROFILER_ENABLED = False
+        self.PROFILER_HISTORY = 240 # frames kept for the overlay graph
+        self.PROFILER_CSV_PATH = None # e.g. 'frame_trace.csv'
+        self.PROFILER_FONT_SIZE = 14
+        
+        
+        # Connection Statistics (F4 toggles the overlay)
+        self.PING_INTERVAL = 2.0 # seconds between RTT probes, None disables
+        self.NETWORK_OVERLAY_ENABLED = False
+        self.NETWORK_OVERLAY_FONT_SIZE = 14
+
+    def set_display_size(self, width, height):
+        """
+        Sizes the cards and their fonts for a display, in proportion to
+        how it compares to the SCREEN_WIDTH x SCREEN_HEIGHT layout.
+
+        Args:
+            width (int): Width of the display surface.
+            height (int): Height of the display surface.
+        """
+        self.DISPLAY_SCALE = max(self.MIN_DISPLAY_SCALE, min(
+            width / self.SCREEN_WIDTH, height / self.SCREEN_HEIGHT))
+        
+        self.CARD_WIDTH = round(self.LAYOUT_CARD_WIDTH * self.DISPLAY_SCALE)
+        self.CARD_SCALE = self.CARD_WIDTH / self.BASE_CARD_WIDTH
+        self.CARD_HEIGHT = self.CARD_WIDTH * 1.5
+        self.CARD_INNER_WIDTH = self.CARD_WIDTH - 10
+        self.CARD_INNER_HEIGHT = self.CARD_HEIGHT - 15
+        self.CARD_CENTER_FONT_SIZE = round(
+            self.LAYOUT_CARD_CENTER_FONT_SIZE * self.DISPLAY_SCALE)
+        self.CARD_BACK_FONT_SIZE = round(
+            self.LAYOUT_CARD_BACK_FONT_SIZE * self.DISPLAY_SCALE)
@@ -0,0 +1,337 @@
+"""
+Spectator fan-out for UNO Online.
+
+Spectators connect to a room's spectator port and receive the GAME_STATE
+stream of the players, after a snapshot of the game when they join
+mid-game. The game thread only serializes each update once
+and hands the shared buffer over; a separate thread writes it to every
+spectator with non-blocking sockets, so slow spectators never delay the
+players. A spectator that falls more than MAX_LAG updates behind skips
+to the latest state, and one that stops reading is disconnected.
+
+Usage:
+    python spectators.py HOST [--port 1235]
+"""
+import argparse
+import pickle
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from status_code import StatusCode, unpack_messages
+
+class _Spectator:
+    """
+    A spectator connection and the updates not yet written to it.
+    """
+    __slots__ = ('sock', 'outbox', 'offset', 'dropped', 'last_progress')
+
+    def __init__(self, sock, now):
+        self.sock = sock
+        self.outbox = deque()
+        self.offset = 0
+        self.dropped = 0
+        self.last_progress = now
+
+class SpectatorFanout:
+    """
+    Serves the spectators of a room from a single thread with one
+    selector.
+    """
+    MAX_LAG = 8
+    STALL_TIMEOUT = 10.0
+
+    def __init__(self, host_address, port):
+        """
+        Initializes a new SpectatorFanout instance and starts its thread.
+
+        Args:
+            host_address (str): The IP address to bind the spectator port.
+            port (int): The spectator port, 0 picks a free one.
+        """
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind((host_address, port))
+        self._listener.listen()
+        self._listener.setblocking(False)
+        self.port = self._listener.getsockname()[1]
+
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+
+        self._lock = threading.Lock()
+        self._updates = []
+        self._snapshot = None
+        self._snapshot_data = None
+        self._spectators = {}
+        self._closing = False
+
+        self.updates_published = 0
+        self.bytes_sent = 0
+        self.updates_dropped = 0
+        self.lag_disconnects = 0
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        print(f'Spectators can watch on port {self.port}')
+
+    def publish(self, uno_message, snapshot=None):
+        """
+        Serializes an update once and queues it for every spectator, runs
+        in the game thread and does not wait for the spectators.
+
+        Args:
+            uno_message (UnoMessage): The update, a GAME_STATE.
+            snapshot (UnoMessage, optional): The GAME_SNAPSHOT of the game
+                after the update, sent to the spectators joining next. It
+                is serialized on the first join only.
+        """
+        data = pickle.dumps(uno_message)
+        with self._lock:
+            self._updates.append(data)
+            if snapshot is not None:
+                self._snapshot = snapshot
+                self._snapshot_data = None
+            self.updates_published += 1
+        self._wake()
+
+    def _wake(self):
+        """
+        Interrupts the fan-out thread's select call.
+        """
+        try:
+            self._wakeup_w.send(b'\0')
+        except BlockingIOError:
+            pass # a wake-up is already pending
+
+    def _run(self):
+        """
+        Accepts spectators and writes the updates to them, runs in the
+        fan-out thread.
+        """
+        while True:
+            for key, mask in self._selector.select(1.0):
+                if key.fileobj is self._listener:
+                    self._accept()
+                elif key.fileobj is self._wakeup_r:
+                    self._drain_wakeups()
+                    self._distribute()
+                else:
+                    spectator = key.data
+                    if mask & selectors.EVENT_READ:
+                        self._read(spectator)
+                    connected = spectator.sock in self._spectators
+                    if mask & selectors.EVENT_WRITE and connected:
+                        self._flush(spectator)
+
+            now = time.monotonic()
+            for spectator in list(self._spectators.values()):
+                if (spectator.outbox and
+                        now - spectator.last_progress > self.STALL_TIMEOUT):
+                    self.lag_disconnects += 1
+                    self._drop(spectator)
+
+            # Leaves once the last updates reached the spectators
+            if self._closing and not any(
+                    s.outbox for s in self._spectators.values()):
+                break
+
+        for spectator in list(self._spectators.values()):
+            self._drop(spectator)
+        self._selector.close()
+        self._listener.close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+
+    def _drain_wakeups(self):
+        """
+        Empties the wake-up socket.
+        """
+        try:
+            while self._wakeup_r.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _accept(self):
+        """
+        Accepts a spectator and sends it the snapshot of the game, the
+        updates published after it follow.
+        """
+        try:
+            sock, addr = self._listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+
+        # The updates the snapshot already covers go to the others only
+        self._distribute()
+        spectator = _Spectator(sock, time.monotonic())
+        self._spectators[sock] = spectator
+        self._selector.register(sock, selectors.EVENT_READ, spectator)
+
+        data = self._snapshot_bytes()
+        if data is not None:
+            self._enqueue(spectator, data)
+            self._flush(spectator)
+
+    def _snapshot_bytes(self):
+        """
+        Returns the serialized snapshot of the game, serializing it once
+        for all the spectators joining before the next update.
+
+        Returns:
+            bytes: The pickled GAME_SNAPSHOT, None before the first one.
+        """
+        with self._lock:
+            snapshot, data = self._snapshot, self._snapshot_data
+        if snapshot is None or data is not None:
+            return data
+
+        data = pickle.dumps(snapshot)
+        with self._lock:
+            if self._snapshot is snapshot:
+                self._snapshot_data = data
+        return data
+
+    def _distribute(self):
+        """
+        Queues the published updates for every spectator and writes what
+        the sockets accept.
+        """
+        with self._lock:
+            updates, self._updates = self._updates, []
+        if not updates:
+            return
+
+        for spectator in list(self._spectators.values()):
+            for data in updates:
+                self._enqueue(spectator, data)
+            self._flush(spectator)
+
+    def _enqueue(self, spectator, data):
+        """
+        Queues an update for a spectator. A spectator MAX_LAG updates
+        behind skips the states queued after the one being written, the
+        new state supersedes them.
+        """
+        outbox = spectator.outbox
+        if not outbox:
+            # The stall clock starts with the first update waiting
+            spectator.last_progress = time.monotonic()
+        elif len(outbox) >= self.MAX_LAG:
+            keep = 1 if spectator.offset else 0
+            dropped = len(outbox) - keep
+            while len(outbox) > keep:
+                outbox.pop()
+            spectator.dropped += dropped
+            self.updates_dropped += dropped
+        outbox.append(data)
+
+    def _flush(self, spectator):
+        """
+        Writes as much of a spectator's queued updates as its socket
+        accepts, waiting for the socket to be writable for the rest.
+        """
+        outbox = spectator.outbox
+        try:
+            while outbox:
+                head = outbox[0]
+                sent = spectator.sock.send(memoryview(head)[spectator.offset:])
+                self.bytes_sent += sent
+                spectator.offset += sent
+                spectator.last_progress = time.monotonic()
+                if spectator.offset < len(head):
+                    break
+                outbox.popleft()
+                spectator.offset = 0
+        except BlockingIOError:
+            pass
+        except OSError:
+            self._drop(spectator)
+            return
+
+        events = selectors.EVENT_READ
+        if outbox:
+            events |= selectors.EVENT_WRITE
+        self._selector.modify(spectator.sock, events, spectator)
+
+    def _read(self, spectator):
+        """
+        Discards what a spectator sends, detecting its disconnection.
+        """
+        try:
+            data = spectator.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self._drop(spectator)
+
+    def _drop(self, spectator):
+        """
+        Closes a spectator's connection.
+        """
+        self._spectators.pop(spectator.sock, None)
+        try:
+            self._selector.unregister(spectator.sock)
+        except (KeyError, ValueError):
+            pass
+        spectator.sock.close()
+
+    def close(self):
+        """
+        Stops accepting spectators, the fan-out thread leaves once the last
+        updates are written. Does not wait.
+        """
+        self._closing = True
+        self._wake()
+
+    def stats(self):
+        """
+        Returns the fan-out counters.
+
+        Returns:
+            dict: Spectators connected, updates published and dropped,
+                bytes sent and spectators disconnected for lagging.
+        """
+        return {
+            'spectators': len(self._spectators),
+            'updates_published': self.updates_published,
+            'updates_dropped': self.updates_dropped,
+            'bytes_sent': self.bytes_sent,
+            'lag_disconnects': self.lag_disconnects,
+        }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Watch an UNO Online game.')
+    parser.add_argument('host', help='Address of the Uno server')
+    parser.add_argument('--port', type=int, default=1235,
+                        help='Spectator port of the game')
+    args = parser.parse_args()
+
+    with socket.create_connection((args.host, args.port)) as sock:
+        buffer = b''
+        while True:
+            data = sock.recv(4096)
+            if not data:
+                break
+            uno_msgs, buffer = unpack_messages(buffer + data)
+            for uno_msg in uno_msgs:
+                if uno_msg.status_code == StatusCode.GAME_SNAPSHOT:
+                    hand_sizes, deck_size = uno_msg.data[5:7]
+                    print(f'Joined the game, hands {hand_sizes}, '
+                          f'{deck_size} cards in the deck')
+                elif uno_msg.status_code != StatusCode.GAME_STATE:
+                    continue
+                player_turn, names, top_card, game_won = uno_msg.data[:4]
+                print(f'{names[player_turn]} in turn, top card '
+                      f'{top_card.type.name} {top_card.color.name}')
+                if game_won:
+                    print(f'{names[player_turn]} won the game')
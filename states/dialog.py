@@ -34,7 +34,7 @@ class DialogScreen(Screen):
             text,
             self.settings.CARD_FONT_COLOR,
             self.settings.FONT_DIR,
-            50)   
+            self.settings.DIALOG_TITLE_FONT_SIZE)   
         self._title_rect = self._title.get_rect()
         self.organize_content()  
         
@@ -82,6 +82,13 @@ class DialogScreen(Screen):
                 button.rect.left = offset_x
                 offset_x = button.rect.right + margin
             
+    def resize(self):
+        """
+        Centers the dialog's content again in the resized window.
+        """
+        super().resize()
+        self.organize_content()
+
     def update(self):
         """
         Placeholder for any update logic needed for the dialog screen.
@@ -112,6 +119,21 @@ class DialogScreen(Screen):
         for button in self._buttons:            
             button.handle_event(event) 
         
+    def update_status_msg(self, status_msg):
+        """
+        Updates the content of the dialog screen with a new status message.
+
+        Args:
+            status_msg (str): The new status message to be displayed.
+        """        
+        new_content = self.resource_manager.render_font(
+            status_msg,
+            self.settings.CARD_FONT_COLOR,
+            self.settings.FONT_DIR,
+            self.settings.DIALOG_FONT_SIZE)
+        
+        self.set_content(new_content)
+        
 class ServerConnectionDialog(DialogScreen):
     """
     A specialized dialog screen for handling server connection attempts in a game.
@@ -142,7 +164,7 @@ class ServerConnectionDialog(DialogScreen):
             "Back",
             game_instance.settings.JOIN_BTN_TEXT_COLOR,
             game_instance.settings.FONT_DIR,
-            35)
+            game_instance.settings.JOIN_BTN_FONT_SIZE)
         btn_back = Button(
             btn_back_x, btn_back_y, btn_back_w, btn_back_h,
             btn_back_text_surface, game_instance.settings.JOIN_BTN_INACTIVE_COLOR,
@@ -152,8 +174,13 @@ class ServerConnectionDialog(DialogScreen):
         
         self.set_buttons(btn_back)
         
-        # Attempt connection to server
-        game_instance.client.connect_to_server(server_address, server_port)
+        # Attempt connection to server, or to the matchmaking lobby
+        settings = game_instance.settings
+        if settings.MATCHMAKING_ENABLED:
+            game_instance.client.connect_to_matchmaking(
+                server_address, settings.LOBBY_PORT, settings.TABLE_SIZE)
+        else:
+            game_instance.client.connect_to_server(server_address, server_port)
         
     def back_event(self):
         """
@@ -176,25 +203,73 @@ class ServerConnectionDialog(DialogScreen):
            elif r.status_code == StatusCode.CONNECTION_SUCCESS:
                msg = "Connection successful. Waiting for other players to join..."
                self.update_status_msg(msg)
+           elif r.status_code == StatusCode.MATCH_QUEUED:
+               position, depth = r.data
+               self.update_status_msg(
+                   f"In queue for a table: {position} of {depth} waiting...")
+           elif r.status_code == StatusCode.MATCH_FOUND:
+               self.update_status_msg("Table found, joining the game...")
            elif r.status_code == StatusCode.GAME_START:
                self.start_screen.go_to_play_screen()
         
-        
-    def update_status_msg(self, status_msg):
+
+class ReconnectDialog(DialogScreen):
+    """
+    A dialog shown over the play screen when the connection to the server
+    is lost, it reclaims the player's seat once the server is back.
+    """
+    def __init__(self, game_instance, screen):
         """
-        Updates the content of the dialog screen with a new status message.
+        Initializes a new instance of the ReconnectDialog class.
 
         Args:
-            status_msg (str): The new status message to be displayed.
-        """        
-        new_content = self.resource_manager.render_font(
-            status_msg,
-            self.settings.CARD_FONT_COLOR,
-            self.settings.FONT_DIR,
-            35)
+            game_instance (GameInstance): An instance of the game.
+            screen (Screen): The play screen of the game in progress.
+        """
+        super().__init__(game_instance)
+        self.set_background_color((0, 0, 0, 230))
+        self.play_screen = screen
         
-        self.set_content(new_content)
+        self.set_title("Connection lost")
+        self.update_status_msg("Reconnect once the server is back.")
+        
+        # Create "Reconnect" button
+        btn_text_surface = self.resource_manager.render_font(
+            "Reconnect",
+            self.settings.JOIN_BTN_TEXT_COLOR,
+            self.settings.FONT_DIR,
+            self.settings.JOIN_BTN_FONT_SIZE)
+        btn_reconnect = Button(
+            0, 0, 160, 50,
+            btn_text_surface, self.settings.JOIN_BTN_INACTIVE_COLOR,
+            self.settings.JOIN_BTN_ACTIVE_COLOR)
+        btn_reconnect.set_on_click_callback(self.reconnect_event)
         
+        self.set_buttons(btn_reconnect)
+        self._reconnecting = False
+
+    def reconnect_event(self):
+        """
+        Event handler for the "Reconnect" button, reconnects to the 
+        server's resume port with the token of the player's seat.
+        """
+        # Hidden buttons still take clicks
+        if self._reconnecting:
+            return
+        self._reconnecting = True
+        self._buttons[0].set_visibility(False)
+        self.update_status_msg("Reconnecting...")
+        client = self.game_instance().client
+        client.resume_game(client.server_address, self.settings.RESUME_PORT)
+
+    def reconnect_failed(self):
+        """
+        Lets the player try again after the seat could not be reclaimed.
+        """
+        self._reconnecting = False
+        self._buttons[0].set_visibility(True)
+        self.update_status_msg("Reconnection failed, try again.")
+
 class ColorPickerDialog(DialogScreen):
     """
     A dialog for managing color picking in a game.
@@ -217,7 +292,7 @@ class ColorPickerDialog(DialogScreen):
             'Choose the color to change the card to',
             self.settings.CARD_FONT_COLOR,
             self.settings.FONT_DIR,
-            35)
+            self.settings.DIALOG_FONT_SIZE)
 
         self.set_content(new_content)
 
@@ -324,7 +399,7 @@ class GameEndingDialog(DialogScreen):
             f'{winner} was the winner',
             self.settings.CARD_FONT_COLOR,
             self.settings.FONT_DIR,
-            35)
+            self.settings.DIALOG_FONT_SIZE)
         
         self.set_content(content)
             
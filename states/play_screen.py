@@ -1,11 +1,13 @@
 import pygame
 from states.screen import Screen
-from states.dialog import ColorPickerDialog, GameEndingDialog
+from states.dialog import ColorPickerDialog, GameEndingDialog, ReconnectDialog
 from card_collections import UnoHand
-from card import CardColor, UnoCard
-from card_builder_director import UnoCardViewBuilder, UnoCardViewDirector
+from card import CardColor, CardType, UnoCard
 from status_code import StatusCode
-from views import VerticalListView
+from views import PlayerListView
+from hit_testing import CardInputRouter
+from animation import Animator
+from rules import card_matches_discard, turn_after_play
 
 class PlayScreen(Screen):
     """Represents the play screen when the playing happens"""
@@ -25,9 +27,25 @@ class PlayScreen(Screen):
         self.discard_card = None
         self.wild_type = None
         self.player_list = None
+        self._played_card_pos = None
+        self.game_ended = False
+        self._optimistic_play = None
+        # Cards played and not answered yet, by request id
+        self._pending_plays = {}
+        self._reconnect_dialog = None
+        self._player_names = []
+        self._player_turn_idx = 0
+        self._turn_increase = 1
         self.settings = game_instance.settings
         self.resource_manager = game_instance.resource_manager
         self.client = game_instance.client
+        self._response_handlers = {
+            StatusCode.CARD_DRAW: self._on_card_draw,
+            StatusCode.GAME_STATE: self._on_game_state,
+            StatusCode.MOVE_REJECTED: self._on_move_rejected,
+            StatusCode.GAME_SNAPSHOT: self._on_game_snapshot,
+            StatusCode.CONNECTION_FAILED: self._on_connection_failed,
+        }
         
         # Request initial cards from server
         self.client.request_initial_cards()
@@ -40,22 +58,40 @@ class PlayScreen(Screen):
         bg_color = self.settings.PLAY_SCREEN_BG_COLOR
         self.set_background_color(bg_color)
         
-        # Loads all card images
-        for img in self.settings.ImageResources:
-            self.resource_manager.add_image(img, pygame.image.load(img.value))
+        # Waits for any card image or font that is not preloaded yet
+        game_instance.preloader.finish()
         
-        self.card_builder = UnoCardViewBuilder()
-        self.card_director = UnoCardViewDirector(
-            self.card_builder,
-            self.resource_manager,
-            self.settings)
+        self.card_pool = game_instance.card_pool
+        self.card_director = self.card_pool.director
         
+        self.animator = Animator(self.settings.ANIMATION_TIMESTEP)
+        self._create_hand([])
+        self._create_deck()
+        
+    def _create_hand(self, card_views):
+        """
+        Creates the hand along the bottom of the screen, and the input
+        router of its cards.
+
+        Args:
+            card_views (list): The card views the hand starts with.
+        """
         self._hand = UnoHand(
-            pygame.sprite.Group(),
+            pygame.sprite.Group(*card_views),
             self.rect.left,
-            self.rect.bottom)        
-        
-        # Creates card view for the deck
+            self.rect.bottom,
+            self.rect.width,
+            self.animator,
+            self.settings.HAND_REFLOW_DURATION)
+        self._hand.organize_cards()
+        self._hand_layout_version = None
+        self._card_input = CardInputRouter(
+            self._hand, self.settings.CARD_WIDTH)
+    
+    def _create_deck(self):
+        """
+        Creates the card view of the deck, left of the screen's center.
+        """
         turned_over_card_v = self.resource_manager.render_font(
             "UNO",
             self.settings.CARD_FONT_COLOR,
@@ -73,6 +109,28 @@ class PlayScreen(Screen):
         self._deck.rect.bottom = self.rect.centery 
         self._deck.rect.right = self.rect.centerx - 20
         
+    def resize(self):
+        """
+        Lays the play screen out again in the resized window, with the 
+        cards redrawn at the card size of the new window.
+        """
+        super().resize()
+        self.grabbed_card = None
+        self._played_card_pos = None
+        
+        # Views of the old size are discarded by the card pool
+        uno_cards = []
+        for card_view in self._hand.clear():
+            uno_cards.append(card_view.uno_card)
+            self.release_card_view(card_view)
+        self._create_hand([self.card_pool.acquire(c) for c in uno_cards])
+        self._create_deck()
+        
+        if self.discard_card:
+            top_card = self.discard_card.uno_card
+            self.release_card_view(self.discard_card)
+            self.discard_card = self.card_pool.acquire(top_card)
+            self.reset_discard_pos()
             
     def _check_events(self, event):
         """
@@ -81,8 +139,7 @@ class PlayScreen(Screen):
         Args:
             event (Event): The event to be processed.
         """
-        for card in self._hand.cards:
-            card.handle_event(event)
+        self._card_input.handle_event(event)
             
         # if deck is touched request card from server 
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -99,11 +156,12 @@ class PlayScreen(Screen):
         """
         Updates the Play Screen, handling server responses, card movements, and turn actions.
         """
-        self.handle_server_responses()
+        with self.game_instance().profiler.section('network', 'PlayScreen'):
+            self.handle_server_responses()
         
-        for card in self._hand.cards:
-            if card.grabbed:
-                self.grabbed_card = card
+        if self._card_input.grabbed_card:
+            self.grabbed_card = self._card_input.grabbed_card
+            self.animator.cancel(self.grabbed_card)
 
         # If the grabbed_card was dropped
         if (self.grabbed_card and not self.grabbed_card.grabbed):
@@ -113,9 +171,9 @@ class PlayScreen(Screen):
             # If card was dropped on the discard pile
             if (self.in_turn and self.discard_card and card_collision and
                 self.card_matches_discard(self.grabbed_card)):
-                self._hand.cards.remove(self.grabbed_card)
-                self._hand.x = 0
-                self._hand.organize_cards()
+                self._played_card_pos = self.grabbed_card.rect.topleft
+                self._hand.scroll_offset = 0
+                self._hand.remove_card(self.grabbed_card)
                 
                 if self.grabbed_card.uno_card.color == CardColor.DARK:
                     self.wild_type = self.grabbed_card.uno_card.type
@@ -124,29 +182,35 @@ class PlayScreen(Screen):
                 else:
                     self.play_card(self.grabbed_card.uno_card)
                     self.finish_turn()
+                self.release_card_view(self.grabbed_card)
                 
             else:
-                self.grabbed_card.reset_pos()
+                self.animator.move(self.grabbed_card,
+                                   self.grabbed_card.initial_pos,
+                                   self.settings.CARD_MOVE_DURATION)
                 
             self.grabbed_card = None
                 
         
-        # Manages Hand Movement
-        if len(self._hand.cards) > 9 and not self.grabbed_card:
-            last_card_in_hand = self._hand.cards.sprites()[-1]
-            first_card_in_hand = self._hand.cards.sprites()[0]
+        # Manages Hand Movement, the hand clamps its own scroll offset
+        if not self.grabbed_card:
             r_movement_trigger_x = self.rect.right - self.rect.width / 8
             l_movement_trigger_x = self.rect.left + self.rect.width / 8
             
             # Move to the right until last card completely visible
-            if (self.mouse_x > r_movement_trigger_x and
-                last_card_in_hand.rect.right > self.rect.right):
-                self._hand.x -= 6         
+            if self.mouse_x > r_movement_trigger_x:
+                self._hand.scroll_offset += 6         
 
-            # Move to the right until last card completely visible
-            if (self.mouse_x < l_movement_trigger_x and
-                first_card_in_hand.rect.left < self.rect.left):
-                self._hand.x += 6
+            # Move to the left until first card completely visible
+            if self.mouse_x < l_movement_trigger_x:
+                self._hand.scroll_offset -= 6
+                
+        if self._hand_layout_version != self._hand.layout_version:
+            self._hand_layout_version = self._hand.layout_version
+            self.invalidate()
+        
+        if self.animator.update():
+            self.invalidate()
                 
     def reset_discard_pos(self):
         """
@@ -155,6 +219,24 @@ class PlayScreen(Screen):
         self.discard_card.rect.bottom = self.rect.centery
         self.discard_card.rect.left = self.rect.centerx + 20
         
+    def animate_discard(self):
+        """
+        Slides the discard pile's card into place, from where it was 
+        dropped if it was played by this client or from the top of the 
+        screen otherwise.
+        """
+        self.reset_discard_pos()
+        discard_pos = self.discard_card.rect.topleft
+        
+        if self._played_card_pos:
+            self.discard_card.rect.topleft = self._played_card_pos
+            self._played_card_pos = None
+        else:
+            self.discard_card.rect.bottom = self.rect.top
+        
+        self.animator.move(self.discard_card, discard_pos,
+                           self.settings.CARD_MOVE_DURATION)
+        
     def blit(self):
         """
         Draws the Play screen, including the discard pile, 
@@ -172,50 +254,236 @@ class PlayScreen(Screen):
         
     def handle_server_responses(self):        
         """
-        Handles responses received from the game server, 
-        updating the game state accordingly.
+        Handles every response received from the game server since the 
+        last frame, updating the game state accordingly.
         """         
-        # Updates connection status message once connection response received
-        if self.game_instance().client.response_received():
-            u_response = self.game_instance().client.get_response()
-            r_status_code = u_response.status_code
-            r_dta = u_response.data
+        for u_response in self.client.drain_responses():
+            handler = self._response_handlers.get(u_response.status_code)
+            if handler:
+                self.invalidate()
+                handler(u_response)
             
-                    
-            if r_status_code == StatusCode.CARD_DRAW:
-                for c in r_dta:
-                    card_view = self.card_director.create_card_view(c)
-                    self._hand.add_card(card_view)     
-
-                
-            if r_status_code == StatusCode.GAME_STATE:
-                player_in_turn_idx = r_dta[0]
-                player_list = r_dta[1]
-                player_in_turn = player_list[player_in_turn_idx]
-                
-                if player_in_turn == self.client.name:
-                    self.in_turn = True   
-                    
-                print(f' PLAYER IN TURN : {player_in_turn}')
-                print(f' CLIENT NAME: {self.client.name}')
-                print(f' IN TURN: {self.in_turn}')    
-                print(f' {r_dta[3]}')                  
-                
-                self.set_player_list(player_list, player_in_turn)
-                
-                card_view = self.card_director.create_card_view(r_dta[2])
-                self.discard_card = card_view
-                self.reset_discard_pos()
-                
+            # The play screen is gone once the game ended
+            if self.game_ended:
+                break
+        
+        # Rolls back the plays the server will never answer
+        for request_id, (uno_card, future) in list(self._pending_plays.items()):
+            if future.done() and future.exception():
+                self._settle_play(request_id, accepted=False)
+        
+        # Offers to reclaim the seat once the server is back
+        if (not self.client.is_connected and not self.game_ended and
+                self._reconnect_dialog is None):
+            self._reconnect_dialog = ReconnectDialog(
+                self.game_instance(), self)
+            self.game_instance().append_screen(self._reconnect_dialog)
                 
-                game_won = r_dta[3]
-                if game_won:
-                    ged = GameEndingDialog(self.game_instance(), 
-                                           self.client.name,
-                                           player_in_turn)
-                    self.game_instance().transition_to(ged)   
+    def _on_card_draw(self, u_response):
+        """
+        Adds the cards drawn from the server to the hand.
+
+        Args:
+            u_response (UnoMessage): Message holding the drawn UnoCards.
+        """
+        r_dta = u_response.data
+        # Drawn cards are dealt from the deck one after the other
+        for i, c in enumerate(r_dta):
+            card_view = self.card_pool.acquire(c)
+            card_view.rect.topleft = self._deck.rect.topleft
+            self._hand.add_card(card_view)
+            # Retargets the reflow of the hand with the deal's timing
+            if card_view in self._hand.visible_cards:
+                self.animator.move(
+                    card_view, card_view.initial_pos,
+                    self.settings.CARD_MOVE_DURATION,
+                    delay=i * self.settings.DEAL_STAGGER)
+
+    def _on_game_state(self, u_response):
+        """
+        Updates the turn, player list and discard pile from the server's 
+        game state, reconciling it with an optimistic play.
+
+        Args:
+            u_response (UnoMessage): Message holding the player in turn 
+                index, player names, top discarded card, whether the game 
+                was won and the direction of play.
+        """
+        r_dta = u_response.data
+        
+        if self._optimistic_play:
+            uno_card, future = self._optimistic_play
+            
+            # States sent before the play keep the optimistic view
+            if u_response.request_id != future.request_id:
+                return
+        
+        # The state answering a play confirms it
+        if u_response.request_id in self._pending_plays:
+            self._settle_play(u_response.request_id, accepted=True)
+        
+        player_in_turn_idx = r_dta[0]
+        player_list = r_dta[1]
+        player_in_turn = player_list[player_in_turn_idx]
+        
+        # The server may also end a turn when its timer expires
+        self.in_turn = player_in_turn == self.client.name
+            
+        print(f' PLAYER IN TURN : {player_in_turn}')
+        print(f' CLIENT NAME: {self.client.name}')
+        print(f' IN TURN: {self.in_turn}')    
+        print(f' {r_dta[3]}')                  
+        
+        self.set_player_list(player_list, player_in_turn)
+        self._player_names = player_list
+        self._player_turn_idx = player_in_turn_idx
+        self._turn_increase = r_dta[4] if len(r_dta) > 4 else 1
+        
+        self.show_discard(r_dta[2])
+        
+        game_won = r_dta[3]
+        if game_won:
+            self.game_ended = True
+            self.release_card_views()
+            ged = GameEndingDialog(self.game_instance(), 
+                                   self.client.name,
+                                   player_in_turn)
+            self.game_instance().transition_to(ged)   
                         
 
+    def _on_move_rejected(self, u_response):
+        """
+        Takes back a card the server did not accept and shows the game
+        state it sent.
+
+        Args:
+            u_response (UnoMessage): Message holding the unchanged game
+                state.
+        """
+        if u_response.request_id in self._pending_plays:
+            self._settle_play(u_response.request_id, accepted=False)
+        self._on_game_state(u_response)
+
+    def _on_game_snapshot(self, u_response):
+        """
+        Rebuilds the hand and the game state from the snapshot the server
+        sends when the player reclaims its seat, and closes the reconnect
+        dialog.
+
+        Args:
+            u_response (UnoMessage): Message holding the game state fields,
+                the number of cards of every seat, the number of cards in
+                the deck and the player's hand.
+        """
+        r_dta = u_response.data
+        self._optimistic_play = None
+        self._pending_plays.clear()
+        self.release_card_views()
+        for c in r_dta[7]:
+            self._hand.add_card(self.card_pool.acquire(c))
+        self._on_game_state(u_response)
+        
+        if self._reconnect_dialog:
+            self.game_instance().pop_screen()
+            self._reconnect_dialog = None
+
+    def _on_connection_failed(self, u_response):
+        """
+        Lets the player try to reconnect again.
+
+        Args:
+            u_response (UnoMessage): The CONNECTION_FAILED message.
+        """
+        if self._reconnect_dialog:
+            self._reconnect_dialog.reconnect_failed()
+
+    def _settle_play(self, request_id, accepted):
+        """
+        Forgets a play the server answered, returning its card to the hand
+        if it was not accepted.
+
+        Args:
+            request_id (int): Id of the play request.
+            accepted (bool): Whether the server applied the play.
+        """
+        uno_card, future = self._pending_plays.pop(request_id)
+        if self._optimistic_play and self._optimistic_play[1] is future:
+            self._optimistic_play = None
+        if not accepted:
+            self._roll_back_play(uno_card)
+
+    def show_discard(self, top_card):
+        """
+        Shows a card on the discard pile, sliding it in if it replaces 
+        another card.
+
+        Args:
+            top_card (UnoCard): The top card of the discard pile.
+        """
+        if not self.discard_card:
+            self.discard_card = self.card_pool.acquire(top_card)
+            self.reset_discard_pos()
+        elif (self.discard_card.type != top_card.type or
+              self.discard_card.color != top_card.color):
+            self.release_card_view(self.discard_card)
+            self.discard_card = self.card_pool.acquire(top_card)
+            self.animate_discard()
+            
+    def _play_optimistically(self, uno_card, future):
+        """
+        Shows a played card on the discard pile and the predicted next 
+        player before the server confirms the play.
+
+        Args:
+            uno_card (UnoCard): The card played.
+            future (Future): The pending play request.
+        """
+        self._optimistic_play = (uno_card, future)
+        self.show_discard(uno_card)
+        
+        if self._player_names and self.player_list:
+            next_idx, _ = turn_after_play(
+                uno_card, self._player_turn_idx, self._turn_increase,
+                len(self._player_names))
+            self.player_list.set_highlight(self._player_names[next_idx])
+        self.invalidate()
+        
+    def _roll_back_play(self, uno_card):
+        """
+        Returns a card the server did not accept to the hand.
+
+        Args:
+            uno_card (UnoCard): The card that was played.
+        """
+        print(f'Card play rolled back: {uno_card.type} {uno_card.color}')
+        
+        # Wild cards go back to the hand without their chosen color
+        if uno_card.type in (CardType.WILD, CardType.WILD_DRAW_FOUR):
+            uno_card = UnoCard(uno_card.type, CardColor.DARK)
+        self._hand.add_card(self.card_pool.acquire(uno_card))
+        self.invalidate()
+
+    def release_card_views(self):
+        """
+        Gives every card view of the play screen back to the card pool.
+        """
+        for card_view in self._hand.clear():
+            self.release_card_view(card_view)
+        
+        if self.discard_card:
+            self.release_card_view(self.discard_card)
+            self.discard_card = None
+            
+    def release_card_view(self, card_view):
+        """
+        Stops a card view's animation and gives it back to the card pool.
+
+        Args:
+            card_view (UnoCardView): The card view no longer displayed.
+        """
+        self.animator.cancel(card_view)
+        self.card_pool.release(card_view)
+
     def card_matches_discard(self, card):
         """
         Checks if the provided card matches the discard pile's criteria for play.
@@ -226,9 +494,7 @@ class PlayScreen(Screen):
         Returns:
             bool: True if the card matches the criteria, False otherwise.
         """          
-        return (card.type == self.discard_card.type or
-            card.color == self.discard_card.color or
-            card.color == CardColor.DARK)
+        return card_matches_discard(card, self.discard_card)
     
     def finish_turn(self):
         """
@@ -259,7 +525,11 @@ class PlayScreen(Screen):
         if not self._hand.cards.sprites():
             winning_card = True
             
-        self.client.request_card_play(uno_card, winning_card)
+        future = self.client.request_card_play(uno_card, winning_card)
+        self._pending_plays[future.request_id] = (uno_card, future)
+        
+        if self.settings.OPTIMISTIC_PLAY:
+            self._play_optimistically(uno_card, future)
         
     def set_player_list(self, names, player_in_turn):
         """
@@ -270,28 +540,34 @@ class PlayScreen(Screen):
             names (list): List of player names.
             player_in_turn (str): The player whose turn it is.
         """          
-        font_size = self.settings.PLAYER_LIST_FONT_SIZE
-        text_color = None
+        if not self.player_list:
+            self.player_list = PlayerListView(
+                self.rect.x, self.rect.y, self._render_player_name)
         
-        self.player_list = VerticalListView(self.rect.x, self.rect.y)  
+        self.player_list.set_players(names)
+        self.player_list.set_highlight(player_in_turn)
         
-        for n in names:
-            
-            if n == player_in_turn:
-                text_color = self.settings.PLAYER_LIST_IN_TURN_COLOR
-            else:
-                text_color = self.settings.PLAYER_LIST_FONT_COLOR
-            
-            if n == self.client.name:
-                n += '(You)'
-            
-            text_surface = self.resource_manager.render_font(
-                n,
-                text_color,
-                self.settings.FONT_DIR,
-                font_size)
-            self.player_list.append(text_surface)
-            
-            
+    def _render_player_name(self, name, in_turn):
+        """
+        Renders the row of a player in the player list.
 
-        
\ No newline at end of file
+        Args:
+            name (str): The name of the player.
+            in_turn (bool): Whether it is the player's turn.
+
+        Returns:
+            Surface: The rendered player name.
+        """
+        if in_turn:
+            text_color = self.settings.PLAYER_LIST_IN_TURN_COLOR
+        else:
+            text_color = self.settings.PLAYER_LIST_FONT_COLOR
+        
+        if name == self.client.name:
+            name += '(You)'
+        
+        return self.resource_manager.render_font(
+            name,
+            text_color,
+            self.settings.FONT_DIR,
+            self.settings.PLAYER_LIST_FONT_SIZE)
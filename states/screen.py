@@ -14,6 +14,7 @@ class Screen(State):
             game_instance (Game): An instance of the game.
         """
         self.set_game_instance(game_instance)
+        self._invalidated = True
         
         # Sets initial color for every screen to black
         self.set_background_color((0,0,0,0))
@@ -46,12 +47,32 @@ class Screen(State):
     def set_background_color(self, rgba):
         """
         Updates the screen's initial background color.
+        
+        Opaque colors use a surface without per pixel alpha, which 
+        blits faster.
 
         Args:
             rgba (tuple): The RGBA values for the background color.
         """
+        self._bg_color = rgba
+        opaque = len(rgba) == 3 or rgba[3] == 255
+        if opaque != (self._bg_surface.get_alpha() is None):
+            size = (self._screen_w, self._screen_h)
+            if opaque:
+                self._bg_surface = pygame.Surface(size).convert()
+            else:
+                self._bg_surface = pygame.Surface(size).convert_alpha()
         self._bg_surface.fill(rgba)
 
+    def resize(self):
+        """
+        Adapts the screen to a new size of the game's window, subclasses
+        lay their content out again.
+        """
+        self.set_game_instance(self.game_instance())
+        self.set_background_color(self._bg_color)
+        self.invalidate()
+
     def get_background_surface(self):
         """
         Returns the screen's initial background surface.
@@ -71,6 +92,24 @@ class Screen(State):
         """
         return self.game_instance()._states[-1] != self
     
+    def invalidate(self):
+        """
+        Marks the screen as visually changed, so a cached snapshot of it
+        is redrawn while it is paused.
+        """
+        self._invalidated = True
+
+    def consume_invalidation(self):
+        """
+        Checks if the screen changed since the last call.
+
+        Returns:
+            bool: True if the screen was invalidated, False otherwise.
+        """
+        invalidated = self._invalidated
+        self._invalidated = False
+        return invalidated
+    
     def get_width(self):
         """
         Returns the width of the screen.
@@ -114,12 +153,27 @@ class Screen(State):
         """
         Checks events for the screen, including handling quit events.
         """
+        resized = False
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.game_instance().client.close_connection()
+                self.game_instance().profiler.close()
                 sys.exit()
                 
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.game_instance().profiler.toggle_overlay()
+                
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.game_instance().network_overlay.toggle()
+            
+            # A window being dragged to size sends many resizes per frame
+            if event.type == pygame.VIDEORESIZE:
+                resized = True
+                
             self._check_events(event)
+        
+        if resized:
+            self.game_instance().resize()
             
     @abstractmethod
     def update(self):
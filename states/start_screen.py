@@ -30,20 +30,9 @@ class StartScreen(Screen):
             game_instance.settings.CARD_CENTER_FONT_SIZE)
 
         self.main_title_rect = self.main_title.get_rect()
-        self.main_title_rect.centerx = self.rect.centerx
-        self.main_title_rect.y = self.get_height() / 4
-        
-        # Add Form
-        self.form = pygame.Surface(
-            (self.get_width() / 3,
-             self.get_height() / 3))
-        self.form_rect = self.form.get_rect()
-        self.form_rect.centerx = self.rect.centerx
-        self.form_rect.centery = self.rect.centery + self.get_height() / 10
         
         # Adds IP text field to screen
-        ip_textfield_x = self.main_title_rect.left
-        ip_textfield_y = self.main_title_rect.bottom
+        ip_textfield_x = ip_textfield_y = 0
         ip_textfield_w = game_instance.settings.IP_TF_WIDTH
         ip_textfield_h = game_instance.settings.IP_TF_HEIGHT
         ip_textfield_font = resource_manager.load_font(
@@ -54,33 +43,77 @@ class StartScreen(Screen):
             ip_textfield_x, ip_textfield_y,
             ip_textfield_w, ip_textfield_h,
             ip_textfield_font, max_c)
-        self.textfield_ip.rect.topleft = self.form_rect.topleft
 
         self.inputted_ip = ""
         
         # Adds join button to screen
-        join_btn_x = self.textfield_ip.rect.right + 5
-        join_btn_y = self.textfield_ip.rect.top
+        join_btn_x = join_btn_y = 0
         join_btn_w = 100
         join_btn_h = 50
         join_btn_text_surface = resource_manager.render_font(
             "Join",
             game_instance.settings.JOIN_BTN_TEXT_COLOR,
             game_instance.settings.FONT_DIR,
-            35)
+            game_instance.settings.JOIN_BTN_FONT_SIZE)
         self.btn_join = Button(
             join_btn_x, join_btn_y, join_btn_w, join_btn_h,
             join_btn_text_surface, game_instance.settings.JOIN_BTN_INACTIVE_COLOR,
             game_instance.settings.JOIN_BTN_ACTIVE_COLOR)
         self.btn_join.set_on_click_callback(self.join_event)
         
+        # Starts preloading the play screen assets
+        self.preloader = game_instance.preloader
+        self.preloader.start()
+        self.preload_bar_rect = pygame.Rect(0, 0, 0, 4)
+        self._preload_bar_width = 0
+        
+        self.organize_content()
+        
+    def organize_content(self):
+        """
+        Lays the title, the form and the progress bar out for the size of
+        the screen.
+        """
+        self.main_title_rect.centerx = self.rect.centerx
+        self.main_title_rect.y = self.get_height() / 4
+        
+        # Add Form
+        self.form = pygame.Surface(
+            (self.get_width() / 3,
+             self.get_height() / 3))
+        self.form_rect = self.form.get_rect()
+        self.form_rect.centerx = self.rect.centerx
+        self.form_rect.centery = self.rect.centery + self.get_height() / 10
+        
+        self.textfield_ip.rect.topleft = self.form_rect.topleft
+        self.btn_join.rect.left = self.textfield_ip.rect.right + 5
+        self.btn_join.rect.top = self.textfield_ip.rect.top
+        
+        self.preload_bar_rect.width = self.get_width() / 3
+        self.preload_bar_rect.midbottom = self.rect.midbottom
+        self.preload_bar_rect.bottom -= 20
+        self._preload_bar_width = 0
+        
+    def resize(self):
+        """
+        Lays the start screen out again in the resized window.
+        """
+        super().resize()
+        self.organize_content()
         
     def update(self):
         """
-        Placeholder method for updating the screen.
-
+        Finishes preloaded assets a few at a time, redrawing the progress
+        bar when it grows, also while a dialog pauses the screen.
         """        
-        pass
+        self.preloader.update()
+        
+        bar_width = int(self.preload_bar_rect.width * self.preloader.progress)
+        if self.preloader.done:
+            bar_width = 0 # the bar is hidden once loading is done
+        if bar_width != self._preload_bar_width:
+            self._preload_bar_width = bar_width
+            self.invalidate()
 
     def blit(self):
         """
@@ -90,6 +123,12 @@ class StartScreen(Screen):
         self.draw(self.main_title, rect=self.main_title_rect)
         self.textfield_ip.blitme(self.surface)
         self.btn_join.blitme(self.surface)
+        
+        # Preloading progress bar
+        if not self.preloader.done:
+            progress_rect = self.preload_bar_rect.copy()
+            progress_rect.width = self._preload_bar_width
+            pygame.draw.rect(self.surface, (255, 255, 255), progress_rect)
 
         
     def _check_events(self, event):
@@ -1,4 +1,6 @@
 from enum import Enum
+import io
+import pickle
 
 class StatusCode(Enum):
     """
@@ -7,11 +9,29 @@ class StatusCode(Enum):
     Attributes:
         CONNECTION_FAILED (int): Status code indicating a failed connection.
         CONNECTION_SUCCESS (int): Status code indicating a successful connection.
-        GAME_START (int): Status code indicating the start of the game.
+        GAME_START (int): Status code indicating the start of the game,
+            with the token the player resumes its seat with.
         GAME_STATE (int): Status code indicating the current game state.
         CARD_DRAW (int): Status code indicating a card draw action.
         INITIAL_DRAW (int): Status code indicating the initial draw of cards.
         CARD_PLAY (int): Status code indicating a card play action.
+        PING (int): Status code of a round trip time probe, echoed back by
+            the server.
+        RESUME (int): Status code of a player reclaiming its seat in a
+            recovered game, with the resume token of the seat.
+        TURN_TIMEOUT (int): Status code of the move the server makes when
+            a turn or game timer expires, never sent by clients.
+        MATCH_REQUEST (int): Status code of a request to join the 
+            matchmaking queue, with the desired table size.
+        MATCH_QUEUED (int): Status code of a matchmaking queue update, with
+            the player's position and the depth of its queue.
+        MATCH_FOUND (int): Status code of a formed table, with the address
+            and port of its game server.
+        GAME_SNAPSHOT (int): Status code of the state sent to a spectator
+            or a resumed player joining mid-game, the GAME_STATE data
+            followed by the hand sizes, the deck size and the player's hand.
+        MOVE_REJECTED (int): Status code of the answer to a move the server
+            did not apply, with the unchanged GAME_STATE data.
     """    
     CONNECTION_FAILED = 0
     CONNECTION_SUCCESS = 1
@@ -20,18 +40,81 @@ class StatusCode(Enum):
     CARD_DRAW = 4
     INITIAL_DRAW = 5
     CARD_PLAY = 6
+    PING = 7
+    RESUME = 8
+    TURN_TIMEOUT = 9
+    MATCH_REQUEST = 10
+    MATCH_QUEUED = 11
+    MATCH_FOUND = 12
+    GAME_SNAPSHOT = 13
+    MOVE_REJECTED = 14
 
 class UnoMessage:
     """
     Represents a client/server message in the networked UNO game.
     """    
-    def __init__(self, status_code, data=None):
+    def __init__(self, status_code, data=None, request_id=None):
         """
         Initializes a new UnoMessage instance.
 
         Args:
             status_code (StatusCode): The status code of the message.
             data (Any, optional): Additional data associated with the message.
+            request_id (int, optional): Id of the client request, echoed by
+                the server in the response that answers it.
         """        
         self.status_code = status_code
-        self.data = data
\ No newline at end of file
+        self.data = data
+        self.request_id = request_id
+
+class MalformedMessageError(Exception):
+    """
+    Raised when received bytes are not a pickled UnoMessage, the 
+    connection they came from is dropped.
+    """
+
+# Errors unpickling corrupt or foreign bytes can raise
+_MALFORMED_ERRORS = (pickle.UnpicklingError, ValueError, TypeError,
+                     AttributeError, IndexError, KeyError, ImportError,
+                     OverflowError, MemoryError)
+
+def unpack_messages(buffer):
+    """
+    Deserializes every complete UnoMessage at the start of a buffer of
+    received bytes.
+
+    Args:
+        buffer (bytes): Bytes received and not yet deserialized.
+
+    Returns:
+        tuple: The complete UnoMessages and the bytes of a trailing 
+            partial message, kept until the rest of it arrives.
+
+    Raises:
+        MalformedMessageError: If the bytes are not pickled UnoMessages.
+    """
+    stream = io.BytesIO(buffer)
+    messages = []
+    
+    while stream.tell() < len(buffer):
+        start = stream.tell()
+        try:
+            uno_msg = pickle.load(stream)
+        except EOFError:
+            stream.seek(start)
+            break
+        except _MALFORMED_ERRORS as e:
+            # A partial message is only ever truncated, anything else 
+            # would fail again once the rest of it arrives
+            if (isinstance(e, pickle.UnpicklingError) and 
+                    'truncated' in str(e)):
+                stream.seek(start)
+                break
+            raise MalformedMessageError(f'Malformed message: {e!r}') from e
+        
+        if not isinstance(uno_msg, UnoMessage):
+            raise MalformedMessageError(
+                f'Not an UnoMessage: {type(uno_msg).__name__}')
+        messages.append(uno_msg)
+    
+    return messages, buffer[stream.tell():]
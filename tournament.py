@@ -0,0 +1,410 @@
+"""
+Bot tournament runner for UNO Online.
+
+Plays bot against bot games offline across worker processes, with the
+deck of UnoDeck and the turn and draw rules of the server, and reports
+Elo ratings, win rates with 95% confidence intervals and throughput.
+
+Usage:
+    python tournament.py heuristic greedy [--games 2000] [--workers 4]
+        [--results games.jsonl] [--output report.json]
+"""
+import argparse
+import json
+import math
+import multiprocessing.util
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from card import CardColor, CardType, UnoCard
+from card_collections import UnoDeck
+from rules import card_matches_discard, turn_after_play
+from bot_strategies import STRATEGIES, MonteCarloStrategy, create_strategy
+
+INITIAL_HAND_SIZE = 7
+MAX_TURNS = 1000
+ELO_K = 16
+ELO_START = 1500
+
+class _TablePlayer:
+    """
+    The view of a game a strategy gets for a seat, with the attributes a
+    BotClient offers.
+    """
+    def __init__(self, game, seat):
+        """
+        Initializes a new _TablePlayer instance.
+
+        Args:
+            game (TableGame): The game played.
+            seat (int): The seat of the player.
+        """
+        self._game = game
+        self.name = game.player_names[seat]
+        self.hand = game.hands[seat]
+
+    @property
+    def top_card(self):
+        """
+        Returns the top card of the discard pile.
+        """
+        return self._game.discards[-1]
+
+    @property
+    def discards(self):
+        """
+        Returns the cards of the discard pile, in order.
+        """
+        return self._game.discards
+
+    @property
+    def player_names(self):
+        """
+        Returns the names of the players in turn order.
+        """
+        return self._game.player_names
+
+    @property
+    def player_turn(self):
+        """
+        Returns the index of the player in turn.
+        """
+        return self._game.player_turn
+
+    @property
+    def turn_increase(self):
+        """
+        Returns the direction of play, 1 or -1.
+        """
+        return self._game.turn_increase
+
+    @property
+    def hand_sizes(self):
+        """
+        Returns the number of cards of every player by name.
+        """
+        return {name: len(hand) for name, hand in
+                zip(self._game.player_names, self._game.hands)}
+
+class TableGame:
+    """
+    A game played without a server, dealing and applying card effects
+    the way Server does.
+    """
+    def __init__(self, strategies, seed):
+        """
+        Initializes a new TableGame instance.
+
+        Args:
+            strategies (list): The BotStrategy of each seat.
+            seed (int): Seed of the deck shuffles.
+        """
+        self._rng = random.Random(seed)
+        self._strategies = strategies
+        self.player_names = [f'seat{i}' for i in range(len(strategies))]
+        self.player_turn = 0
+        self.turn_increase = 1
+        self.turns = 0
+
+        self._pile = UnoDeck().cards
+        self._rng.shuffle(self._pile)
+        self.discards = [self._pile.pop()]
+        self.hands = [[self._pile.pop() for _ in range(INITIAL_HAND_SIZE)]
+                      for _ in strategies]
+        self._players = [_TablePlayer(self, seat)
+                         for seat in range(len(strategies))]
+
+    def play(self):
+        """
+        Plays the game until a player runs out of cards.
+
+        Returns:
+            int: Seat of the winner, or None if the game reached MAX_TURNS.
+        """
+        n = len(self.hands)
+        while self.turns < MAX_TURNS:
+            self.turns += 1
+            seat = self.player_turn
+            hand = self.hands[seat]
+            uno_card = self._strategies[seat].choose_move(self._players[seat])
+
+            if uno_card is None or not card_matches_discard(
+                    uno_card, self.discards[-1]):
+                self._draw(seat, 1)
+                self.player_turn = (seat + self.turn_increase) % n
+                continue
+
+            self._remove(hand, uno_card)
+            self.discards.append(uno_card)
+            if not hand:
+                return seat
+
+            self.player_turn, self.turn_increase = turn_after_play(
+                uno_card, seat, self.turn_increase, n)
+            if uno_card.type == CardType.DRAW_TWO:
+                self._draw(self.player_turn, 2)
+            elif uno_card.type == CardType.WILD_DRAW_FOUR:
+                self._draw(self.player_turn, 4)
+        return None
+
+    def _draw(self, seat, count):
+        """
+        Draws cards for a player, reshuffling the discard pile but its top
+        card into the deck when it runs out, as Server.draw_from_deck.
+        """
+        for _ in range(count):
+            if not self._pile:
+                if len(self.discards) < 2:
+                    return
+                top_card = self.discards.pop()
+                for uno_card in self.discards:
+                    if uno_card.type in (CardType.WILD, CardType.WILD_DRAW_FOUR):
+                        uno_card = UnoCard(uno_card.type, CardColor.DARK)
+                    self._pile.append(uno_card)
+                self.discards[:] = [top_card]
+                self._rng.shuffle(self._pile)
+            self.hands[seat].append(self._pile.pop())
+
+    @staticmethod
+    def _remove(hand, uno_card):
+        """
+        Removes a played card from a hand, wild cards are held without the
+        color picked for them.
+        """
+        for i, held in enumerate(hand):
+            if held.type == uno_card.type and (
+                held.color == uno_card.color or held.color == CardColor.DARK):
+                del hand[i]
+                return
+        raise ValueError(f'Card not in hand: {uno_card.type} {uno_card.color}')
+
+def play_games(strategy_names, first_game, count, seed):
+    """
+    Plays a batch of games, runs in a worker process. Seats rotate every
+    game so no strategy keeps the first turn.
+
+    Args:
+        strategy_names (list): Names of the competing strategies.
+        first_game (int): Index of the batch's first game.
+        count (int): Number of games.
+        seed (int): Seed of the tournament.
+
+    Returns:
+        list: One result per game: its index, the strategy of each seat,
+            the winning seat or None and the number of turns.
+    """
+    results = []
+    n = len(strategy_names)
+    for game_idx in range(first_game, first_game + count):
+        game_seed = seed * 1_000_003 + game_idx
+        seating = [strategy_names[(game_idx + i) % n] for i in range(n)]
+        strategies = [_create_seeded_strategy(name, game_seed + i)
+                      for i, name in enumerate(seating)]
+
+        game = TableGame(strategies, game_seed)
+        winner = game.play()
+        results.append({'game': game_idx, 'seats': seating,
+                        'winner': winner, 'turns': game.turns})
+    return results
+
+def _init_worker():
+    """
+    Prepares a worker process of the tournament, runs as it starts.
+    """
+    # Worker processes exit without running atexit handlers, which
+    # would leave the Monte Carlo pool's processes waiting forever.
+    # Finalizers with a priority still run, once the tournament is over,
+    # and this one runs before the pool's queues are closed at priority 10
+    multiprocessing.util.Finalize(
+        None, MonteCarloStrategy.shutdown_pool, exitpriority=100)
+
+def _create_seeded_strategy(name, seed):
+    """
+    Creates a strategy, seeding it when it draws random numbers so games
+    can be replayed.
+    """
+    if name == 'monte_carlo':
+        # One rollout process per tournament worker keeps to one core each
+        return create_strategy(name, seed=seed, workers=1)
+    if name == 'random':
+        return create_strategy(name, seed=seed)
+    return create_strategy(name)
+
+class RatingTable:
+    """
+    Elo ratings and win counts of the strategies, updated as results are
+    streamed in. A multiplayer game counts as the winner beating every
+    other seat.
+    """
+    def __init__(self, strategy_names):
+        """
+        Initializes a new RatingTable instance.
+
+        Args:
+            strategy_names (list): Names of the competing strategies.
+        """
+        self.elo = {name: float(ELO_START) for name in strategy_names}
+        self.games = {name: 0 for name in strategy_names}
+        self.wins = {name: 0 for name in strategy_names}
+        self.unfinished = 0
+        self.turns = 0
+
+    def add(self, result):
+        """
+        Adds a game result.
+
+        Args:
+            result (dict): A result returned by play_games.
+        """
+        seats = result['seats']
+        self.turns += result['turns']
+        for name in set(seats):
+            self.games[name] += 1
+
+        if result['winner'] is None:
+            self.unfinished += 1
+            return
+
+        winner = seats[result['winner']]
+        self.wins[winner] += 1
+        for loser in seats:
+            if loser == winner:
+                continue
+            expected = 1 / (1 + 10 ** ((self.elo[loser] - self.elo[winner]) / 400))
+            self.elo[winner] += ELO_K * (1 - expected)
+            self.elo[loser] -= ELO_K * (1 - expected)
+
+    def standings(self):
+        """
+        Returns the standings sorted by rating.
+
+        Returns:
+            list: Per strategy, its Elo rating, games, wins, win rate and
+                the Wilson 95% confidence interval of the win rate.
+        """
+        table = []
+        for name, elo in sorted(self.elo.items(), key=lambda item: -item[1]):
+            games, wins = self.games[name], self.wins[name]
+            table.append({
+                'strategy': name,
+                'elo': round(elo, 1),
+                'games': games,
+                'wins': wins,
+                'win_rate': wins / games if games else None,
+                'win_rate_ci95': wilson_interval(wins, games),
+            })
+        return table
+
+def wilson_interval(wins, games, z=1.96):
+    """
+    Returns the Wilson score interval of a win rate.
+
+    Args:
+        wins (int): Games won.
+        games (int): Games played.
+        z (float, optional): Normal quantile, 1.96 for 95%.
+
+    Returns:
+        list: Lower and upper bounds, or None without games.
+    """
+    if not games:
+        return None
+    p = wins / games
+    denominator = 1 + z * z / games
+    center = (p + z * z / (2 * games)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games))
+    return [center - margin / denominator, center + margin / denominator]
+
+def run_tournament(strategy_names, games, workers, seed=0, batch_size=50,
+                   results_file=None):
+    """
+    Plays the games on a process pool, rating the strategies in game
+    order as batches of results come back.
+
+    Args:
+        strategy_names (list): Names of the competing strategies, one per
+            seat.
+        games (int): Number of games.
+        workers (int): Number of worker processes.
+        seed (int, optional): Seed of the tournament. Defaults to 0.
+        batch_size (int, optional): Games played per worker task.
+        results_file (file, optional): Receives every game result as a
+            JSON line as soon as it is known.
+
+    Returns:
+        dict: Standings, unfinished games and throughput.
+    """
+    table = RatingTable(strategy_names)
+    start = time.perf_counter()
+    played = 0
+
+    # Batches come back in any order, their results are applied in game
+    # order so the ratings do not depend on the scheduling
+    pending = {}
+    next_game = 0
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as executor:
+        tasks = {executor.submit(play_games, strategy_names, first,
+                                 min(batch_size, games - first), seed): first
+                 for first in range(0, games, batch_size)}
+
+        for task in as_completed(tasks):
+            pending[tasks[task]] = task.result()
+            played += len(task.result())
+            while next_game in pending:
+                batch = pending.pop(next_game)
+                for result in batch:
+                    table.add(result)
+                    if results_file:
+                        results_file.write(json.dumps(result) + '\n')
+                next_game += len(batch)
+            elapsed = time.perf_counter() - start
+            print(f'{played}/{games} games, {played / elapsed:.1f} games/s',
+                  flush=True)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'strategies': strategy_names,
+        'seed': seed,
+        'standings': table.standings(),
+        'unfinished_games': table.unfinished,
+        'mean_turns': table.turns / games if games else None,
+        'throughput': {
+            'games': games,
+            'elapsed_s': elapsed,
+            'workers': workers,
+            'games_per_s': games / elapsed,
+            'games_per_s_per_core': games / elapsed / workers,
+        },
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Bot against bot tournament for UNO Online.')
+    parser.add_argument('strategies', nargs='+', choices=sorted(STRATEGIES),
+                        help='Strategy of each seat, 2 to 10 seats')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--results', help='JSON lines file of every game')
+    parser.add_argument('--output', help='File the JSON report is written to')
+    args = parser.parse_args()
+
+    if not 2 <= len(args.strategies) <= 10:
+        parser.error('a game needs 2 to 10 seats')
+
+    results_file = open(args.results, 'w') if args.results else None
+    try:
+        report = run_tournament(args.strategies, args.games, args.workers,
+                                args.seed, args.batch_size, results_file)
+    finally:
+        if results_file:
+            results_file.close()
+
+    report_json = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(report_json)
+    print(report_json)
@@ -0,0 +1,321 @@
+"""
+Turn timers for UNO Online servers.
+
+Every room of a process schedules its timers on one hierarchical timing
+wheel served by a single thread, so tables do not need a thread or a
+socket timeout per player. Scheduling and cancelling a timer are O(1),
+and a tick only visits the slot that expires. The work a timer starts
+runs on a small worker pool shared by every room, each room's tasks in
+order through its own SerialQueue.
+"""
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+class Timer:
+    """
+    A callback scheduled on a TimingWheel.
+    """
+    __slots__ = ('expires', 'callback', 'args', 'cancelled')
+
+    def __init__(self, expires, callback, args):
+        """
+        Initializes a new Timer instance.
+
+        Args:
+            expires (int): Tick the timer expires at.
+            callback (callable): Called when the timer expires.
+            args (tuple): Arguments of the callback.
+        """
+        self.expires = expires
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Cancels the timer, it is dropped when its slot is next visited.
+        """
+        self.cancelled = True
+
+class TimingWheel:
+    """
+    A hierarchical timing wheel. Level 0 has a slot per tick, and each
+    level above has slots as long as a full turn of the level below. A
+    timer sits in the lowest level its delay fits in and cascades down a
+    level each time the wheel below turns over, until it expires.
+
+    The wheel is not thread-safe, TimerService serializes access to it.
+    """
+    SLOT_BITS = 6
+    LEVELS = 4
+
+    def __init__(self, tick, start):
+        """
+        Initializes a new TimingWheel instance.
+
+        Args:
+            tick (float): Seconds per tick, the resolution of the timers.
+            start (float): time.monotonic() value of tick 0.
+        """
+        self.tick = tick
+        self._start = start
+        self._slots = 1 << self.SLOT_BITS
+        self._mask = self._slots - 1
+        self._wheels = [[[] for _ in range(self._slots)]
+                        for _ in range(self.LEVELS)]
+        self._current = 0
+        self._size = 0
+        self.horizon = (self._slots ** self.LEVELS - 1) * tick
+
+    def schedule(self, delay, callback, *args):
+        """
+        Schedules a callback.
+
+        Args:
+            delay (float): Seconds before the callback is due, rounded up
+                to whole ticks.
+            callback (callable): Called with args when the timer expires.
+
+        Returns:
+            Timer: The timer, to cancel it.
+
+        Raises:
+            ValueError: If the delay is beyond the wheel's horizon.
+        """
+        if delay > self.horizon:
+            raise ValueError(f'Timer delay beyond {self.horizon:.0f} s')
+        ticks = max(1, math.ceil(delay / self.tick))
+        timer = Timer(self._current + ticks, callback, args)
+        self._place(timer)
+        self._size += 1
+        return timer
+
+    def _place(self, timer):
+        """
+        Puts a timer in the slot of the lowest level its delay fits in.
+        """
+        remaining = timer.expires - self._current
+        level = 0
+        while remaining >= 1 << (self.SLOT_BITS * (level + 1)):
+            level += 1
+        slot = (timer.expires >> (self.SLOT_BITS * level)) & self._mask
+        self._wheels[level][slot].append(timer)
+
+    def advance(self, now):
+        """
+        Moves the wheel up to a time, collecting the timers due.
+
+        Args:
+            now (float): time.monotonic() value to advance to.
+
+        Returns:
+            list: The Timers that expired and were not cancelled.
+        """
+        target = int((now - self._start) / self.tick)
+        expired = []
+
+        while self._current < target:
+            if not self._size:
+                # Nothing scheduled, no slot to visit on the way
+                self._current = target
+                break
+            self._current += 1
+
+            # Higher levels cascade their slot down before level 0 fires
+            level = 1
+            while (level < self.LEVELS and
+                   not self._current & ((1 << (self.SLOT_BITS * level)) - 1)):
+                slot = (self._current >> (self.SLOT_BITS * level)) & self._mask
+                timers = self._wheels[level][slot]
+                self._wheels[level][slot] = []
+                for timer in timers:
+                    if timer.cancelled:
+                        self._size -= 1
+                    else:
+                        self._place(timer)
+                level += 1
+
+            slot = self._current & self._mask
+            timers = self._wheels[0][slot]
+            self._wheels[0][slot] = []
+            self._size -= len(timers)
+            expired.extend(timer for timer in timers if not timer.cancelled)
+
+        return expired
+
+    def __len__(self):
+        """
+        Returns the number of timers scheduled, cancelled ones included
+        until they are dropped.
+        """
+        return self._size
+
+class SerialQueue:
+    """
+    Runs the tasks of one room one after the other, in the order they were
+    submitted, on a worker pool shared with the other rooms. At most one
+    task of the queue is on the pool at a time.
+    """
+    def __init__(self, pool):
+        """
+        Initializes a new SerialQueue instance.
+
+        Args:
+            pool (ThreadPoolExecutor): The shared worker pool.
+        """
+        self._pool = pool
+        self._lock = threading.Lock()
+        self._tasks = deque()
+        self._running = False
+        self._closed = False
+
+    def submit(self, fn, *args):
+        """
+        Queues a task, it is dropped if the queue is closed.
+
+        Args:
+            fn (callable): Called with args on a worker.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._tasks.append((fn, args))
+            if self._running:
+                return
+            self._running = True
+        self._hand_to_pool()
+
+    def _run_next(self):
+        """
+        Runs the oldest task, then hands the next one back to the pool so
+        the rooms take turns on the workers. Runs in a worker.
+        """
+        with self._lock:
+            if not self._tasks:
+                self._running = False
+                return
+            fn, args = self._tasks.popleft()
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f'Error running task: {e}')
+        
+        with self._lock:
+            if not self._tasks:
+                self._running = False
+                return
+        self._hand_to_pool()
+
+    def _hand_to_pool(self):
+        """
+        Submits the next task to the pool, unless the pool was shut down
+        with its service or at interpreter exit.
+        """
+        try:
+            self._pool.submit(self._run_next)
+        except RuntimeError:
+            with self._lock:
+                self._running = False
+
+    def close(self):
+        """
+        Drops the tasks not started yet and the ones submitted later.
+        """
+        with self._lock:
+            self._closed = True
+            self._tasks.clear()
+
+class TimerService:
+    """
+    Runs a TimingWheel on one thread. Callbacks run on that thread, one
+    after the other, and must not block, blocking work is handed to the
+    service's worker pool through a SerialQueue.
+    """
+    TICK = 0.05
+    WORKERS = 4
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, tick=TICK, workers=WORKERS):
+        """
+        Initializes a new TimerService instance and starts its thread.
+
+        Args:
+            tick (float, optional): Seconds per tick. Defaults to TICK.
+            workers (int, optional): Threads of the worker pool shared by
+                the rooms. Defaults to WORKERS.
+        """
+        self._lock = threading.Lock()
+        self._wheel = TimingWheel(tick, time.monotonic())
+        self._stopped = threading.Event()
+        self._workers = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='timer-worker')
+        self.fired = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def shared(cls):
+        """
+        Returns the TimerService shared by every room of the process,
+        starting it on first use.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def schedule(self, delay, callback, *args):
+        """
+        Schedules a callback, see TimingWheel.schedule.
+
+        Returns:
+            Timer: The timer, to cancel it.
+        """
+        with self._lock:
+            return self._wheel.schedule(delay, callback, *args)
+
+    def serial_queue(self):
+        """
+        Returns a new queue running its tasks in order on the service's
+        worker pool.
+
+        Returns:
+            SerialQueue: The queue, one per room.
+        """
+        return SerialQueue(self._workers)
+
+    def _run(self):
+        """
+        Advances the wheel every tick and runs the callbacks due, runs in
+        the service thread.
+        """
+        while not self._stopped.wait(self._wheel.tick):
+            with self._lock:
+                expired = self._wheel.advance(time.monotonic())
+
+            for timer in expired:
+                self.fired += 1
+                try:
+                    timer.callback(*timer.args)
+                except Exception as e:
+                    print(f'Error running timer: {e}')
+
+    def close(self):
+        """
+        Stops the service thread and its workers, pending timers never
+        fire.
+        """
+        self._stopped.set()
+        self._thread.join()
+        self._workers.shutdown(wait=False)
+
+    def __len__(self):
+        """
+        Returns the number of timers scheduled.
+        """
+        with self._lock:
+            return len(self._wheel)
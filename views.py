@@ -40,6 +40,19 @@ class UnoCardView(pygame.sprite.Sprite):
         self._inner_rect = pygame.Rect(self._position, self._inner_rect_size)
         self._inner_rect.center = (self.rect.width / 2, self.rect.height /2)
         
+        self._set_contents(center_content, edge_content)
+        self.draw_card()
+        
+    def _set_contents(self, center_content, edge_content=None):
+        """
+        Sets the content displayed at the center and edges of the card.
+
+        Args:
+            center_content (pygame.Surface): The content displayed at the
+                center of the card.
+            edge_content (pygame.Surface, optional): The content displayed at 
+                the edges of the card.
+        """
         # Sets the center content of the card
         self._center_content = center_content
         self._center_content_rect = center_content.get_rect(
@@ -59,13 +72,30 @@ class UnoCardView(pygame.sprite.Sprite):
         self.br_content.set_alpha(127)
         self.br_content_rect = self.br_content.get_rect(
             bottomright=self._inner_rect.bottomright)
+        
+    def rebind(self, uno_card, center_content, edge_content=None):
+        """
+        Reuses the view for another UNO card, redrawing it in place.
 
+        Args:
+            uno_card (UnoCard): The UNO card model to show.
+            center_content (pygame.Surface): The content displayed at the
+                center of the card.
+            edge_content (pygame.Surface, optional): The content displayed at 
+                the edges of the card.
+        """
+        self._uno_card = uno_card
+        self._card_color = uno_card.color.value
+        self._grabbed = False
+        self._set_contents(center_content, edge_content)
+        self.image.fill((0, 0, 0, 0))
         self.draw_card()
         
     def draw_card(self):
         """Draws the card with its content onto the surface."""        
         pygame.draw.rect(
-            self.image, self._card_color, self.rect, border_radius=15)
+            self.image, self._card_color, self.image.get_rect(),
+            border_radius=15)
         self.image.blit(self._center_content, self._center_content_rect)
         self.image.blit(self.tl_content, self.tl_content_rect)
         self.image.blit(self.br_content, self.br_content_rect) 
@@ -110,6 +140,11 @@ class UnoCardView(pygame.sprite.Sprite):
         """Gets whether the card is currently being grabbed."""        
         return self._grabbed      
 
+    @property
+    def initial_pos(self):
+        """Gets the position the card returns to when released."""        
+        return self._initial_pos
+
     def set_initial_pos(self, x, y):
         """Sets the initial position of the card."""        
         self._initial_pos.x = x
@@ -125,9 +160,7 @@ class UnoCardView(pygame.sprite.Sprite):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if (self.rect.collidepoint(event.pos) and 
                 self._grabbed == False):
-                self._grabbed = True
-                self._initial_grab_x = event.pos[0]
-                self._initial_grab_y = event.pos[1]
+                self.grab(event.pos)
         elif event.type == pygame.MOUSEBUTTONUP:
             self._grabbed = False    
             
@@ -140,6 +173,17 @@ class UnoCardView(pygame.sprite.Sprite):
             self._initial_grab_x = event.pos[0]
             self._initial_grab_y = event.pos[1]
             
+    def grab(self, pos):
+        """
+        Starts dragging the card from a pointer position.
+
+        Args:
+            pos (tuple): The position of the pointer.
+        """
+        self._grabbed = True
+        self._initial_grab_x = pos[0]
+        self._initial_grab_y = pos[1]
+            
     def reset_pos(self):
         """Resets the card position to its initial state."""        
         self.rect.x = self._initial_pos.x
@@ -196,11 +240,115 @@ class ListItemView:
         """        
         self.surface = surface
         self.rect = surface_rect
+
+class PlayerListView:
+    """
+    Represents a retained vertical list of player names where only the
+    rows whose turn highlight changes are re-rendered.
+    """
+    def __init__(self, x, y, render_row):
+        """
+        Initializes a new PlayerListView instance.
+
+        Args:
+            x (int): X-coordinate of the list.
+            y (int): Y-coordinate of the list.
+            render_row (callable): Callback taking a player name and a 
+                highlight flag, returning the row's pygame.Surface.
+        """
+        self._x = x
+        self._y = y
+        self._render_row = render_row
+        self._names = []
+        self._rows = {}
+        self._row_cache = {}
+        self._item_list = []
+        self._highlighted = None
+        self._surface = None
+        self._rect = pygame.Rect(x, y, 0, 0)
+
+    def set_players(self, names):
+        """
+        Sets the players shown in the list. The list is only rebuilt
+        when the names differ from the ones already shown.
+
+        Args:
+            names (list): List of player names.
+        """
+        if names == self._names:
+            return
+
+        self._names = list(names)
+        self._rows = {name: i for i, name in enumerate(self._names)}
+        self._item_list = []
+        
+        current_y = 0
+        width = 0
+        for name in self._names:
+            row_surface = self._get_row_surface(
+                name, name == self._highlighted)
+            s_rect = row_surface.get_rect(topleft=(0, current_y))
+            self._item_list.append(ListItemView(row_surface, s_rect))
+            current_y = s_rect.bottom
+            width = max(width, s_rect.width)
         
+        # Composes every row into a single surface blitted once per frame
+        self._surface = pygame.Surface((width, current_y), pygame.SRCALPHA)
+        self._rect = self._surface.get_rect(topleft=(self._x, self._y))
+        for item in self._item_list:
+            self._surface.blit(item.surface, item.rect)
+
+    def set_highlight(self, name):
+        """
+        Highlights a player, re-rendering only the previously
+        highlighted row and the newly highlighted one.
+
+        Args:
+            name (str): The name of the player to highlight.
+        """
+        if name == self._highlighted:
+            return
         
+        previous = self._highlighted
+        self._highlighted = name
+        self._redraw_row(previous)
+        self._redraw_row(name)
 
+    def _redraw_row(self, name):
+        """
+        Redraws the row of a player onto the list surface.
 
+        Args:
+            name (str): The name of the player whose row is redrawn.
+        """
+        idx = self._rows.get(name)
+        if idx is None:
+            return
+        
+        item = self._item_list[idx]
+        item.surface = self._get_row_surface(name, name == self._highlighted)
+        self._surface.fill((0, 0, 0, 0), item.rect)
+        self._surface.blit(item.surface, item.rect)
 
+    def _get_row_surface(self, name, highlighted):
+        """
+        Returns the rendered surface of a row, rendering it only once.
+
+        Args:
+            name (str): The name of the player.
+            highlighted (bool): Whether the row is highlighted.
 
+        Returns:
+            pygame.Surface: The rendered row.
+        """
+        key = (name, highlighted)
+        if key not in self._row_cache:
+            self._row_cache[key] = self._render_row(name, highlighted)
+        return self._row_cache[key]
 
-            
\ No newline at end of file
+    def blitme(self, surface):
+        """
+        Draws the list onto the specified surface.
+        """
+        if self._surface:
+            surface.blit(self._surface, self._rect)